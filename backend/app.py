@@ -1,43 +1,139 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Body, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from datetime import datetime, timedelta
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from datetime import datetime
 from bson import ObjectId
-from typing import Dict, List, Any, Optional
+from pymongo import ReturnDocument
+from pymongo.asynchronous.collection import AsyncCollection
+from typing import Dict, List, Any, Optional, Set, Tuple
+import asyncio
 import logging
+from pathlib import Path
 from contextlib import asynccontextmanager
 
-from database import get_collection, close_connection
+from database import (
+    get_async_collection,
+    get_collection,
+    get_async_database,
+    get_database,
+    open_async_connection,
+    warm_up_async_connection,
+    close_async_connection,
+    close_connection,
+)
 from models import EntryCreate, EntryRead
-from constants import (
-    BLOCKED_COMPANY_KEYWORDS,
-    BLOCKED_OPPORTUNITY_KEYWORDS,
+from dates import date_condition, to_api_dates, to_bson_date, utc_now
+from stats import build_rollup_stats_pipeline, format_stats
+from cache import CACHE_BACKEND, CACHE_CONTROL, CacheKey, ReadCache, cache_key, club_scope, create_version_backend
+from encoding import (
+    ENTRY_PROJECTION,
+    RAW_CODEC_OPTIONS,
+    FastJSONResponse,
+    InvalidFieldsError,
+    dumps,
+    entry_projection,
+    parse_fields,
 )
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
+from compression import CompressionMiddleware, compression_counters
+from mongo_telemetry import mongo_telemetry
+from logging_config import RouteContextMiddleware, configure_logging
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, request_metrics, stats_lines
+from export import EXPORT_BATCH_SIZE, EXPORT_MEDIA_TYPES, encode_entries, gzip_chunks
+from pagination import (
+    DEFAULT_PAGE_SIZE,
+    ENTRY_SORT,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    encode_cursor,
+    keyset_filter,
 )
+from rollups import ROLLUPS_COLLECTION, EntryChange, apply_rollup_changes
+from blocklist import COMPANY_BLOCKLIST, OPPORTUNITY_BLOCKLIST
+from normalize import KEY_FIELDS, add_search_keys, prefix_range, search_key
+from migrations import bootstrap_rollups, run_pending_migrations
+from indexes import index_changes
+from warmup import readiness
+from duplicates import build_duplicate_pipeline, contact_conditions, format_duplicate_result
+from duplicate_filter import DUPLICATE_FILTER_ENABLED, duplicate_filter
+from importer import IMPORT_DIR, IMPORT_JOBS_COLLECTION, IMPORT_MAX_BYTES, ImportJob, import_format, run_import
+from batcher import INSERT_BATCHING, InsertBatcher
+from bulk import BULK_MAX_ROWS, build_documents, insert_documents, row_results, screen_rows, validate_rows
+from autocomplete import (
+    company_index,
+    contact_index,
+    load_autocomplete_indexes,
+    record_autocomplete_change,
+    refresh_autocomplete_indexes,
+)
+
+# Configure logging: records are queued and written by a background thread
+configure_logging()
 logger = logging.getLogger(__name__)
 
+# Read cache shared by the query endpoints; its version backend is attached at startup
+read_cache = ReadCache()
+
+# Groups concurrent creates into insert_many batches when INSERT_BATCHING is on
+insert_batcher = InsertBatcher(lambda: get_async_collection(endpoint="create"))
+
+# Running import jobs, referenced so they are not garbage collected
+import_tasks: Set["asyncio.Task[None]"] = set()
+
+def log_migration_result(task: "asyncio.Task[List[str]]") -> None:
+    """Report the outcome of the background migration run."""
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        logger.error("Database migrations failed", exc_info=task.exception())
+    elif task.result():
+        logger.info("Applied database migrations: %s", ', '.join(task.result()))
+
 # Lifespan context manager for startup/shutdown events
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("🚀 Application starting up...")
+    # Warm everything up before the worker accepts its first request
+    async with readiness.step("mongo"):
+        db = await open_async_connection()
+        await warm_up_async_connection()
+    async with readiness.step("indexes", required=False):
+        # Also connects the sync client used by migrations and imports
+        missing, retired = await asyncio.to_thread(index_changes, get_database())
+        for name, indexes in missing.items():
+            for keys in indexes:
+                logger.warning("%s: managed index %s missing, the pending index migration creates it", name, list(keys))
+    async with readiness.step("rollups"):
+        # Built once, under the migration lock, by whichever worker gets it first
+        if await asyncio.to_thread(bootstrap_rollups, get_database()):
+            logger.info("Built stats rollups from existing entries")
+    read_cache.backend = create_version_backend(CACHE_BACKEND, db)
+    # Data migrations can take a while on large collections; don't hold up startup
+    migrations_task = asyncio.create_task(asyncio.to_thread(run_pending_migrations))
+    migrations_task.add_done_callback(log_migration_result)
+    async with readiness.step("autocomplete", required=False):
+        await load_autocomplete_indexes(db)
+    autocomplete_task = asyncio.create_task(refresh_autocomplete_indexes(db))
+    if DUPLICATE_FILTER_ENABLED:
+        # Until built, duplicate checks go to MongoDB and a write schedules the build
+        async with readiness.step("duplicate_filter", required=False):
+            await duplicate_filter.rebuild(db, read_cache.backend)
+    readiness.mark_ready()
     yield
+    readiness.ready = False
     logger.info("🛑 Application shutting down...")
+    autocomplete_task.cancel()
+    duplicate_filter.cancel()
+    await insert_batcher.close()
+    await read_cache.backend.close()
+    await close_async_connection()
     close_connection()
 
 app = FastAPI(
     title="Tracking System API",
     description="API for managing company outreach and opportunities",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS
@@ -49,21 +145,135 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON/NDJSON/text responses with brotli or gzip
+app.add_middleware(CompressionMiddleware)
+
+# Lets log sampling see which route a record was logged for
+app.add_middleware(RouteContextMiddleware)
+
+# Request latency histograms for /metrics; outermost, so compression is included
+app.add_middleware(MetricsMiddleware)
+
 # Helper function to convert MongoDB ObjectId to string
 def serialize_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
     """Convert MongoDB document to JSON-serializable format."""
     if doc and "_id" in doc:
         doc["id"] = str(doc["_id"])
         del doc["_id"]
-    return doc
+    # Normalized lookup keys are internal to the database
+    for key_field in KEY_FIELDS.values():
+        doc.pop(key_field, None)
+    return to_api_dates(doc)
+
+
+async def run_aggregate(collection: AsyncCollection, pipeline: List[Dict[str, Any]], **kwargs: Any) -> List[Dict[str, Any]]:
+    """Run an aggregation pipeline and return all resulting documents."""
+    cursor = await collection.aggregate(pipeline, **kwargs)
+    return await cursor.to_list(length=None)
+
+
+def refresh_duplicate_filter_if_needed() -> None:
+    """Rebuild the duplicate pre-filter in the background when it fell behind."""
+    if DUPLICATE_FILTER_ENABLED and (duplicate_filter.stale or duplicate_filter.needs_rebuild()):
+        duplicate_filter.schedule_rebuild(get_async_database(), read_cache.backend)
+
+
+async def record_entry_changes(changes: List[EntryChange]) -> None:
+    """Propagate a batch of entry writes to derived data without failing the request.
+
+    Each change is a ``(before, after)`` pair, with ``None`` on one side for
+    inserts and deletes. Updates the autocomplete indexes, moves the stats
+    rollups in one bulk write, then invalidates cached reads once, plus once
+    per club touched, and updates the duplicate pre-filter. The versions are
+    bumped last: a read cached between the two steps would otherwise store
+    the old rollups under the new version.
+    """
+    clubs: Set[str] = set()
+    for before, after in changes:
+        record_autocomplete_change(before, after)
+        clubs.update(doc["club"] for doc in (before, after) if doc is not None and doc.get("club"))
+    try:
+        await apply_rollup_changes(get_async_database(), changes)
+    except Exception as e:
+        logger.error("Failed to update stats rollups, run `python rollups.py rebuild`: %s", e, exc_info=True)
+    version = None
+    try:
+        version = await read_cache.invalidate()
+        for club in clubs:
+            await read_cache.invalidate(club_scope(club))
+    except Exception as e:
+        logger.error("Failed to bump cache version: %s", e, exc_info=True)
+    duplicate_filter.record_changes(changes, version)
+    refresh_duplicate_filter_if_needed()
+
+
+async def record_entry_change(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+    """Propagate a single entry write, see ``record_entry_changes``."""
+    await record_entry_changes([(before, after)])
 
 
-def find_blocked_keywords(value: Optional[str], blocked_terms: List[str]) -> List[str]:
-    """Return blocked keywords found in the provided value."""
-    if not value:
-        return []
-    lowered = value.lower()
-    return [term for term in blocked_terms if term in lowered]
+def build_entries_query(
+    member_name: Optional[str] = None,
+    club: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    company: Optional[str] = None,
+    opportunity_type: Optional[str] = None,
+    status: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build the Mongo filter shared by the entry listing and export endpoints."""
+    query: Dict[str, Any] = {}
+
+    if member_name:
+        query["member_name"] = member_name
+
+    if club:
+        query["club"] = club
+
+    # Case- and accent-insensitive prefix match on the normalized keys
+    if company:
+        query["company_key"] = prefix_range(company)
+
+    if opportunity_type:
+        query["opportunity_type_key"] = prefix_range(opportunity_type)
+
+    if status:
+        query["status"] = status
+
+    # Filter by date range
+    query.update(date_condition("entry_date", start_date, end_date))
+
+    return query
+
+
+def check_date_range(start_date: Optional[str], end_date: Optional[str]) -> None:
+    """Reject ``start_date``/``end_date`` values that are not ISO dates with a 400."""
+    for name, value in (("start_date", start_date), ("end_date", end_date)):
+        if value:
+            try:
+                to_bson_date(value)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid {name}: expected an ISO date (YYYY-MM-DD)")
+
+
+async def conditional_get(
+    request: Request,
+    namespace: str,
+    key: CacheKey,
+    scope: str
+) -> Tuple[Dict[str, str], Optional[Response], int]:
+    """Return the ETag headers of a cached read, the 304 that answers it if any, and the version.
+
+    The tag comes from the version of ``scope`` and the normalized query, so
+    an unchanged response is recognized without running the query. Pass the
+    version on to ``read_cache.get_or_load`` so it is read once per request.
+    """
+    version = await read_cache.version(scope)
+    etag = read_cache.entity_tag(namespace, key, scope, version)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if read_cache.is_not_modified(request.headers.get("if-none-match"), etag):
+        return headers, Response(status_code=304, headers=headers), version
+    return headers, None, version
 
 
 def resolve_entry_id(entry_id: str) -> Any:
@@ -77,8 +287,8 @@ def resolve_entry_id(entry_id: str) -> Any:
 async def create_entry(entry: EntryCreate):
     """Create a new entry."""
     try:
-        logger.info(f"Creating new entry for company: {entry.company}")
-        blocked_company = find_blocked_keywords(entry.company, BLOCKED_COMPANY_KEYWORDS)
+        logger.info("Creating new entry for company: %s", entry.company)
+        blocked_company = COMPANY_BLOCKLIST.find(entry.company)
         if blocked_company:
             logger.warning("Blocked company detected during creation", extra={"company": entry.company, "matches": blocked_company})
             raise HTTPException(
@@ -89,7 +299,7 @@ async def create_entry(entry: EntryCreate):
                 }
             )
 
-        blocked_type = find_blocked_keywords(entry.opportunity_type, BLOCKED_OPPORTUNITY_KEYWORDS)
+        blocked_type = OPPORTUNITY_BLOCKLIST.find(entry.opportunity_type)
         if blocked_type:
             logger.warning("Blocked opportunity type detected", extra={"opportunity_type": entry.opportunity_type, "matches": blocked_type})
             raise HTTPException(
@@ -101,118 +311,280 @@ async def create_entry(entry: EntryCreate):
             )
         
         # Prepare document for MongoDB
-        entry_dict = entry.model_dump()
-        entry_dict["created_at"] = datetime.utcnow().isoformat()
-        entry_dict["updated_at"] = datetime.utcnow().isoformat()
-        
-        # Insert into MongoDB
-        collection = get_collection()
-        result = collection.insert_one(entry_dict)
-        
-        # Fetch the created document
-        created_doc = collection.find_one({"_id": result.inserted_id})
-        
-        logger.info(f"Entry created successfully with ID: {result.inserted_id}")
+        entry_dict = add_search_keys(entry.model_dump())
+        entry_dict["entry_date"] = to_bson_date(entry_dict["entry_date"])
+        entry_dict["created_at"] = entry_dict["updated_at"] = utc_now()
+        
+        # Insert into MongoDB, grouped with concurrent creates when batching is
+        # on; the generated _id is set on entry_dict, which then is exactly
+        # the stored document
+        if INSERT_BATCHING:
+            inserted_id = await insert_batcher.insert(entry_dict)
+        else:
+            collection = get_async_collection(endpoint="create")
+            inserted_id = (await collection.insert_one(entry_dict)).inserted_id
+        await record_entry_change(None, entry_dict)
+        
+        logger.info("Entry created successfully with ID: %s", inserted_id)
         
         return {
             "success": True,
             "message": "Entry created successfully",
-            "data": serialize_doc(created_doc)
+            "data": serialize_doc(dict(entry_dict))
         }
         
     except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
+        logger.error("Validation error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error creating entry: {str(e)}", exc_info=True)
+        logger.error("Error creating entry: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/entries")
-async def get_entries(
-    member_name: Optional[str] = Query(None),
-    club: Optional[str] = Query(None),
-    start_date: Optional[str] = Query(None),
-    end_date: Optional[str] = Query(None),
-    company: Optional[str] = Query(None),
-    opportunity_type: Optional[str] = Query(None),
-    status: Optional[str] = Query(None)
-):
-    """Get all entries with optional filtering."""
+@app.post("/api/entries/bulk")
+async def create_entries_bulk(rows: List[Any] = Body(..., min_length=1, max_length=BULK_MAX_ROWS)):
+    """Create many entries at once, reporting success or the error of each row."""
     try:
-        logger.info(f"Fetching entries with filters - name: {member_name}, club: {club}, dates: {start_date} to {end_date}")
+        logger.info("Bulk creating %s entries", len(rows))
+        valid, errors = validate_rows(rows)
+        errors.update(screen_rows(valid))
+        documents = build_documents([(index, entry) for index, entry in valid if index not in errors])
         
-        # Build filter query
-        query: Dict[str, Any] = {}
+        inserted, write_errors = await insert_documents(get_async_collection(endpoint="bulk"), documents)
+        errors.update(write_errors)
+        if inserted:
+            await record_entry_changes([(None, doc) for _, doc in inserted])
         
-        if member_name:
-            query["member_name"] = member_name
+        logger.info("Bulk create inserted %s of %s entries", len(inserted), len(rows))
         
-        if club:
-            query["club"] = club
+        return {
+            "success": True,
+            "message": f"Created {len(inserted)} of {len(rows)} entries",
+            "data": {
+                "created": len(inserted),
+                "failed": len(rows) - len(inserted),
+                "results": row_results(len(rows), inserted, errors)
+            }
+        }
+    except Exception as e:
+        logger.error("Error bulk creating entries: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
 
-        if company:
-            query["company"] = {"$regex": company, "$options": "i"}
 
-        if opportunity_type:
-            query["opportunity_type"] = {"$regex": opportunity_type, "$options": "i"}
+def run_import_job(job: ImportJob, loop: asyncio.AbstractEventLoop) -> None:
+    """Run an uploaded import in a worker thread, saving progress to ``import_jobs``."""
+    jobs = get_collection(IMPORT_JOBS_COLLECTION)
 
-        if status:
-            query["status"] = status
-        
-        # Filter by date range
-        if start_date:
-            if "entry_date" not in query:
-                query["entry_date"] = {}
-            query["entry_date"]["$gte"] = start_date
-        
-        if end_date:
-            if "entry_date" not in query:
-                query["entry_date"] = {}
-            query["entry_date"]["$lte"] = end_date
-        
-        # Get entries from MongoDB
-        collection = get_collection()
-        entries = list(collection.find(query).sort("created_at", -1))
-        
-        # Serialize documents
-        serialized_entries = [serialize_doc(entry) for entry in entries]
-        
-        logger.info(f"Retrieved {len(serialized_entries)} entries")
+    def save_progress(job: ImportJob) -> None:
+        jobs.replace_one(
+            {"_id": job.id},
+            {**job.to_dict(), "rejected_path": str(job.rejected_path)},
+            upsert=True
+        )
+
+    def on_insert(docs: List[Dict[str, Any]]) -> None:
+        # Derived data lives on the event loop
+        changes = [(None, doc) for doc in docs]
+        asyncio.run_coroutine_threadsafe(record_entry_changes(changes), loop).result()
+
+    try:
+        run_import(job, get_collection(endpoint="import"), on_insert=on_insert, on_progress=save_progress)
+        logger.info("Import %s %s: %s inserted, %s rejected", job.id, job.status, job.rows_inserted, job.rows_rejected)
+    finally:
+        job.source_path.unlink(missing_ok=True)
+
+
+@app.post("/api/imports", status_code=202)
+async def create_import(
+    request: Request,
+    filename: str = Query(..., min_length=1),
+    format: Optional[str] = Query(None, pattern="^(csv|xlsx)$")
+):
+    """Start importing a CSV/XLSX file sent as the raw request body."""
+    try:
+        job = ImportJob(filename, import_format(filename, format))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        logger.info("Receiving import %s from %s", job.id, filename)
+        IMPORT_DIR.mkdir(parents=True, exist_ok=True)
+        
+        # Stream the body to disk; the upload is never held in memory
+        size = 0
+        with open(job.source_path, "wb") as upload:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > IMPORT_MAX_BYTES:
+                    raise HTTPException(status_code=413, detail=f"Imports are limited to {IMPORT_MAX_BYTES} bytes")
+                await asyncio.to_thread(upload.write, chunk)
+        
+        await get_async_collection(IMPORT_JOBS_COLLECTION).insert_one(
+            {"_id": job.id, **job.to_dict(), "rejected_path": str(job.rejected_path)}
+        )
+        task = asyncio.create_task(asyncio.to_thread(run_import_job, job, asyncio.get_running_loop()))
+        import_tasks.add(task)
+        task.add_done_callback(import_tasks.discard)
         
         return {
             "success": True,
-            "data": serialized_entries,
-            "count": len(serialized_entries)
+            "message": "Import started",
+            "data": job.to_dict()
         }
+    except HTTPException:
+        job.source_path.unlink(missing_ok=True)
+        raise
+    except Exception as e:
+        job.source_path.unlink(missing_ok=True)
+        logger.error("Error starting import: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/imports/{job_id}")
+async def get_import(job_id: str):
+    """Get the status and row counters of an import."""
+    job = await get_async_collection(IMPORT_JOBS_COLLECTION).find_one({"_id": job_id}, {"_id": 0, "rejected_path": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return {"success": True, "data": job}
+
+
+@app.get("/api/imports/{job_id}/rejected")
+async def get_import_rejected_rows(job_id: str):
+    """Download the rejected rows of an import as CSV, with the row number and reason."""
+    job = await get_async_collection(IMPORT_JOBS_COLLECTION).find_one({"_id": job_id})
+    if not job or not job.get("rejected_path"):
+        raise HTTPException(status_code=404, detail="Import not found")
+    path = Path(job["rejected_path"])
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Rejected rows file not found")
+    stem = Path(job["filename"]).stem or "import"
+    return FileResponse(path, media_type="text/csv", filename=f"{stem}-rejected.csv")
+
+
+@app.get("/api/entries")
+async def get_entries(
+    request: Request,
+    member_name: Optional[str] = Query(None),
+    club: Optional[str] = Query(None),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    company: Optional[str] = Query(None),
+    opportunity_type: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return; id and created_at are always included")
+):
+    """Get a page of entries, newest first, with optional filtering."""
+    check_date_range(start_date, end_date)
+    try:
+        logger.info("Fetching entries with filters - name: %s, club: %s, dates: %s to %s", member_name, club, start_date, end_date)
         
+        fieldset = parse_fields(fields)
+        key = cache_key(
+            member_name=member_name, club=club, start_date=start_date, end_date=end_date,
+            company=company, opportunity_type=opportunity_type, status=status,
+            limit=limit, after=after, fields=fieldset
+        )
+        # Only writes to the filtered club can change a club's listing
+        scope = club_scope(club)
+        headers, not_modified, version = await conditional_get(request, "entries", key, scope)
+        if not_modified is not None:
+            return not_modified
+        
+        query = build_entries_query(member_name, club, start_date, end_date, company, opportunity_type, status)
+        page_query = keyset_filter(query, after)
+        
+        async def load_entries() -> bytes:
+            # Fetch one extra entry to know whether another page follows. The
+            # projection returns entries ready to encode and the rows stay raw
+            # BSON until they are encoded, so the page is cached as its body
+            collection = get_async_collection().with_options(codec_options=RAW_CODEC_OPTIONS)
+            cursor = collection.find(page_query, entry_projection(fieldset)).sort(ENTRY_SORT).limit(limit + 1)
+            entries = await cursor.to_list(length=None)
+            
+            next_cursor = None
+            if len(entries) > limit:
+                entries = entries[:limit]
+                next_cursor = encode_cursor(entries[-1])
+            
+            logger.info("Retrieved %s entries", len(entries))
+            
+            return dumps({
+                "success": True,
+                "data": entries,
+                "count": len(entries),
+                "next_cursor": next_cursor
+            })
+        
+        body = await read_cache.get_or_load("entries", key, load_entries, scope, version)
+        return Response(content=body, media_type="application/json", headers=headers)
+        
+    except (InvalidCursorError, InvalidFieldsError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error fetching entries: {str(e)}", exc_info=True)
+        logger.error("Error fetching entries: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/entries/export")
+async def export_entries(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = Query(False, description="Compress the download with gzip"),
+    member_name: Optional[str] = Query(None),
+    club: Optional[str] = Query(None),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    company: Optional[str] = Query(None),
+    opportunity_type: Optional[str] = Query(None),
+    status: Optional[str] = Query(None)
+):
+    """Stream every matching entry as NDJSON or CSV, optionally gzip-compressed."""
+    logger.info("Exporting entries as %s - name: %s, club: %s, dates: %s to %s", format, member_name, club, start_date, end_date)
+    check_date_range(start_date, end_date)
+    query = build_entries_query(member_name, club, start_date, end_date, company, opportunity_type, status)
+    
+    collection = get_async_collection()
+    cursor = collection.find(query, batch_size=EXPORT_BATCH_SIZE).sort(ENTRY_SORT)
+    chunks = encode_entries(cursor, format)
+    
+    filename = f"entries_{datetime.utcnow().date().isoformat()}.{format}"
+    media_type = EXPORT_MEDIA_TYPES[format]
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+    
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @app.get("/api/entries/{entry_id}")
 async def get_entry(entry_id: str):
     """Get a specific entry by ID."""
     try:
-        logger.info(f"Fetching entry with ID: {entry_id}")
-        collection = get_collection()
+        logger.info("Fetching entry with ID: %s", entry_id)
+        collection = get_async_collection()
         lookup_id = resolve_entry_id(entry_id)
-        entry = collection.find_one({"_id": lookup_id})
+        entry = await collection.find_one({"_id": lookup_id}, ENTRY_PROJECTION)
         
         if not entry:
-            logger.warning(f"Entry not found: {entry_id}")
+            logger.warning("Entry not found: %s", entry_id)
             raise HTTPException(status_code=404, detail="Entry not found")
         
-        return {
+        return FastJSONResponse({
             "success": True,
-            "data": serialize_doc(entry)
-        }
+            "data": entry
+        })
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching entry: {str(e)}", exc_info=True)
+        logger.error("Error fetching entry: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -220,9 +592,9 @@ async def get_entry(entry_id: str):
 async def update_entry(entry_id: str, entry: EntryCreate):
     """Update an entry."""
     try:
-        logger.info(f"Updating entry with ID: {entry_id}")
+        logger.info("Updating entry with ID: %s", entry_id)
 
-        blocked_company = find_blocked_keywords(entry.company, BLOCKED_COMPANY_KEYWORDS)
+        blocked_company = COMPANY_BLOCKLIST.find(entry.company)
         if blocked_company:
             logger.warning("Blocked company detected during update", extra={"company": entry.company, "matches": blocked_company})
             raise HTTPException(
@@ -233,7 +605,7 @@ async def update_entry(entry_id: str, entry: EntryCreate):
                 }
             )
 
-        blocked_type = find_blocked_keywords(entry.opportunity_type, BLOCKED_OPPORTUNITY_KEYWORDS)
+        blocked_type = OPPORTUNITY_BLOCKLIST.find(entry.opportunity_type)
         if blocked_type:
             logger.warning("Blocked opportunity type detected during update", extra={"opportunity_type": entry.opportunity_type, "matches": blocked_type})
             raise HTTPException(
@@ -245,25 +617,29 @@ async def update_entry(entry_id: str, entry: EntryCreate):
             )
         
         # Prepare update
-        entry_dict = entry.model_dump()
-        entry_dict["updated_at"] = datetime.utcnow().isoformat()
+        entry_dict = add_search_keys(entry.model_dump())
+        entry_dict["entry_date"] = to_bson_date(entry_dict["entry_date"])
+        entry_dict["updated_at"] = utc_now()
         
         # Update in MongoDB
-        collection = get_collection()
+        collection = get_async_collection(endpoint="update")
         lookup_id = resolve_entry_id(entry_id)
-        result = collection.update_one(
+        previous_doc = await collection.find_one_and_update(
             {"_id": lookup_id},
-            {"$set": entry_dict}
+            {"$set": entry_dict},
+            return_document=ReturnDocument.BEFORE
         )
         
-        if result.matched_count == 0:
-            logger.warning(f"Entry not found for update: {entry_id}")
+        if previous_doc is None:
+            logger.warning("Entry not found for update: %s", entry_id)
             raise HTTPException(status_code=404, detail="Entry not found")
         
-        # Fetch updated document
-        updated_doc = collection.find_one({"_id": lookup_id})
+        # The stored document is the previous one with the $set applied; the
+        # rollups need both versions, so it is built here instead of returned
+        updated_doc = {**previous_doc, **entry_dict}
+        await record_entry_change(previous_doc, updated_doc)
         
-        logger.info(f"Entry updated successfully: {entry_id}")
+        logger.info("Entry updated successfully: %s", entry_id)
         
         return {
             "success": True,
@@ -272,12 +648,12 @@ async def update_entry(entry_id: str, entry: EntryCreate):
         }
         
     except ValueError as e:
-        logger.error(f"Validation error: {str(e)}")
+        logger.error("Validation error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating entry: {str(e)}", exc_info=True)
+        logger.error("Error updating entry: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -285,16 +661,18 @@ async def update_entry(entry_id: str, entry: EntryCreate):
 async def delete_entry(entry_id: str):
     """Delete an entry."""
     try:
-        logger.info(f"Deleting entry with ID: {entry_id}")
-        collection = get_collection()
+        logger.info("Deleting entry with ID: %s", entry_id)
+        collection = get_async_collection(endpoint="delete")
         lookup_id = resolve_entry_id(entry_id)
-        result = collection.delete_one({"_id": lookup_id})
+        deleted_doc = await collection.find_one_and_delete({"_id": lookup_id})
         
-        if result.deleted_count == 0:
-            logger.warning(f"Entry not found for deletion: {entry_id}")
+        if deleted_doc is None:
+            logger.warning("Entry not found for deletion: %s", entry_id)
             raise HTTPException(status_code=404, detail="Entry not found")
         
-        logger.info(f"Entry deleted successfully: {entry_id}")
+        await record_entry_change(deleted_doc, None)
+        
+        logger.info("Entry deleted successfully: %s", entry_id)
         
         return {
             "success": True,
@@ -304,7 +682,7 @@ async def delete_entry(entry_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting entry: {str(e)}", exc_info=True)
+        logger.error("Error deleting entry: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -332,7 +710,7 @@ async def update_entry_status(
 
         update_payload: Dict[str, Any] = {
             "status": status,
-            "updated_at": datetime.utcnow().isoformat()
+            "updated_at": utc_now()
         }
 
         if status == "Others":
@@ -342,17 +720,19 @@ async def update_entry_status(
         elif status_notes is not None:
             update_payload["status_notes"] = status_notes or None
 
-        collection = get_collection()
+        collection = get_async_collection(endpoint="status")
         lookup_id = resolve_entry_id(entry_id)
-        result = collection.update_one(
+        previous_doc = await collection.find_one_and_update(
             {"_id": lookup_id},
-            {"$set": update_payload}
+            {"$set": update_payload},
+            return_document=ReturnDocument.BEFORE
         )
 
-        if result.matched_count == 0:
+        if previous_doc is None:
             raise HTTPException(status_code=404, detail="Entry not found")
 
-        updated_doc = collection.find_one({"_id": lookup_id})
+        updated_doc = {**previous_doc, **update_payload}
+        await record_entry_change(previous_doc, updated_doc)
         return {
             "success": True,
             "message": "Status updated successfully",
@@ -368,302 +748,89 @@ async def update_entry_status(
 
 @app.get("/api/stats")
 async def get_stats(
+    request: Request,
     club: Optional[str] = Query(None),
     member_name: Optional[str] = Query(None),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None)
 ):
     """Get comprehensive statistics about entries with optional filtering."""
+    check_date_range(start_date, end_date)
     try:
-        logger.info(f"Fetching statistics - club: {club}, member: {member_name}, dates: {start_date} to {end_date}")
-        collection = get_collection()
-        
-        # Build base filter query
-        base_filter: Dict[str, Any] = {}
-        if club:
-            base_filter["club"] = club
-        if member_name:
-            base_filter["member_name"] = member_name
-        if start_date:
-            if "entry_date" not in base_filter:
-                base_filter["entry_date"] = {}
-            base_filter["entry_date"]["$gte"] = start_date
-        if end_date:
-            if "entry_date" not in base_filter:
-                base_filter["entry_date"] = {}
-            base_filter["entry_date"]["$lte"] = end_date
-        
-        # Total entries
-        total_entries = collection.count_documents(base_filter)
-        
-        # Recent entries (last 7 days)
-        seven_days_ago = (datetime.now() - timedelta(days=7)).date().isoformat()
-        recent_filter = {**base_filter, "entry_date": {"$gte": seven_days_ago}}
-        recent_count = collection.count_documents(recent_filter)
-        
-        # Last 30 days
-        thirty_days_ago = (datetime.now() - timedelta(days=30)).date().isoformat()
-        month_filter = {**base_filter, "entry_date": {"$gte": thirty_days_ago}}
-        month_count = collection.count_documents(month_filter)
-        
-        # Status distribution
-        status_pipeline = [
-            {"$match": base_filter},
-            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}}
-        ]
-        status_stats = list(collection.aggregate(status_pipeline))
+        logger.info("Fetching statistics - club: %s, member: %s, dates: %s to %s", club, member_name, start_date, end_date)
         
-        # Club distribution
-        club_pipeline = [
-            {"$match": base_filter},
-            {"$group": {"_id": "$club", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}}
-        ]
-        club_stats = list(collection.aggregate(club_pipeline))
-        
-        # Member contributions (with club info)
-        member_pipeline = [
-            {"$match": base_filter},
-            {"$group": {
-                "_id": {
-                    "member_name": "$member_name",
-                    "club": "$club"
-                },
-                "count": {"$sum": 1},
-                "statuses": {"$push": "$status"}
-            }},
-            {"$project": {
-                "member_name": "$_id.member_name",
-                "club": "$_id.club",
-                "count": 1,
-                "yet_to_contact": {
-                    "$size": {
-                        "$filter": {
-                            "input": "$statuses",
-                            "as": "status",
-                            "cond": {"$eq": ["$$status", "Yet to contact"]}
-                        }
-                    }
-                },
-                "in_progress": {
-                    "$size": {
-                        "$filter": {
-                            "input": "$statuses",
-                            "as": "status",
-                            "cond": {"$eq": ["$$status", "In progress"]}
-                        }
-                    }
-                },
-                "rejected": {
-                    "$size": {
-                        "$filter": {
-                            "input": "$statuses",
-                            "as": "status",
-                            "cond": {"$eq": ["$$status", "Rejected"]}
-                        }
-                    }
-                },
-                "requested_linkedin": {
-                    "$size": {
-                        "$filter": {
-                            "input": "$statuses",
-                            "as": "status",
-                            "cond": {"$eq": ["$$status", "Requested on LinkedIn"]}
-                        }
-                    }
-                },
-                "requested_mail": {
-                    "$size": {
-                        "$filter": {
-                            "input": "$statuses",
-                            "as": "status",
-                            "cond": {"$eq": ["$$status", "Requested on mail"]}
-                        }
-                    }
-                }
-            }},
-            {"$sort": {"count": -1}},
-            {"$limit": 20}
-        ]
-        member_stats = list(collection.aggregate(member_pipeline))
-        
-        # Company distribution (top 15)
-        company_pipeline = [
-            {"$match": base_filter},
-            {"$group": {"_id": "$company", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-            {"$limit": 15}
-        ]
-        company_stats = list(collection.aggregate(company_pipeline))
-        
-        # Daily timeline (entries per day for last 30 days)
-        daily_pipeline = [
-            {"$match": month_filter},
-            {"$group": {
-                "_id": "$entry_date",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"_id": 1}}
-        ]
-        daily_stats = list(collection.aggregate(daily_pipeline))
-        
-        # Contact method distribution
-        contact_pipeline = [
-            {"$match": base_filter},
-            {"$project": {
-                "has_email": {"$cond": [{"$ne": ["$email", None]}, 1, 0]},
-                "has_linkedin": {"$cond": [{"$ne": ["$linkedin", None]}, 1, 0]},
-                "has_phone": {"$cond": [{"$ne": ["$phone", None]}, 1, 0]}
-            }},
-            {"$group": {
-                "_id": None,
-                "email_count": {"$sum": "$has_email"},
-                "linkedin_count": {"$sum": "$has_linkedin"},
-                "phone_count": {"$sum": "$has_phone"}
-            }}
-        ]
-        contact_result = list(collection.aggregate(contact_pipeline))
-        contact_stats = contact_result[0] if contact_result else {
-            "email_count": 0,
-            "linkedin_count": 0,
-            "phone_count": 0
-        }
-        
-        # Opportunity type distribution
-        type_pipeline = [
-            {"$match": {**base_filter, "opportunity_type": {"$ne": None, "$ne": ""}}},
-            {"$group": {"_id": "$opportunity_type", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-            {"$limit": 10}
-        ]
-        type_stats = list(collection.aggregate(type_pipeline))
-        
-        # Club performance metrics
-        club_performance_pipeline = [
-            {"$match": base_filter},
-            {"$group": {
-                "_id": "$club",
-                "total_entries": {"$sum": 1},
-                "unique_members": {"$addToSet": "$member_name"},
-                "unique_companies": {"$addToSet": "$company"},
-                "statuses": {"$push": "$status"}
-            }},
-            {"$project": {
-                "club": "$_id",
-                "total_entries": 1,
-                "unique_members_count": {"$size": "$unique_members"},
-                "unique_companies_count": {"$size": "$unique_companies"},
-                "active_count": {
-                    "$size": {
-                        "$filter": {
-                            "input": "$statuses",
-                            "as": "status",
-                            "cond": {
-                                "$or": [
-                                    {"$eq": ["$$status", "In progress"]},
-                                    {"$eq": ["$$status", "Requested on LinkedIn"]},
-                                    {"$eq": ["$$status", "Requested on mail"]}
-                                ]
-                            }
-                        }
-                    }
-                },
-                "success_rate": {
-                    "$multiply": [
-                        {
-                            "$divide": [
-                                {
-                                    "$size": {
-                                        "$filter": {
-                                            "input": "$statuses",
-                                            "as": "status",
-                                            "cond": {
-                                                "$or": [
-                                                    {"$eq": ["$$status", "In progress"]},
-                                                    {"$eq": ["$$status", "Requested on LinkedIn"]},
-                                                    {"$eq": ["$$status", "Requested on mail"]}
-                                                ]
-                                            }
-                                        }
-                                    }
-                                },
-                                {"$size": "$statuses"}
-                            ]
-                        },
-                        100
-                    ]
-                }
-            }},
-            {"$sort": {"total_entries": -1}}
-        ]
-        club_performance = list(collection.aggregate(club_performance_pipeline))
-        
-        # Average entries per member
-        avg_per_member = 0
-        if member_stats:
-            avg_per_member = round(sum(m["count"] for m in member_stats) / len(member_stats), 2)
-        
-        logger.info(f"Statistics retrieved - Total: {total_entries}, Recent: {recent_count}")
-        
-        return {
-            "success": True,
-            "data": {
-                "summary": {
-                    "total_entries": total_entries,
-                    "recent_entries_7days": recent_count,
-                    "recent_entries_30days": month_count,
-                    "average_per_member": avg_per_member
-                },
-                "status_distribution": status_stats,
-                "club_distribution": club_stats,
-                "member_contributions": member_stats,
-                "top_companies": company_stats,
-                "daily_timeline": daily_stats,
-                "contact_methods": {
-                    "email": contact_stats.get("email_count", 0),
-                    "linkedin": contact_stats.get("linkedin_count", 0),
-                    "phone": contact_stats.get("phone_count", 0)
-                },
-                "opportunity_types": type_stats,
-                "club_performance": club_performance
+        # The 7/30 day windows move with the calendar, so the date is part of the key
+        key = cache_key(
+            club=club, member_name=member_name, start_date=start_date, end_date=end_date,
+            today=datetime.now().date().isoformat()
+        )
+        scope = club_scope(club)
+        headers, not_modified, version = await conditional_get(request, "stats", key, scope)
+        if not_modified is not None:
+            return not_modified
+        
+        async def load_stats() -> Dict[str, Any]:
+            collection = get_async_collection(ROLLUPS_COLLECTION)
+            pipeline = build_rollup_stats_pipeline(club, member_name, start_date, end_date)
+            results = await run_aggregate(collection, pipeline, allowDiskUse=True)
+            stats = format_stats(results[0] if results else {})
+            summary = stats["summary"]
+            
+            logger.info("Statistics retrieved - Total: %s, Recent: %s", summary['total_entries'], summary['recent_entries_7days'])
+            
+            return {
+                "success": True,
+                "data": stats
             }
-        }
+        
+        return FastJSONResponse(await read_cache.get_or_load("stats", key, load_stats, scope, version), headers=headers)
         
     except Exception as e:
-        logger.error(f"Error fetching stats: {str(e)}", exc_info=True)
+        logger.error("Error fetching stats: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/suggestions/companies")
-async def get_company_suggestions(q: str = Query(..., min_length=2)):
+async def get_company_suggestions(
+    q: str = Query(..., min_length=2),
+    order: str = Query("frequency", pattern="^(frequency|alpha)$")
+):
     """Get company name suggestions for autocomplete."""
     try:
-        logger.info(f"Fetching company suggestions for query: {q}")
-        collection = get_collection()
+        logger.info("Fetching company suggestions for query: %s", q)
+        if company_index.ready:
+            return {"success": True, "data": company_index.suggest(q, order=order)}
+        
+        collection = get_async_collection()
         
         # Use aggregation to get distinct companies matching the query
         pipeline = [
             {
                 "$match": {
-                    "company": {"$regex": f"^{q}", "$options": "i"}
+                    "company_key": prefix_range(q)
                 }
             },
             {
                 "$group": {
-                    "_id": "$company"
+                    "_id": "$company",
+                    "count": {"$sum": 1}
                 }
             },
             {
-                "$sort": {"_id": 1}
+                # Same order as the index: most used first, ties alphabetically
+                "$sort": {"count": -1, "_id": 1} if order == "frequency" else {"_id": 1}
             },
             {
                 "$limit": 10
             }
         ]
         
-        companies = list(collection.aggregate(pipeline))
-        suggestions = [doc["_id"] for doc in companies]
+        async def load_companies() -> List[str]:
+            companies = await run_aggregate(collection, pipeline)
+            return [doc["_id"] for doc in companies]
+        
+        # Prefixes that normalize to the same key share an entry
+        suggestions = await read_cache.get_or_load("company_suggestions", cache_key(q=search_key(q), order=order), load_companies)
         
         return {
             "success": True,
@@ -671,39 +838,51 @@ async def get_company_suggestions(q: str = Query(..., min_length=2)):
         }
         
     except Exception as e:
-        logger.error(f"Error fetching company suggestions: {str(e)}", exc_info=True)
+        logger.error("Error fetching company suggestions: %s", e, exc_info=True)
         return {"success": False, "data": []}
 
 
 @app.get("/api/suggestions/contacts")
-async def get_contact_suggestions(q: str = Query(..., min_length=2)):
+async def get_contact_suggestions(
+    q: str = Query(..., min_length=2),
+    order: str = Query("frequency", pattern="^(frequency|alpha)$")
+):
     """Get contact person name suggestions for autocomplete."""
     try:
-        logger.info(f"Fetching contact person suggestions for query: {q}")
-        collection = get_collection()
+        logger.info("Fetching contact person suggestions for query: %s", q)
+        if contact_index.ready:
+            return {"success": True, "data": contact_index.suggest(q, order=order)}
+        
+        collection = get_async_collection()
         
         # Use aggregation to get distinct contact persons matching the query
         pipeline = [
             {
                 "$match": {
-                    "contact_person": {"$ne": None, "$regex": f"^{q}", "$options": "i"}
+                    "contact_key": prefix_range(q)
                 }
             },
             {
                 "$group": {
-                    "_id": "$contact_person"
+                    "_id": "$contact_person",
+                    "count": {"$sum": 1}
                 }
             },
             {
-                "$sort": {"_id": 1}
+                # Same order as the index: most used first, ties alphabetically
+                "$sort": {"count": -1, "_id": 1} if order == "frequency" else {"_id": 1}
             },
             {
                 "$limit": 10
             }
         ]
         
-        contacts = list(collection.aggregate(pipeline))
-        suggestions = [doc["_id"] for doc in contacts]
+        async def load_contacts() -> List[str]:
+            contacts = await run_aggregate(collection, pipeline)
+            return [doc["_id"] for doc in contacts]
+        
+        # Prefixes that normalize to the same key share an entry
+        suggestions = await read_cache.get_or_load("contact_suggestions", cache_key(q=search_key(q), order=order), load_contacts)
         
         return {
             "success": True,
@@ -711,7 +890,7 @@ async def get_contact_suggestions(q: str = Query(..., min_length=2)):
         }
         
     except Exception as e:
-        logger.error(f"Error fetching contact person suggestions: {str(e)}", exc_info=True)
+        logger.error("Error fetching contact person suggestions: %s", e, exc_info=True)
         return {"success": False, "data": []}
 
 
@@ -725,90 +904,103 @@ async def check_duplicate(
 ):
     """Check if contact details or company already exist in database."""
     try:
-        collection = get_collection()
-        
-        # Check for duplicate contact information (email, phone, or linkedin)
-        contact_conditions = []
-        if email and email.strip():
-            contact_conditions.append({"email": email.strip()})
-        if phone and phone.strip():
-            contact_conditions.append({"phone": phone.strip()})
-        if linkedin and linkedin.strip():
-            contact_conditions.append({"linkedin": linkedin.strip()})
-        
-        duplicate_contact = None
-        if contact_conditions:
-            contact_query: Dict[str, Any]
-            if exclude_id:
-                exclude_value = resolve_entry_id(exclude_id)
-                contact_query = {
-                    "$and": [
-                        {"$or": contact_conditions},
-                        {"_id": {"$ne": exclude_value}}
-                    ]
-                }
-            else:
-                contact_query = {"$or": contact_conditions}
-            duplicate_contact = collection.find_one(contact_query)
-        
-        # Check if company exists in database
-        company_exists = None
-        company_count = 0
-        if company and company.strip():
-            company_query: Dict[str, Any] = {"company": company.strip()}
-            if exclude_id:
-                company_query["_id"] = {"$ne": resolve_entry_id(exclude_id)}
-            company_exists = collection.find_one(company_query)
-            company_count = collection.count_documents(company_query)
-        
-        blocked_company = find_blocked_keywords(company, BLOCKED_COMPANY_KEYWORDS)
+        collection = get_async_collection()
+        
+        # Contacts match on canonical keys, so "+91 98765 43210" finds "919876543210"
+        contacts = contact_conditions(email, phone, linkedin)
+        lookup_company = company
+        if DUPLICATE_FILTER_ENABLED and duplicate_filter.ready:
+            # Values the pre-filter has never seen need no query
+            contacts, lookup_company = await duplicate_filter.screen(read_cache.backend, contacts, company)
+        refresh_duplicate_filter_if_needed()
+        exclude_value = resolve_entry_id(exclude_id) if exclude_id else None
+        pipeline = build_duplicate_pipeline(contacts, lookup_company, exclude_value)
+        facet_result: Dict[str, Any] = {}
+        if pipeline is not None:
+            results = await run_aggregate(collection, pipeline)
+            facet_result = results[0] if results else {}
+        
+        blocked_company = COMPANY_BLOCKLIST.find(company)
         is_financial = bool(blocked_company)
         
         return {
             "success": True,
             "data": {
-                "duplicate_contact": {
-                    "exists": duplicate_contact is not None,
-                    "details": {
-                        "company": duplicate_contact.get("company") if duplicate_contact else None,
-                        "member_name": duplicate_contact.get("member_name") if duplicate_contact else None,
-                        "status": duplicate_contact.get("status") if duplicate_contact else None,
-                        "entry_date": duplicate_contact.get("entry_date") if duplicate_contact else None,
-                        "contact_person": duplicate_contact.get("contact_person") if duplicate_contact else None
-                    } if duplicate_contact else None
-                },
-                "company_exists": {
-                    "exists": company_exists is not None,
-                    "count": company_count,
-                    "details": {
-                        "member_name": company_exists.get("member_name") if company_exists else None,
-                        "status": company_exists.get("status") if company_exists else None,
-                        "entry_date": company_exists.get("entry_date") if company_exists else None,
-                        "contact_person": company_exists.get("contact_person") if company_exists else None
-                    } if company_exists else None
-                },
+                **format_duplicate_result(facet_result),
                 "is_financial": is_financial,
                 "blocked_keywords": blocked_company
             }
         }
     except Exception as e:
-        logger.error(f"Error checking duplicates: {e}")
+        logger.error("Error checking duplicates: %s", e)
         return {"success": False, "error": str(e)}
 
 
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """Read cache counters, the footprints of the in-memory indexes and MongoDB pool/command telemetry."""
+    return {
+        "success": True,
+        "data": {
+            **read_cache.stats(),
+            "autocomplete": {
+                "companies": company_index.stats(),
+                "contacts": contact_index.stats()
+            },
+            "duplicate_filter": duplicate_filter.stats(),
+            "insert_batching": insert_batcher.stats(),
+            "compression": compression_counters.stats(),
+            "mongo": mongo_telemetry.stats()
+        }
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus metrics of this worker: request and MongoDB command histograms plus the stats counters."""
+    lines = [
+        *request_metrics.lines(),
+        *mongo_telemetry.metrics_lines(),
+        *stats_lines("tracking_read_cache", [({}, read_cache.stats())]),
+        *stats_lines("tracking_compression", [({}, compression_counters.stats())]),
+        *stats_lines("tracking_autocomplete", [
+            ({"index": "companies"}, company_index.stats()),
+            ({"index": "contacts"}, contact_index.stats()),
+        ]),
+        *stats_lines("tracking_duplicate_filter", [({}, duplicate_filter.stats())]),
+        *stats_lines("tracking_insert_batching", [({}, insert_batcher.stats())]),
+        *stats_lines("tracking_warmup", [({}, readiness.stats())]),
+    ]
+    return Response(content="\n".join(lines) + "\n", media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
 
 
+@app.get("/api/ready")
+async def readiness_check():
+    """Readiness endpoint: 200 once this worker is warmed up and MongoDB answers, 503 otherwise.
+
+    ``/api/health`` only tells that the process is alive; load balancers
+    should route by this one.
+    """
+    body = readiness.stats()
+    if not readiness.ready:
+        return FastJSONResponse({"status": "starting", **body}, status_code=503)
+    try:
+        await asyncio.wait_for(get_async_database().command("ping"), timeout=1.0)
+    except Exception as e:
+        logger.warning("Readiness ping failed: %s", e)
+        return FastJSONResponse({"status": "database unavailable", **body, "ready": False}, status_code=503)
+    return {"status": "ready", **body}
+
+
 if __name__ == "__main__":
-    import uvicorn
+    import sys
+    from start_backend import launch_backend
+    # Same production settings as start_backend.py; pass --reload for the file watcher
     logger.info("Starting application with Uvicorn...")
-    uvicorn.run(
-        "app:app",
-        host="0.0.0.0",
-        port=5000,
-        reload=True,
-        log_level="info"
-    )
+    launch_backend(["--port", "5000", *sys.argv[1:]])
@@ -0,0 +1,220 @@
+"""In-memory prefix indexes for the autocomplete endpoints.
+
+Distinct company and contact names are kept in sorted arrays of normalized
+keys (see ``normalize.py``) with a usage count per name, so a suggestion
+lookup is two binary searches plus a scan of the matching range instead of a
+Mongo aggregation per keystroke.
+
+The indexes are loaded at startup, updated by the write endpoints of this
+worker, and fully reloaded every ``AUTOCOMPLETE_REFRESH_SECONDS`` to pick up
+writes handled by other workers. An index whose estimated footprint exceeds
+``AUTOCOMPLETE_MAX_BYTES`` is dropped and the endpoints fall back to Mongo.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo.asynchronous.database import AsyncDatabase
+
+from normalize import prefix_range, search_key
+
+AUTOCOMPLETE_MAX_BYTES = int(os.getenv("AUTOCOMPLETE_MAX_BYTES", str(64 * 1024 * 1024)))
+AUTOCOMPLETE_REFRESH_SECONDS = float(os.getenv("AUTOCOMPLETE_REFRESH_SECONDS", "300"))
+
+# Per-name overhead besides the strings: two list slots and a dict entry
+_ENTRY_OVERHEAD = 2 * 8 + 100
+
+# Frequency rankings over more names than this are memoized per prefix, so
+# short prefixes ("ac") don't rescan thousands of names on every keystroke
+_MEMO_MIN_MATCHES = 256
+
+logger = logging.getLogger(__name__)
+
+
+class PrefixIndex:
+    """Sorted prefix index of display names with usage counts."""
+
+    def __init__(self, name: str, max_bytes: int = AUTOCOMPLETE_MAX_BYTES) -> None:
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ready = False
+        self._keys: List[str] = []
+        self._names: List[str] = []
+        self._counts: Dict[str, int] = {}
+        self._bytes = 0
+        self._ranked: Dict[str, Dict[int, List[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @staticmethod
+    def _entry_bytes(key: str, name: str) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(name) + _ENTRY_OVERHEAD
+
+    def memory_bytes(self) -> int:
+        """Estimated footprint of the index, including container overhead."""
+        return (
+            self._bytes
+            + sys.getsizeof(self._keys)
+            + sys.getsizeof(self._names)
+            + sys.getsizeof(self._counts)
+        )
+
+    def load(self, counts: Iterable[Tuple[Optional[str], int]]) -> bool:
+        """Replace the contents with ``(name, count)`` pairs; False if over budget."""
+        rows = []
+        total = 0
+        for name, count in counts:
+            key = search_key(name)
+            if not key or count <= 0:
+                continue
+            rows.append((key, name, count))
+            total += self._entry_bytes(key, name)
+            if total > self.max_bytes:
+                self._disable(f"loading exceeded {self.max_bytes} bytes")
+                return False
+        rows.sort()
+
+        self._keys = [key for key, _, _ in rows]
+        self._names = [name for _, name, _ in rows]
+        self._counts = {name: count for _, name, count in rows}
+        self._bytes = total
+        self._ranked = {}
+        self.ready = True
+        return True
+
+    def _disable(self, reason: str) -> None:
+        logger.warning("Autocomplete index %s disabled: %s", self.name, reason)
+        self.ready = False
+        self._keys, self._names, self._counts, self._bytes = [], [], {}, 0
+        self._ranked = {}
+
+    def _forget_rankings(self, key: str) -> None:
+        """Drop memoized rankings of every prefix of ``key``."""
+        if self._ranked:
+            for end in range(1, len(key) + 1):
+                self._ranked.pop(key[:end], None)
+
+    def _position(self, key: str, name: str) -> Tuple[int, bool]:
+        """Index of ``name`` in the arrays (or where it would go) and whether it is present."""
+        low = bisect_left(self._keys, key)
+        high = bisect_right(self._keys, key, low)
+        names = self._names
+        position = low
+        while position < high and names[position] < name:
+            position += 1
+        return position, position < high and names[position] == name
+
+    def add(self, name: Optional[str]) -> None:
+        """Count one more use of ``name``."""
+        key = search_key(name)
+        if not self.ready or not key:
+            return
+        self._forget_rankings(key)
+        if name in self._counts:
+            self._counts[name] += 1
+            return
+        self._bytes += self._entry_bytes(key, name)
+        if self._bytes > self.max_bytes:
+            self._disable(f"grew past {self.max_bytes} bytes")
+            return
+        position, _ = self._position(key, name)
+        self._keys.insert(position, key)
+        self._names.insert(position, name)
+        self._counts[name] = 1
+
+    def remove(self, name: Optional[str]) -> None:
+        """Count one less use of ``name``, dropping it when unused."""
+        key = search_key(name)
+        if not self.ready or not key or name not in self._counts:
+            return
+        self._forget_rankings(key)
+        self._counts[name] -= 1
+        if self._counts[name] > 0:
+            return
+        del self._counts[name]
+        position, found = self._position(key, name)
+        if found:
+            del self._keys[position]
+            del self._names[position]
+            self._bytes -= self._entry_bytes(key, name)
+
+    def suggest(self, prefix: str, limit: int = 10, order: str = "frequency") -> List[str]:
+        """Names whose normalized key starts with ``prefix``.
+
+        ``frequency`` ranks the most used names first (ties alphabetically);
+        ``alpha`` returns them in alphabetical order.
+        """
+        bounds = prefix_range(prefix)
+        low = bisect_left(self._keys, bounds["$gte"])
+        high = bisect_left(self._keys, bounds["$lt"], low)
+        if order == "alpha":
+            return self._names[low:min(high, low + limit)]
+        memo = self._ranked.get(bounds["$gte"], {}).get(limit)
+        if memo is not None:
+            return list(memo)
+        counts, names = self._counts, self._names
+        # nsmallest over (-count, position) keeps alphabetical order among ties
+        best = heapq.nsmallest(limit, range(low, high), key=lambda i: (-counts[names[i]], i))
+        ranked = [names[i] for i in best]
+        if high - low > _MEMO_MIN_MATCHES:
+            self._ranked.setdefault(bounds["$gte"], {})[limit] = ranked
+        return list(ranked)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "names": len(self._names),
+            "memory_bytes": self.memory_bytes(),
+            "max_bytes": self.max_bytes,
+        }
+
+
+company_index = PrefixIndex("companies")
+contact_index = PrefixIndex("contacts")
+
+
+async def _name_counts(db: AsyncDatabase, field: str) -> List[Tuple[str, int]]:
+    pipeline = [
+        {"$match": {field: {"$nin": [None, ""]}}},
+        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+    ]
+    cursor = await db["entries"].aggregate(pipeline, allowDiskUse=True)
+    return [(doc["_id"], doc["count"]) async for doc in cursor]
+
+
+async def load_autocomplete_indexes(db: AsyncDatabase) -> None:
+    """(Re)build both indexes from the entries collection."""
+    company_index.load(await _name_counts(db, "company"))
+    contact_index.load(await _name_counts(db, "contact_person"))
+    logger.info(
+        "Autocomplete indexes loaded: %s companies (%s bytes), %s contacts (%s bytes)",
+        len(company_index), company_index.memory_bytes(),
+        len(contact_index), contact_index.memory_bytes(),
+    )
+
+
+async def refresh_autocomplete_indexes(db: AsyncDatabase, interval: float = AUTOCOMPLETE_REFRESH_SECONDS) -> None:
+    """Reload the indexes every ``interval`` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await load_autocomplete_indexes(db)
+        except Exception:
+            logger.error("Failed to refresh autocomplete indexes", exc_info=True)
+
+
+def record_autocomplete_change(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+    """Move the index counts from the ``before`` to the ``after`` version of an entry."""
+    for index, field in ((company_index, "company"), (contact_index, "contact_person")):
+        if before is not None:
+            index.remove(before.get(field))
+        if after is not None:
+            index.add(after.get(field))
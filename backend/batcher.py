@@ -0,0 +1,119 @@
+"""Group commit for concurrent entry inserts.
+
+When ``INSERT_BATCHING`` is enabled, ``POST /api/entries`` hands its document
+to an ``InsertBatcher`` instead of calling ``insert_one``. The batcher
+collects the documents of concurrent requests for up to
+``INSERT_BATCH_WINDOW_MS`` milliseconds or ``INSERT_BATCH_MAX_DOCS``
+documents, whichever comes first, and writes them with one unordered
+``insert_many``. Each caller awaits its own result: the inserted ``_id``, or
+the write error of its own document. A failure of the whole batch (network,
+write concern) is raised to every caller in it.
+
+The trade-off is up to one window of added latency per request in exchange
+for one round-trip and one journal commit per batch instead of per entry.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import BulkWriteError, WriteError
+
+INSERT_BATCHING = os.getenv("INSERT_BATCHING", "false").lower() == "true"
+INSERT_BATCH_WINDOW_MS = float(os.getenv("INSERT_BATCH_WINDOW_MS", "5"))
+INSERT_BATCH_MAX_DOCS = int(os.getenv("INSERT_BATCH_MAX_DOCS", "100"))
+
+logger = logging.getLogger(__name__)
+
+
+class InsertBatcher:
+    """Coalesces concurrent ``insert`` calls into ``insert_many`` batches."""
+
+    def __init__(
+        self,
+        get_collection: Callable[[], AsyncCollection],
+        window_ms: float = INSERT_BATCH_WINDOW_MS,
+        max_docs: int = INSERT_BATCH_MAX_DOCS,
+    ) -> None:
+        self._get_collection = get_collection
+        self.window = window_ms / 1000
+        self.max_docs = max(1, max_docs)
+        self._pending: List[Tuple[Dict[str, Any], "asyncio.Future[Any]"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._writes: Set["asyncio.Task[None]"] = set()
+        self.batches = 0
+        self.documents = 0
+        self.largest_batch = 0
+
+    async def insert(self, doc: Dict[str, Any]) -> Any:
+        """Insert ``doc`` with the next batch and return its ``_id``.
+
+        Like ``insert_one``, sets the generated ``_id`` on ``doc``.
+        """
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Any]" = loop.create_future()
+        self._pending.append((doc, future))
+        if len(self._pending) >= self.max_docs:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._write(batch))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _write(self, batch: List[Tuple[Dict[str, Any], "asyncio.Future[Any]"]]) -> None:
+        self.batches += 1
+        self.documents += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+        errors: Dict[int, Dict[str, Any]] = {}
+        try:
+            await self._get_collection().insert_many([doc for doc, _ in batch], ordered=False)
+        except BulkWriteError as exc:
+            errors = {error["index"]: error for error in exc.details.get("writeErrors", [])}
+        except Exception as exc:
+            logger.error("Batched insert of %s entries failed", len(batch), exc_info=True)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for index, (doc, future) in enumerate(batch):
+            # A caller that gave up (cancelled request) has no one to resolve
+            if future.done():
+                continue
+            if index in errors:
+                error = errors[index]
+                future.set_exception(WriteError(error.get("errmsg"), error.get("code"), error))
+            else:
+                future.set_result(doc["_id"])
+
+    async def close(self) -> None:
+        """Write anything still pending and wait for running batches."""
+        self._flush()
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": INSERT_BATCHING,
+            "window_ms": self.window * 1000,
+            "max_docs": self.max_docs,
+            "batches": self.batches,
+            "documents": self.documents,
+            "average_batch": round(self.documents / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+        }
@@ -0,0 +1 @@
+"""Benchmark scripts for the backend. Run them from the backend directory."""
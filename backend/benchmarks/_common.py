@@ -0,0 +1,147 @@
+"""Shared helpers for the benchmark scripts."""
+
+from __future__ import annotations
+
+import json
+import random
+import statistics
+import sys
+import time
+import urllib.request
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+
+# Benchmarks import backend modules the same way app.py does ("from database import ...").
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from models import ALLOWED_CLUBS, ALLOWED_STATUSES  # noqa: E402
+
+DEFAULT_BASE_URL = "http://localhost:5000"
+
+_COMPANY_WORDS = [
+    "Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka",
+    "Cyberdyne", "Soylent", "Tyrell", "Vandelay", "Aperture", "Oscorp", "Pied",
+]
+_COMPANY_SUFFIXES = ["Labs", "Systems", "Studios", "Works", "Robotics", "Media", "Foods"]
+_FIRST_NAMES = ["Asha", "Ravi", "Meera", "Karan", "Divya", "Arjun", "Neha", "Vikram", "Isha", "Rohan"]
+_OPPORTUNITY_TYPES = ["Sponsorship", "Internship", "Workshop", "Hackathon", "Guest talk", ""]
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Return the given percentile (0-100) of the samples using nearest rank."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(label: str, samples_ms: Sequence[float]) -> str:
+    """Format latency samples (milliseconds) as a one-line summary."""
+    if not samples_ms:
+        return f"{label}: no samples"
+    return (
+        f"{label}: n={len(samples_ms)} "
+        f"mean={statistics.fmean(samples_ms):.2f}ms "
+        f"p50={percentile(samples_ms, 50):.2f}ms "
+        f"p95={percentile(samples_ms, 95):.2f}ms "
+        f"p99={percentile(samples_ms, 99):.2f}ms "
+        f"max={max(samples_ms):.2f}ms"
+    )
+
+
+def timed_get(url: str, headers: Dict[str, str] | None = None, timeout: float = 60.0) -> tuple[float, int, bytes]:
+    """GET a URL and return (elapsed_ms, status, body)."""
+    request = urllib.request.Request(url, headers=headers or {})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+            status = response.status
+    except urllib.error.HTTPError as exc:
+        body = exc.read()
+        status = exc.code
+    return (time.perf_counter() - started) * 1000, status, body
+
+
+def timed_post(url: str, payload: Any, timeout: float = 60.0) -> tuple[float, int, bytes]:
+    """POST a JSON payload and return (elapsed_ms, status, body)."""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+            status = response.status
+    except urllib.error.HTTPError as exc:
+        body = exc.read()
+        status = exc.code
+    return (time.perf_counter() - started) * 1000, status, body
+
+
+def synthetic_entries(count: int, seed: int = 42, days: int = 365) -> Iterator[Dict[str, Any]]:
+    """Yield realistic-looking entry documents for load tests."""
+    rng = random.Random(seed)
+    today = date.today()
+    members = [f"{name} {i}" for i in range(40) for name in _FIRST_NAMES[:3]]
+    for i in range(count):
+        company = f"{rng.choice(_COMPANY_WORDS)} {rng.choice(_COMPANY_SUFFIXES)} {rng.randint(1, 5000)}"
+        created = datetime.utcnow() - timedelta(seconds=rng.randint(0, days * 86400))
+        doc: Dict[str, Any] = {
+            "member_name": rng.choice(members),
+            "club": rng.choice(ALLOWED_CLUBS),
+            "company": company,
+            "opportunity_type": rng.choice(_OPPORTUNITY_TYPES) or None,
+            "contact_person": f"{rng.choice(_FIRST_NAMES)} {rng.choice(_COMPANY_WORDS)}",
+            "email": f"contact{i}@example.com" if rng.random() < 0.7 else None,
+            "linkedin": f"https://www.linkedin.com/in/contact-{i}" if rng.random() < 0.5 else None,
+            "phone": f"+91 98{rng.randint(10000000, 99999999)}" if rng.random() < 0.4 else None,
+            "status": rng.choice(ALLOWED_STATUSES),
+            "status_notes": None,
+            "entry_date": (today - timedelta(days=rng.randint(0, days))).isoformat(),
+            "created_at": created.isoformat(),
+            "updated_at": created.isoformat(),
+        }
+        if doc["status"] == "Others":
+            doc["status_notes"] = "Follow up later"
+        if not any([doc["email"], doc["linkedin"], doc["phone"]]):
+            doc["email"] = f"contact{i}@example.com"
+        yield doc
+
+
+def batched(items: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Group an iterator into lists of at most ``size`` items."""
+    batch: List[Dict[str, Any]] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed_collection(
+    collection: Any,
+    count: int,
+    batch_size: int = 10_000,
+    prepare: Callable[[Dict[str, Any]], Dict[str, Any]] | None = None,
+) -> None:
+    """Drop and refill a (sync) collection with ``count`` synthetic entries.
+
+    ``prepare`` is applied to each document before insertion, e.g. to add
+    the normalized key fields the app stores.
+    """
+    collection.drop()
+    entries = synthetic_entries(count)
+    if prepare is not None:
+        entries = map(prepare, entries)
+    for batch in batched(entries, batch_size):
+        collection.insert_many(batch, ordered=False)
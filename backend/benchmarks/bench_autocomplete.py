@@ -0,0 +1,67 @@
+"""Measure the in-memory autocomplete index: footprint and lookup latency.
+
+Loads a ``PrefixIndex`` with synthetic distinct company names (no database
+needed) and reports its estimated size, load time and p50/p99 ``suggest``
+latency for short and longer prefixes in both orders.
+
+Usage::
+
+    python -m benchmarks.bench_autocomplete --names 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from benchmarks._common import summarize
+from autocomplete import PrefixIndex
+
+_SYLLABLES = ["ka", "ro", "mi", "te", "lu", "sa", "vin", "dor", "pex", "qua", "zen", "bri"]
+_SUFFIXES = ["Labs", "Systems", "Studios", "Works", "Robotics", "Media", "Foods", "Pvt Ltd"]
+
+
+def distinct_names(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        stem = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        names.add(f"{stem} {rng.choice(_SUFFIXES)} {rng.randint(1, 999)}")
+    return sorted(names)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    names = distinct_names(args.names)
+    counts = [(name, rng.randint(1, 50)) for name in names]
+
+    index = PrefixIndex("bench", max_bytes=1 << 40)
+    start = time.perf_counter()
+    index.load(counts)
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"{len(index)} names loaded in {load_ms:.0f}ms, ~{index.memory_bytes() / 1024 / 1024:.1f} MiB")
+
+    for length in (2, 4, 6):
+        prefixes = [rng.choice(names)[:length] for _ in range(args.lookups)]
+        for order in ("frequency", "alpha"):
+            samples = []
+            for prefix in prefixes:
+                start = time.perf_counter()
+                index.suggest(prefix, order=order)
+                samples.append((time.perf_counter() - start) * 1000)
+            print(summarize(f"prefix length {length}, {order}", samples))
+
+    start = time.perf_counter()
+    for name in names[: args.lookups]:
+        index.add(name + " II")
+    print(f"add: {(time.perf_counter() - start) / args.lookups * 1e6:.1f}us per new name")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Load-test the insert batcher against one ``insert_one`` per request.
+
+Runs ``--concurrency`` coroutines that each insert entries back to back for
+``--duration`` seconds, once with plain ``insert_one`` and once per batching
+window through ``InsertBatcher``, and reports inserts/sec with p50/p99
+per-insert latency, so the throughput gain can be weighed against the
+added tail latency.
+
+Usage::
+
+    python -m benchmarks.bench_batching --concurrency 50 --windows 2 5 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from pymongo import AsyncMongoClient
+
+from batcher import InsertBatcher
+from benchmarks._common import percentile, synthetic_entries
+from database import MONGO_URI, parse_write_concern
+from normalize import add_search_keys
+
+
+async def load(insert: Callable[[Dict[str, Any]], Awaitable[Any]], concurrency: int, duration: float) -> List[float]:
+    samples: List[float] = []
+    deadline = time.perf_counter() + duration
+
+    async def worker(seed: int) -> None:
+        for doc in synthetic_entries(1_000_000, seed=seed):
+            if time.perf_counter() >= deadline:
+                return
+            doc = add_search_keys(doc)
+            started = time.perf_counter()
+            await insert(doc)
+            samples.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(worker(seed) for seed in range(concurrency)))
+    return samples
+
+
+def report(label: str, samples: List[float], duration: float) -> None:
+    print(
+        f"{label:<22} {len(samples) / duration:>8.0f} inserts/sec  "
+        f"p50={percentile(samples, 50):.2f}ms p99={percentile(samples, 99):.2f}ms"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    client = AsyncMongoClient(MONGO_URI)
+    collection = client[args.db]["batch_bench"].with_options(write_concern=parse_write_concern(args.write_concern))
+    await collection.drop()
+
+    samples = await load(lambda doc: collection.insert_one(doc), args.concurrency, args.duration)
+    report("insert_one", samples, args.duration)
+
+    for window in args.windows:
+        batcher = InsertBatcher(lambda: collection, window_ms=window, max_docs=args.max_docs)
+        samples = await load(batcher.insert, args.concurrency, args.duration)
+        await batcher.close()
+        report(f"batched {window}ms/{args.max_docs}", samples, args.duration)
+        print(f"{'':<22} average batch {batcher.stats()['average_batch']}")
+
+    await collection.drop()
+    await client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--windows", type=float, nargs="+", default=[2, 5, 10])
+    parser.add_argument("--max-docs", type=int, default=100)
+    parser.add_argument("--write-concern", default="1")
+    parser.add_argument("--db", default="tracking_bench")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
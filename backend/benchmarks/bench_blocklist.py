@@ -0,0 +1,71 @@
+"""Micro-benchmark the compiled blocklist matcher against the old keyword loop.
+
+Times a single ``find`` call, screening a batch of company names one by one
+and with ``find_many``, and lists the names whose result differs between the
+old substring loop and the selected match mode.
+
+Usage::
+
+    python -m benchmarks.bench_blocklist --names 10000 --mode prefix
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from typing import List, Optional
+
+from benchmarks._common import synthetic_entries
+from blocklist import MATCH_MODES, KeywordMatcher
+from constants import BLOCKED_COMPANY_KEYWORDS
+
+SAMPLE_NAMES = [
+    "Paytm",
+    "QuickLoan Services",
+    "Purpose Media",
+    "Syntax Systems",
+    "Exposure Labs",
+    "Upington Foods",
+    "ABC Fintech Solutions",
+    "Acme Robotics Private Limited",
+]
+
+
+def legacy_find(value: Optional[str], blocked_terms: List[str]) -> List[str]:
+    """The previous implementation: one substring test per keyword."""
+    if not value:
+        return []
+    lowered = value.lower()
+    return [term for term in blocked_terms if term in lowered]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=10_000)
+    parser.add_argument("--mode", choices=MATCH_MODES, default="prefix")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    matcher = KeywordMatcher(BLOCKED_COMPANY_KEYWORDS, args.mode)
+    names = [doc["company"] for doc in synthetic_entries(args.names)] + SAMPLE_NAMES
+    single = "Acme Robotics Private Limited"
+
+    loops = 100_000
+    legacy_us = min(timeit.repeat(lambda: legacy_find(single, BLOCKED_COMPANY_KEYWORDS), number=loops, repeat=args.repeat)) / loops * 1e6
+    matcher_us = min(timeit.repeat(lambda: matcher.find(single), number=loops, repeat=args.repeat)) / loops * 1e6
+    print(f"single value: legacy {legacy_us:.2f}us, {args.mode} matcher {matcher_us:.2f}us")
+
+    legacy_ms = min(timeit.repeat(lambda: [legacy_find(n, BLOCKED_COMPANY_KEYWORDS) for n in names], number=1, repeat=args.repeat)) * 1000
+    loop_ms = min(timeit.repeat(lambda: [matcher.find(n) for n in names], number=1, repeat=args.repeat)) * 1000
+    batch_ms = min(timeit.repeat(lambda: matcher.find_many(names), number=1, repeat=args.repeat)) * 1000
+    print(f"{len(names)} names: legacy {legacy_ms:.1f}ms, matcher per name {loop_ms:.1f}ms, find_many {batch_ms:.1f}ms")
+
+    print(f"names where legacy and {args.mode} mode differ:")
+    for name, new in zip(names, matcher.find_many(names)):
+        old = legacy_find(name, BLOCKED_COMPANY_KEYWORDS)
+        if old != new:
+            print(f"  {name!r}: legacy {old} -> {new}")
+
+
+if __name__ == "__main__":
+    main()
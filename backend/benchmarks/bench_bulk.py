@@ -0,0 +1,60 @@
+"""Compare entry creation throughput: one POST per row vs ``/api/entries/bulk``.
+
+Posts the same number of synthetic rows through both endpoints and reports
+rows/sec. Run it against a server pointed at a throwaway database
+(``DB_NAME=tracking_bench``), since every row is really inserted.
+
+Usage (server must be running)::
+
+    python -m benchmarks.bench_bulk --base-url http://localhost:5000 --rows 2000 --batch 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+from benchmarks._common import DEFAULT_BASE_URL, batched, synthetic_entries, timed_post
+
+# Server-generated fields that the create endpoints do not accept
+_SERVER_FIELDS = ("created_at", "updated_at")
+
+
+def rows(count: int, seed: int) -> List[Dict[str, Any]]:
+    result = []
+    for doc in synthetic_entries(count, seed=seed):
+        for field in _SERVER_FIELDS:
+            doc.pop(field, None)
+        result.append(doc)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    single_rows = rows(args.rows, seed=1)
+    started = time.perf_counter()
+    created = sum(timed_post(f"{args.base_url}/api/entries", row)[1] == 201 for row in single_rows)
+    single_s = time.perf_counter() - started
+    print(f"single POST: {created}/{args.rows} created in {single_s:.2f}s -> {args.rows / single_s:.0f} rows/sec")
+
+    bulk_rows = rows(args.rows, seed=2)
+    started = time.perf_counter()
+    created = 0
+    for batch in batched(iter(bulk_rows), args.batch):
+        _, status, body = timed_post(f"{args.base_url}/api/entries/bulk", batch)
+        if status == 200:
+            created += json.loads(body)["data"]["created"]
+    bulk_s = time.perf_counter() - started
+    print(f"bulk ({args.batch}/request): {created}/{args.rows} created in {bulk_s:.2f}s -> {args.rows / bulk_s:.0f} rows/sec")
+    print(f"speedup: {single_s / bulk_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
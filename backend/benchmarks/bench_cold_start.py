@@ -0,0 +1,85 @@
+"""Measure the first-request latency of a freshly started backend.
+
+Starts ``uvicorn app:app`` from the ``backend`` directory, waits until
+``/api/health`` answers, then times the first request to each path against
+the median of later ones, and stops the server again; ``--rounds`` repeats
+that. Run it on the commit before the startup warmup and on this one to
+compare what the first user of a new worker pays::
+
+    python -m benchmarks.bench_cold_start --rounds 5 --port 5099
+
+Use a database that already has data (``DB_NAME`` is passed through), and
+note that time-to-health grows with the warmup: the worker only starts
+accepting requests once it is warm.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks._common import BACKEND_DIR, summarize, timed_get
+
+DEFAULT_PATHS = [
+    "/api/entries",
+    "/api/stats",
+    "/api/suggestions/companies?q=ac",
+    "/api/check-duplicate?email=someone@example.com&company=Acme",
+]
+
+
+def wait_for_health(base_url: str, timeout: float) -> float:
+    """Poll ``/api/health`` until it answers; returns the seconds waited."""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            if timed_get(f"{base_url}/api/health", timeout=1.0)[1] == 200:
+                return time.perf_counter() - started
+        except OSError:
+            pass
+        time.sleep(0.02)
+    raise TimeoutError(f"Server did not answer /api/health within {timeout}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--warm-requests", type=int, default=20)
+    parser.add_argument("--path", action="append", help="Path to time (repeatable)")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    paths = args.path or DEFAULT_PATHS
+    startup: List[float] = []
+    first: Dict[str, List[float]] = {path: [] for path in paths}
+    warm: Dict[str, List[float]] = {path: [] for path in paths}
+
+    for _ in range(args.rounds):
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app:app", "--port", str(args.port), "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+        )
+        try:
+            startup.append(wait_for_health(base_url, args.startup_timeout) * 1000)
+            for path in paths:
+                first[path].append(timed_get(base_url + path)[0])
+            for path in paths:
+                warm[path].append(statistics.median(timed_get(base_url + path)[0] for _ in range(args.warm_requests)))
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+
+    print(summarize("start to /api/health", startup))
+    for path in paths:
+        print(summarize(f"{path} first request", first[path]))
+        print(summarize(f"{path} warm median", warm[path]))
+
+
+if __name__ == "__main__":
+    main()
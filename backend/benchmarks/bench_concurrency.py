@@ -0,0 +1,70 @@
+"""Measure cheap-endpoint latency while /api/stats queries run in parallel.
+
+With synchronous pymongo calls inside ``async def`` handlers, a slow stats
+aggregation blocks the event loop and /api/health waits behind it. With the
+async data layer the health check should stay in the low milliseconds.
+
+Usage (server must be running against a populated database)::
+
+    python -m benchmarks.bench_concurrency --base-url http://localhost:5000 \
+        --stats-workers 8 --duration 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from typing import List
+
+from benchmarks._common import DEFAULT_BASE_URL, summarize, timed_get
+
+
+def run(base_url: str, stats_workers: int, duration: float, probe_interval: float) -> None:
+    stop = threading.Event()
+    stats_samples: List[float] = []
+    health_samples: List[float] = []
+    lock = threading.Lock()
+
+    def stats_loop() -> None:
+        while not stop.is_set():
+            elapsed, _, _ = timed_get(f"{base_url}/api/stats")
+            with lock:
+                stats_samples.append(elapsed)
+
+    def health_loop() -> None:
+        while not stop.is_set():
+            elapsed, _, _ = timed_get(f"{base_url}/api/health")
+            with lock:
+                health_samples.append(elapsed)
+            time.sleep(probe_interval)
+
+    # Baseline: health latency with no background load
+    baseline = [timed_get(f"{base_url}/api/health")[0] for _ in range(50)]
+
+    threads = [threading.Thread(target=stats_loop, daemon=True) for _ in range(stats_workers)]
+    threads.append(threading.Thread(target=health_loop, daemon=True))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    print(summarize("/api/health idle", baseline))
+    print(summarize(f"/api/health under {stats_workers} parallel stats loaders", health_samples))
+    print(summarize("/api/stats", stats_samples))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--stats-workers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to keep the load running")
+    parser.add_argument("--probe-interval", type=float, default=0.01, help="Pause between health probes")
+    args = parser.parse_args()
+    run(args.base_url, args.stats_workers, args.duration, args.probe_interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Compare full reloads of /api/entries and /api/stats with conditional GETs.
+
+Each path is fetched once to learn its ETag, then timed repeatedly without
+and with ``If-None-Match``. The conditional requests should come back as
+304s with an empty body and skip the query entirely.
+
+Usage (server must be running against a populated database)::
+
+    python -m benchmarks.bench_conditional --base-url http://localhost:5000 \
+        --club "The Big O" --requests 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import urllib.parse
+import urllib.request
+from collections import Counter
+
+from benchmarks._common import DEFAULT_BASE_URL, summarize, timed_get
+
+
+def fetch_etag(url: str) -> str:
+    with urllib.request.urlopen(url, timeout=60) as response:
+        response.read()
+        return response.headers["ETag"]
+
+
+def run(base_url: str, club: str, requests: int) -> None:
+    query = urllib.parse.urlencode({"club": club}) if club else ""
+    for path in ("/api/entries", "/api/stats"):
+        url = f"{base_url}{path}?{query}"
+        etag = fetch_etag(url)
+
+        full = [timed_get(url) for _ in range(requests)]
+        conditional = [timed_get(url, headers={"If-None-Match": etag}) for _ in range(requests)]
+
+        print(summarize(f"{path} full ({full[0][1]}, {len(full[0][2])} bytes)", [ms for ms, _, _ in full]))
+        statuses = Counter(status for _, status, _ in conditional)
+        print(summarize(f"{path} If-None-Match {dict(statuses)}", [ms for ms, _, _ in conditional]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--club", default="", help="Filter both endpoints to one club")
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    run(args.base_url.rstrip("/"), args.club, args.requests)
+
+
+if __name__ == "__main__":
+    main()
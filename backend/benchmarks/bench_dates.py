@@ -0,0 +1,98 @@
+"""Compare date queries over ISO string dates and over native BSON dates.
+
+Seeds the same synthetic entries twice in a separate database, once with the
+old ISO string dates and once converted to BSON dates the way the
+``0004_native_dates`` migration stores them, with the managed entry indexes.
+Then times on each collection:
+
+* a club listing page filtered to a 90 day ``entry_date`` range,
+* the 30 day daily timeline of ``/api/stats`` (``$group`` on the string vs
+  ``$dateTrunc`` on the date),
+* a weekly timeline over the whole year, which string dates must first parse
+  with ``$dateFromString``.
+
+Usage::
+
+    python -m benchmarks.bench_dates --entries 500000 --repeat 20 --club "The Big O"
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List
+
+from pymongo import MongoClient
+
+from benchmarks._common import seed_collection, summarize
+from database import ENTRY_INDEXES, MONGO_URI
+from dates import DATE_FIELDS, to_bson_date
+from pagination import DEFAULT_PAGE_SIZE, ENTRY_SORT
+
+
+def native_dates(doc: Dict[str, Any]) -> Dict[str, Any]:
+    for field in DATE_FIELDS:
+        doc[field] = to_bson_date(doc[field])
+    return doc
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--club", default="The Big O")
+    parser.add_argument("--db", default="tracking_bench")
+    args = parser.parse_args()
+
+    client = MongoClient(MONGO_URI)
+    today = date.today()
+    range_start, month_start, year_start = (
+        (today - timedelta(days=days)).isoformat() for days in (90, 30, 365)
+    )
+
+    for label, prepare, value in (
+        ("iso strings", None, lambda iso: iso),
+        ("bson dates", native_dates, to_bson_date),
+    ):
+        collection = client[args.db][f"entries_{label.replace(' ', '_')}"]
+        seed_collection(collection, args.entries, prepare=prepare)
+        for keys in ENTRY_INDEXES:
+            collection.create_index(keys)
+
+        is_date = prepare is not None
+        as_date: Any = "$entry_date" if is_date else {"$dateFromString": {"dateString": "$entry_date"}}
+        day = {"$dateTrunc": {"date": "$entry_date", "unit": "day"}} if is_date else "$entry_date"
+        week = {"$dateTrunc": {"date": as_date, "unit": "week"}}
+
+        def listing() -> List[Dict[str, Any]]:
+            query = {"club": args.club, "entry_date": {"$gte": value(range_start), "$lte": value(today.isoformat())}}
+            return list(collection.find(query).sort(ENTRY_SORT).limit(DEFAULT_PAGE_SIZE))
+
+        def timeline(bucket: Any, start: str) -> Callable[[], List[Dict[str, Any]]]:
+            pipeline = [
+                {"$match": {"entry_date": {"$gte": value(start)}}},
+                {"$group": {"_id": bucket, "count": {"$sum": 1}}},
+                {"$sort": {"_id": 1}},
+            ]
+            return lambda: list(collection.aggregate(pipeline, allowDiskUse=True))
+
+        print(f"-- {label} --")
+        print(summarize("club listing, 90 day range", timed(listing, args.repeat)))
+        print(summarize("daily timeline, 30 days", timed(timeline(day, month_start), args.repeat)))
+        print(summarize("weekly timeline, 365 days", timed(timeline(week, year_start), args.repeat)))
+
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Size, speed and observed false-positive rate of the duplicate pre-filter.
+
+Fills a ``BloomFilter`` with the contact and company keys of synthetic
+entries (no database needed) for several target rates and probes it with
+keys that were never added.
+
+Usage::
+
+    python -m benchmarks.bench_duplicate_filter --entries 1000000 --fpr 0.05 0.01 0.001
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks._common import synthetic_entries
+from duplicate_filter import FILTER_FIELDS, BloomFilter, entry_tokens, filter_token
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--fpr", type=float, nargs="+", default=[0.05, 0.01, 0.001])
+    parser.add_argument("--probes", type=int, default=100_000)
+    args = parser.parse_args()
+
+    tokens = [token for doc in synthetic_entries(args.entries) for token in entry_tokens(doc)]
+    probes = [filter_token("email_key", f"absent{i}@example.org") for i in range(args.probes)]
+    print(f"{args.entries} entries -> {len(tokens)} keys")
+
+    print(f"{'target':>8} {'MiB':>8} {'hashes':>7} {'build s':>8} {'probe us':>9} {'observed':>9}")
+    for fpr in args.fpr:
+        bloom = BloomFilter(args.entries * len(FILTER_FIELDS), fpr)
+        started = time.perf_counter()
+        for token in tokens:
+            bloom.add(token)
+        build_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        false_positives = sum(token in bloom for token in probes)
+        probe_us = (time.perf_counter() - started) / len(probes) * 1e6
+        print(
+            f"{fpr:>8} {bloom.memory_bytes() / 1024 / 1024:>8.2f} {bloom.num_hashes:>7} "
+            f"{build_s:>8.2f} {probe_us:>9.2f} {false_positives / len(probes):>9.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Compare the old three-query duplicate check with the single ``$facet`` query.
+
+Seeds a collection with synthetic entries (including the normalized key
+fields), creates the app's indexes and times both implementations for
+contacts that exist, contacts that don't, and formatting variants of
+existing phones and LinkedIn URLs, which only the canonical keys find.
+
+Usage::
+
+    python -m benchmarks.bench_duplicates --entries 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from pymongo import MongoClient
+
+from benchmarks._common import seed_collection, summarize
+from database import COLLECTION_INDEXES, MONGO_URI
+from duplicates import build_duplicate_pipeline, contact_conditions
+from normalize import add_search_keys
+
+
+def legacy_check(collection: Any, email: Optional[str], phone: Optional[str], linkedin: Optional[str], company: Optional[str]) -> Dict[str, Any]:
+    """The previous implementation: exact matches, up to three round-trips."""
+    conditions = []
+    if email:
+        conditions.append({"email": email})
+    if phone:
+        conditions.append({"phone": phone})
+    if linkedin:
+        conditions.append({"linkedin": linkedin})
+    contact = collection.find_one({"$or": conditions}) if conditions else None
+    company_doc, company_count = None, 0
+    if company:
+        company_doc = collection.find_one({"company": company})
+        company_count = collection.count_documents({"company": company})
+    return {"contact": contact, "company": company_doc, "count": company_count}
+
+
+def facet_check(collection: Any, email: Optional[str], phone: Optional[str], linkedin: Optional[str], company: Optional[str]) -> Dict[str, Any]:
+    pipeline = build_duplicate_pipeline(contact_conditions(email, phone, linkedin), company)
+    return list(collection.aggregate(pipeline))[0] if pipeline else {}
+
+
+def variant_phone(phone: str) -> str:
+    digits = phone.replace("+", "").replace(" ", "")
+    return f"+{digits[:2]}-{digits[2:7]}-{digits[7:]}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--db", default="tracking_bench")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the collection from a previous run")
+    args = parser.parse_args()
+
+    client = MongoClient(MONGO_URI)
+    collection = client[args.db]["entries"]
+    if not args.skip_seed:
+        seed_collection(collection, args.entries, prepare=add_search_keys)
+    for keys in COLLECTION_INDEXES["entries"]:
+        collection.create_index(keys)
+
+    rng = random.Random(3)
+    sample = list(collection.aggregate([{"$sample": {"size": args.lookups}}]))
+    cases: Dict[str, List[Dict[str, Optional[str]]]] = {
+        "existing contact": [
+            {"email": d.get("email"), "phone": d.get("phone"), "linkedin": d.get("linkedin"), "company": d["company"]}
+            for d in sample
+        ],
+        "new contact": [
+            {"email": f"nobody{i}@example.org", "phone": None, "linkedin": None, "company": f"Unknown Co {i}"}
+            for i in range(args.lookups)
+        ],
+        "formatting variant": [
+            {"email": None, "phone": variant_phone(d["phone"]), "linkedin": None, "company": None}
+            for d in sample if d.get("phone")
+        ],
+    }
+
+    for label, lookups in cases.items():
+        rng.shuffle(lookups)
+        for name, check in (("legacy", legacy_check), ("facet", facet_check)):
+            samples, found = [], 0
+            for params in lookups:
+                started = time.perf_counter()
+                result = check(collection, **params)
+                samples.append((time.perf_counter() - started) * 1000)
+                found += bool(result.get("contact"))
+            print(summarize(f"{label:<18} {name:<6}", samples), f"contacts found={found}/{len(lookups)}")
+
+
+if __name__ == "__main__":
+    main()
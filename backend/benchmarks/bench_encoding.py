@@ -0,0 +1,81 @@
+"""Compare the old and new encoding of an entry list, and its size on the wire.
+
+The old path converted each document with ``serialize_doc``, ran FastAPI's
+``jsonable_encoder`` over the response and rendered it with the stdlib
+``json`` module. The new path renders documents as returned through
+``ENTRY_PROJECTION`` with ``FastJSONResponse``. Sizes are reported raw, with
+gzip and, if the ``brotli`` package is installed, with brotli, at the levels
+the compression middleware uses. No database is needed.
+
+Usage::
+
+    python -m benchmarks.bench_encoding --entries 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+import zlib
+from typing import Any, Dict, List
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from benchmarks._common import synthetic_entries
+from compression import COMPRESSION_BROTLI_QUALITY, COMPRESSION_GZIP_LEVEL, brotli
+from encoding import FastJSONResponse, orjson
+from export import EXPORT_FIELDS
+from normalize import KEY_FIELDS, add_search_keys
+
+
+def legacy_serialize_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """The previous per-document conversion done in app.py."""
+    doc["id"] = str(doc["_id"])
+    del doc["_id"]
+    for key_field in KEY_FIELDS.values():
+        doc.pop(key_field, None)
+    return doc
+
+
+def legacy_render(stored: List[Dict[str, Any]]) -> bytes:
+    entries = [legacy_serialize_doc(dict(doc)) for doc in stored]
+    content = {"success": True, "data": entries, "count": len(entries), "next_cursor": None}
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def fast_render(projected: List[Dict[str, Any]]) -> bytes:
+    content = {"success": True, "data": projected, "count": len(projected), "next_cursor": None}
+    return FastJSONResponse(content).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    stored = [{"_id": ObjectId(), **add_search_keys(doc)} for doc in synthetic_entries(args.entries)]
+    # What MongoDB returns for the same documents through ENTRY_PROJECTION
+    projected = [{"id": str(doc["_id"]), **{field: doc.get(field) for field in EXPORT_FIELDS}} for doc in stored]
+
+    legacy_ms = min(timeit.repeat(lambda: legacy_render(stored), number=1, repeat=args.repeat)) * 1000
+    fast_ms = min(timeit.repeat(lambda: fast_render(projected), number=1, repeat=args.repeat)) * 1000
+    encoder = "orjson" if orjson is not None else "stdlib json"
+    print(f"encode {args.entries} entries: legacy {legacy_ms:.1f}ms, FastJSONResponse ({encoder}) {fast_ms:.1f}ms")
+
+    body = fast_render(projected)
+    gzip_body = zlib.compress(body, COMPRESSION_GZIP_LEVEL, wbits=31)
+    print(f"bytes on the wire: raw {len(body)}, gzip {len(gzip_body)} ({len(gzip_body) / len(body):.1%})", end="")
+    if brotli is not None:
+        brotli_body = brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+        print(f", brotli {len(brotli_body)} ({len(brotli_body) / len(body):.1%})", end="")
+    print()
+
+    gzip_ms = min(timeit.repeat(lambda: zlib.compress(body, COMPRESSION_GZIP_LEVEL, wbits=31), number=1, repeat=args.repeat)) * 1000
+    print(f"gzip level {COMPRESSION_GZIP_LEVEL} compress time: {gzip_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
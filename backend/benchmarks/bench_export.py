@@ -0,0 +1,97 @@
+"""Show that the streaming export keeps server memory bounded.
+
+Runs the same encoder the ``/api/entries/export`` endpoint uses over a
+seeded collection (1M entries by default) and reports rows/sec, bytes
+produced and peak Python heap. The peak should stay at roughly one cursor
+batch whatever ``--entries`` is. ``--compare`` also measures the old
+approach of materializing the whole list and serializing it as one JSON
+document.
+
+Usage::
+
+    python -m benchmarks.bench_export --entries 1000000 --format csv --gzip
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from pymongo import AsyncMongoClient, MongoClient
+
+from benchmarks._common import seed_collection
+from database import MONGO_URI
+from export import EXPORT_BATCH_SIZE, encode_entries, gzip_chunks
+from pagination import ENTRY_SORT
+
+
+async def stream_export(db_name: str, fmt: str, compress: bool) -> None:
+    client = AsyncMongoClient(MONGO_URI)
+    collection = client[db_name]["entries"]
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    cursor = collection.find({}, batch_size=EXPORT_BATCH_SIZE).sort(ENTRY_SORT)
+    chunks = encode_entries(cursor, fmt)
+    if compress:
+        chunks = gzip_chunks(chunks)
+    total_bytes = 0
+    async for chunk in chunks:
+        total_bytes += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rows = await collection.estimated_document_count()
+    print(
+        f"streaming {fmt}{'+gzip' if compress else ''}: {rows} rows in {elapsed:.1f}s "
+        f"({rows / elapsed:,.0f} rows/s), {total_bytes / 1024 / 1024:.1f}MB out, "
+        f"peak heap {peak / 1024 / 1024:.1f}MB"
+    )
+    await client.close()
+
+
+def materialized_export(db_name: str) -> None:
+    client = MongoClient(MONGO_URI)
+    collection = client[db_name]["entries"]
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    docs = list(collection.find({}).sort(ENTRY_SORT))
+    body = json.dumps({"data": docs}, default=str).encode()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"materialized json: {len(docs)} rows in {elapsed:.1f}s, "
+        f"{len(body) / 1024 / 1024:.1f}MB out, peak heap {peak / 1024 / 1024:.1f}MB"
+    )
+    client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="Also measure the materialize-everything approach")
+    parser.add_argument("--db", default="tracking_bench")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse an already seeded collection")
+    args = parser.parse_args()
+
+    if not args.skip_seed:
+        client = MongoClient(MONGO_URI)
+        seed_collection(client[args.db]["entries"], args.entries)
+        client.close()
+
+    asyncio.run(stream_export(args.db, args.format, args.gzip))
+    if args.compare:
+        materialized_export(args.db)
+
+
+if __name__ == "__main__":
+    main()
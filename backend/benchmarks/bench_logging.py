@@ -0,0 +1,89 @@
+"""Compare the event-loop cost of request logging, synchronous vs queued.
+
+Simulates requests on an asyncio loop that each make the log calls of
+``GET /api/entries`` (two INFO lines), first with the old setup (a
+``FileHandler`` and a ``StreamHandler`` on the root logger, f-string
+messages) and then with ``logging_config`` (queue, JSON, sampling,
+rotation). Reports simulated requests/sec and the p99 time spent logging
+per request. Console output goes to ``/dev/null`` and the log file to a
+temporary directory. No server or database needed::
+
+    python -m benchmarks.bench_logging --requests 100000
+
+For end-to-end throughput, run ``bench_throughput`` against the server on
+the commit before this change and on this one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+from benchmarks._common import summarize
+
+
+def old_setup(log_file: str) -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.FileHandler(log_file), logging.StreamHandler()],
+        force=True,
+    )
+
+
+def new_setup(log_file: str) -> None:
+    import logging_config
+
+    logging_config.LOG_FILE = log_file
+    logging_config.configure_logging()
+
+
+def get_entries_fstring(logger: logging.Logger, club: str, count: int) -> None:
+    logger.info(f"Fetching entries with filters - name: {None}, club: {club}, dates: {None} to {None}")
+    logger.info(f"Retrieved {count} entries")
+
+
+def get_entries(logger: logging.Logger, club: str, count: int) -> None:
+    logger.info("Fetching entries with filters - name: %s, club: %s, dates: %s to %s", None, club, None, None)
+    logger.info("Retrieved %s entries", count)
+
+
+async def simulate(log_request: Callable[[logging.Logger, str, int], None], requests: int) -> List[float]:
+    logger = logging.getLogger("app")
+    samples = []
+    for i in range(requests):
+        started = time.perf_counter()
+        log_request(logger, "The Big O", i % 50)
+        samples.append((time.perf_counter() - started) * 1000)
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100_000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    sys.stderr = open(os.devnull, "w")
+    for label, setup, log_request in (
+        ("sync file+stream, f-strings", old_setup, get_entries_fstring),
+        ("queued json, sampled", new_setup, get_entries),
+    ):
+        setup(os.path.join(directory, f"{label.split()[0]}.log"))
+        started = time.perf_counter()
+        samples = asyncio.run(simulate(log_request, args.requests))
+        elapsed = time.perf_counter() - started
+        print(f"{label}: {args.requests / elapsed:,.0f} simulated requests/sec")
+        print(summarize(f"{label} logging time per request", samples))
+
+
+if __name__ == "__main__":
+    main()
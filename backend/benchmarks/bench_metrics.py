@@ -0,0 +1,72 @@
+"""Measure the per-request cost of the /metrics instrumentation.
+
+Calls a minimal ASGI app directly, with and without ``MetricsMiddleware``,
+and reports the difference per request. Then times the MongoDB command
+listener on a started/succeeded event pair. No server or database needed::
+
+    python -m benchmarks.bench_metrics --requests 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+from typing import Any, Dict
+
+from pymongo import monitoring
+
+from metrics import MetricsMiddleware
+from mongo_telemetry import MongoTelemetry
+
+
+class _Route:
+    path = "/api/entries"
+
+
+async def _endpoint(scope: Dict[str, Any], receive: Any, send: Any) -> None:
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _send(message: Dict[str, Any]) -> None:
+    pass
+
+
+async def per_request_us(app: Any, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app({"type": "http", "method": "GET", "path": "/api/entries"}, None, _send)
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+def listener_us(events: int) -> float:
+    _, listener = MongoTelemetry().listeners("bench")
+    address = ("localhost", 27017)
+    command = {"find": "entries", "filter": {}, "limit": 51}
+    reply = {"ok": 1, "cursor": {"id": 0, "firstBatch": []}}
+    started = time.perf_counter()
+    for request_id in range(events):
+        listener.started(monitoring.CommandStartedEvent(command, "tracking_db", request_id, address, request_id))
+        listener.succeeded(monitoring.CommandSucceededEvent(
+            timedelta(microseconds=800), reply, "find", request_id, address, request_id
+        ))
+    return (time.perf_counter() - started) / events * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200_000)
+    args = parser.parse_args()
+
+    bare = asyncio.run(per_request_us(_endpoint, args.requests))
+    instrumented = asyncio.run(per_request_us(MetricsMiddleware(_endpoint), args.requests))
+    print(f"request: bare {bare:.2f}us, instrumented {instrumented:.2f}us, overhead {instrumented - bare:.2f}us")
+    # Includes building the two event objects, which the driver does anyway
+    print(f"mongo command listener: {listener_us(args.requests):.2f}us per command")
+
+
+if __name__ == "__main__":
+    main()
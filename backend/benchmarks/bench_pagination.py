@@ -0,0 +1,75 @@
+"""Show that keyset pages cost the same at any collection size and depth.
+
+For each collection size the script seeds synthetic entries, then times the
+first page, a page deep into the listing and, for comparison, the old
+unbounded ``find(query).sort("created_at", -1)`` read, recording peak Python
+memory of each with ``tracemalloc``.
+
+Usage::
+
+    python -m benchmarks.bench_pagination --sizes 10000 100000 1000000 --club "The Big O"
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from pymongo import MongoClient
+
+from benchmarks._common import seed_collection
+from database import COLLECTION_INDEXES, MONGO_URI
+from pagination import DEFAULT_PAGE_SIZE, ENTRY_SORT, encode_cursor, keyset_filter
+
+
+def measure(fn: Callable[[], Any]) -> Tuple[float, float]:
+    """Return (elapsed_ms, peak_python_memory_mb) of one call."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    fn()
+    elapsed = (time.perf_counter() - started) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--club", default="The Big O")
+    parser.add_argument("--depth", type=int, default=50, help="Pages to walk before timing the deep page")
+    parser.add_argument("--db", default="tracking_bench")
+    args = parser.parse_args()
+
+    client = MongoClient(MONGO_URI)
+    collection = client[args.db]["entries"]
+    query: Dict[str, Any] = {"club": args.club}
+
+    print(f"{'entries':>10} {'first page':>14} {'page ' + str(args.depth):>14} {'unbounded':>14} {'unbounded mem':>14}")
+    for size in args.sizes:
+        seed_collection(collection, size)
+        for keys in COLLECTION_INDEXES["entries"]:
+            collection.create_index(keys)
+
+        def page(after: str | None) -> List[Dict[str, Any]]:
+            return list(collection.find(keyset_filter(query, after)).sort(ENTRY_SORT).limit(DEFAULT_PAGE_SIZE))
+
+        cursor = None
+        for _ in range(args.depth):
+            rows = page(cursor)
+            if not rows:
+                break
+            cursor = encode_cursor(rows[-1])
+
+        first_ms, _ = measure(lambda: page(None))
+        deep_ms, _ = measure(lambda: page(cursor))
+        full_ms, full_mb = measure(lambda: list(collection.find(query).sort("created_at", -1)))
+        print(f"{size:>10} {first_ms:>12.2f}ms {deep_ms:>12.2f}ms {full_ms:>12.2f}ms {full_mb:>12.1f}MB")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Profile decoding and encoding a large listing as dicts and as raw BSON.
+
+Documents are encoded to BSON as MongoDB would return them through the
+listing projection, for every field and for the frontend's sparse fieldset.
+Each variant is then decoded the way the driver would, as ``dict``s or as
+``RawBSONDocument``s, and encoded to the response body. CPU time and peak
+Python memory (``tracemalloc``) are reported for each. No database is needed.
+
+Usage::
+
+    python -m benchmarks.bench_raw_bson --entries 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bson import ObjectId, decode_all, encode
+from bson.codec_options import CodecOptions
+
+from benchmarks._common import synthetic_entries
+from encoding import ENTRY_FIELDS, RAW_CODEC_OPTIONS, dumps, parse_fields
+
+# The columns frontend/script.js renders in the entries table
+FRONTEND_FIELDS = "entry_date,member_name,club,company,opportunity_type,contact_person,email,linkedin,phone,status,status_notes"
+
+DICT_CODEC_OPTIONS: CodecOptions = CodecOptions(document_class=dict)
+
+
+def projected_batch(docs: List[Dict[str, Any]], fieldset: Optional[Tuple[str, ...]]) -> bytes:
+    """BSON bytes of ``docs`` as returned through ``entry_projection(fieldset)``."""
+    names = fieldset or ENTRY_FIELDS
+    return b"".join(encode({name: doc["id"] if name == "id" else doc.get(name) for name in names}) for doc in docs)
+
+
+def profile(fn: Callable[[], Any]) -> Tuple[float, float]:
+    """Return (cpu_ms, peak_python_memory_mb) of one call."""
+    tracemalloc.start()
+    started = time.process_time()
+    fn()
+    elapsed = (time.process_time() - started) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def render(data: bytes, codec_options: CodecOptions) -> bytes:
+    entries = decode_all(data, codec_options)
+    return dumps({"success": True, "data": entries, "count": len(entries), "next_cursor": None})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    args = parser.parse_args()
+
+    docs = [{"id": str(ObjectId()), **doc} for doc in synthetic_entries(args.entries)]
+
+    print(f"{'fieldset':>10} {'decoding':>10} {'cpu':>12} {'peak mem':>12} {'body':>12}")
+    for label, fields in (("all", None), ("frontend", FRONTEND_FIELDS), ("id+status", "status")):
+        data = projected_batch(docs, parse_fields(fields))
+        for decoding, codec_options in (("dict", DICT_CODEC_OPTIONS), ("raw", RAW_CODEC_OPTIONS)):
+            cpu_ms, peak_mb = profile(lambda: render(data, codec_options))
+            body = render(data, codec_options)
+            print(f"{label:>10} {decoding:>10} {cpu_ms:>10.1f}ms {peak_mb:>10.1f}MB {len(body) / 1024 / 1024:>10.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
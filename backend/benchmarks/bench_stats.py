@@ -0,0 +1,165 @@
+"""Compare the legacy multi-query stats path with the ``$facet`` pipelines.
+
+Seeds a synthetic collection (1M entries by default) in a separate database,
+then times the legacy queries, the ``$facet`` pipeline over ``entries`` and
+the same facets over the materialized rollups, and checks that all three
+return the same payload.
+
+Usage::
+
+    python -m benchmarks.bench_stats --entries 1000000 --repeat 5 --club "The Big O"
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict, List, Optional
+
+from pymongo import MongoClient
+
+from benchmarks._common import seed_collection, summarize
+from database import MONGO_URI
+from rollups import ROLLUPS_COLLECTION, rebuild_rollups
+from stats import (
+    ACTIVE_STATUSES,
+    MEMBER_STATUS_FIELDS,
+    build_rollup_stats_pipeline,
+    build_stats_pipeline,
+    format_stats,
+    recent_cutoffs,
+)
+
+
+def _size_of(statuses: List[str]) -> Dict[str, Any]:
+    return {"$size": {"$filter": {"input": "$statuses", "as": "s", "cond": {"$in": ["$$s", statuses]}}}}
+
+
+def legacy_stats(collection: Any, club: Optional[str], member_name: Optional[str]) -> Dict[str, Any]:
+    """The pre-facet implementation: one round-trip per dashboard figure."""
+    base: Dict[str, Any] = {}
+    if club:
+        base["club"] = club
+    if member_name:
+        base["member_name"] = member_name
+    cutoffs = recent_cutoffs()
+    month_filter = {**base, "entry_date": {"$gte": cutoffs["month"]}}
+
+    def agg(pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return list(collection.aggregate(pipeline, allowDiskUse=True))
+
+    def grouped(field: str, limit: Optional[int] = None, match: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        pipeline = [{"$match": match or base}, {"$group": {"_id": f"${field}", "count": {"$sum": 1}}}, {"$sort": {"count": -1}}]
+        return agg(pipeline + ([{"$limit": limit}] if limit else []))
+
+    total = collection.count_documents(base)
+    week = collection.count_documents({**base, "entry_date": {"$gte": cutoffs["week"]}})
+    month = collection.count_documents(month_filter)
+    status_stats = grouped("status")
+    club_stats = grouped("club")
+    members = agg([
+        {"$match": base},
+        {"$group": {"_id": {"member_name": "$member_name", "club": "$club"}, "count": {"$sum": 1}, "statuses": {"$push": "$status"}}},
+        {"$project": {"member_name": "$_id.member_name", "club": "$_id.club", "count": 1,
+                      **{field: _size_of([status]) for field, status in MEMBER_STATUS_FIELDS.items()}}},
+        {"$sort": {"count": -1}},
+        {"$limit": 20},
+    ])
+    companies = grouped("company", 15)
+    daily = agg([{"$match": month_filter}, {"$group": {"_id": "$entry_date", "count": {"$sum": 1}}}, {"$sort": {"_id": 1}}])
+    contacts = agg([
+        {"$match": base},
+        {"$group": {"_id": None, **{f"{field}_count": {"$sum": {"$cond": [{"$ne": [f"${field}", None]}, 1, 0]}}
+                                    for field in ("email", "linkedin", "phone")}}},
+    ])
+    types = grouped("opportunity_type", 10, {**base, "opportunity_type": {"$nin": [None, ""]}})
+    performance = agg([
+        {"$match": base},
+        {"$group": {"_id": "$club", "total_entries": {"$sum": 1}, "unique_members": {"$addToSet": "$member_name"},
+                    "unique_companies": {"$addToSet": "$company"}, "statuses": {"$push": "$status"}}},
+        {"$project": {"club": "$_id", "total_entries": 1,
+                      "unique_members_count": {"$size": "$unique_members"},
+                      "unique_companies_count": {"$size": "$unique_companies"},
+                      "active_count": _size_of(ACTIVE_STATUSES),
+                      "success_rate": {"$multiply": [{"$divide": [_size_of(ACTIVE_STATUSES), {"$size": "$statuses"}]}, 100]}}},
+        {"$sort": {"total_entries": -1}},
+    ])
+    return format_stats({
+        "total": [{"count": total}] if total else [],
+        "recent_7days": [{"count": week}] if week else [],
+        "recent_30days": [{"count": month}] if month else [],
+        "status_distribution": status_stats,
+        "club_distribution": club_stats,
+        "member_contributions": members,
+        "top_companies": companies,
+        "daily_timeline": daily,
+        "contact_methods": contacts,
+        "opportunity_types": types,
+        "club_performance": performance,
+    })
+
+
+def facet_stats(collection: Any, club: Optional[str], member_name: Optional[str]) -> Dict[str, Any]:
+    results = list(collection.aggregate(build_stats_pipeline(club, member_name), allowDiskUse=True))
+    return format_stats(results[0] if results else {})
+
+
+def rollup_stats(collection: Any, club: Optional[str], member_name: Optional[str]) -> Dict[str, Any]:
+    rollups = collection.database[ROLLUPS_COLLECTION]
+    results = list(rollups.aggregate(build_rollup_stats_pipeline(club, member_name), allowDiskUse=True))
+    return format_stats(results[0] if results else {})
+
+
+def _comparable(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop ordering ties so both payloads can be compared."""
+    comparable = dict(stats)
+    for key in ("status_distribution", "club_distribution", "club_performance"):
+        comparable[key] = sorted(stats[key], key=lambda row: str(row["_id"]))
+    for key in ("member_contributions", "top_companies", "opportunity_types"):
+        comparable[key] = sorted(row["count"] for row in stats[key])
+    comparable["summary"] = {k: v for k, v in stats["summary"].items() if k != "average_per_member"}
+    return comparable
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--club", default=None)
+    parser.add_argument("--member-name", default=None)
+    parser.add_argument("--db", default="tracking_bench")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse an already seeded collection")
+    args = parser.parse_args()
+
+    client = MongoClient(MONGO_URI)
+    collection = client[args.db]["entries"]
+    if not args.skip_seed:
+        started = time.perf_counter()
+        seed_collection(collection, args.entries)
+        print(f"Seeded {args.entries} entries in {time.perf_counter() - started:.1f}s")
+        started = time.perf_counter()
+        keys = rebuild_rollups(collection.database)
+        print(f"Built {keys} rollup documents in {time.perf_counter() - started:.1f}s")
+
+    implementations = {
+        "legacy (11 round-trips)": legacy_stats,
+        "$facet over entries": facet_stats,
+        "$facet over rollups": rollup_stats,
+    }
+    timings: Dict[str, List[float]] = {label: [] for label in implementations}
+    outputs: Dict[str, Dict[str, Any]] = {}
+    for _ in range(args.repeat):
+        for label, impl in implementations.items():
+            started = time.perf_counter()
+            outputs[label] = impl(collection, args.club, args.member_name)
+            timings[label].append((time.perf_counter() - started) * 1000)
+
+    for label, samples in timings.items():
+        print(summarize(label, samples))
+    reference, *others = (_comparable(o) for o in outputs.values())
+    print("Payloads match" if all(other == reference for other in others) else "WARNING: payloads differ")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Measure request throughput of a running backend, for comparing launchers.
+
+Each client thread keeps one keep-alive connection open and sends requests
+back to back for ``--duration`` seconds. Run it once against the old
+launcher and once against ``start_backend.py``, with the same database::
+
+    uvicorn app:app --port 5000 --reload                 # old: one process, file watcher
+    python start_backend.py --port 5000 --workers 4      # new
+
+    python -m benchmarks.bench_throughput --base-url http://localhost:5000 \
+        --clients 64 --duration 20 --path /api/health --path "/api/entries?limit=20"
+
+The client threads share one Python process; run several copies of the
+script (or use more ``--clients``) if it saturates a core before the server.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import threading
+import time
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+from benchmarks._common import DEFAULT_BASE_URL, summarize
+
+
+def run(base_url: str, path: str, clients: int, duration: float) -> None:
+    url = urlsplit(base_url)
+    stop = threading.Event()
+    samples: List[float] = []
+    errors: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def client_loop() -> None:
+        connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+        local: List[float] = []
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+                status = str(response.status)
+            except (OSError, http.client.HTTPException) as exc:
+                connection.close()
+                status = type(exc).__name__
+            if status == "200":
+                local.append((time.perf_counter() - started) * 1000)
+            else:
+                with lock:
+                    errors[status] = errors.get(status, 0) + 1
+        connection.close()
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=client_loop, daemon=True) for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=60)
+    elapsed = time.perf_counter() - started
+
+    print(f"{path}: {len(samples) / elapsed:.0f} req/s with {clients} clients")
+    print(summarize(f"{path} latency", samples))
+    if errors:
+        print(f"{path} errors: {errors}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--path", action="append", help="Path to load (repeatable, default /api/health)")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to load each path")
+    args = parser.parse_args()
+    for path in args.path or ["/api/health"]:
+        run(args.base_url, path, args.clients, args.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measure the bytes MongoDB sends for list and stats reads, per wire compressor.
+
+Runs the reads behind ``GET /api/entries`` (pages of the listing
+projection, plus an unpaged read of the same shape as an export) and
+``GET /api/stats`` (the rollup pipeline) against the configured database,
+once per compressor, and reports the server's ``physicalBytesOut`` delta
+from ``serverStatus`` along with the latency. Other clients of the same
+server add to the counter, so run it against an otherwise idle server::
+
+    python -m benchmarks.bench_wire_compression --compressor zstd --compressor snappy --compressor zlib
+
+Compressors whose module is missing (``zstandard``, ``python-snappy``) are
+skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from pymongo import MongoClient
+
+from benchmarks._common import summarize
+from database import DB_NAME, MONGO_URI, available_compressors
+from encoding import ENTRY_PROJECTION, RAW_CODEC_OPTIONS
+from pagination import DEFAULT_PAGE_SIZE, ENTRY_SORT
+from rollups import ROLLUPS_COLLECTION
+from stats import build_rollup_stats_pipeline
+
+
+def bytes_out(admin_client: MongoClient) -> int:
+    network = admin_client.admin.command("serverStatus")["network"]
+    return network.get("physicalBytesOut", network["bytesOut"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--compressor", action="append", help="zstd, snappy or zlib (repeatable, default all)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=10, help="Listing pages read per repeat")
+    parser.add_argument("--export-limit", type=int, default=50_000)
+    args = parser.parse_args()
+
+    compressors: List[Optional[str]] = [None, *available_compressors(",".join(args.compressor or ["zstd", "snappy", "zlib"]))]
+    # Reads the server counters without compression, outside the measured client
+    admin_client = MongoClient(MONGO_URI)
+
+    print(f"{'compressor':>10} {'read':>10} {'wire bytes':>14} {'vs none':>8}")
+    baseline: Dict[str, int] = {}
+    for compressor in compressors:
+        client = MongoClient(MONGO_URI, **({"compressors": compressor} if compressor else {}))
+        entries = client.get_database(DB_NAME, codec_options=RAW_CODEC_OPTIONS)["entries"]
+        rollups = client[DB_NAME][ROLLUPS_COLLECTION]
+        client.admin.command("ping")
+
+        def listing() -> None:
+            list(entries.find({}, ENTRY_PROJECTION).sort(ENTRY_SORT).limit(DEFAULT_PAGE_SIZE * args.pages))
+
+        def export() -> None:
+            list(entries.find({}, ENTRY_PROJECTION).sort(ENTRY_SORT).limit(args.export_limit))
+
+        def stats() -> None:
+            list(rollups.aggregate(build_rollup_stats_pipeline(), allowDiskUse=True))
+
+        reads: Dict[str, Callable[[], Any]] = {"list": listing, "export": export, "stats": stats}
+        for name, read in reads.items():
+            samples = []
+            before = bytes_out(admin_client)
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                read()
+                samples.append((time.perf_counter() - started) * 1000)
+            sent = (bytes_out(admin_client) - before) // args.repeat
+            baseline.setdefault(name, sent)
+            label = compressor or "none"
+            print(f"{label:>10} {name:>10} {sent:>14,} {sent / baseline[name]:>8.0%}")
+            print("  " + summarize(f"{label} {name}", samples))
+        client.close()
+    admin_client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Measure the latency saved by dropping the read-after-write round-trips.
+
+Runs the same create -> update -> status change sequence with the old
+pattern (write, then ``find_one`` the result) and the new one (build the
+stored document locally) under each write concern, and reports per-mutation
+latency and mutations/sec.
+
+Usage::
+
+    python -m benchmarks.bench_writes --mutations 2000 --write-concerns 1 majority
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+from pymongo import MongoClient, ReturnDocument
+
+from benchmarks._common import summarize, synthetic_entries
+from database import MONGO_URI, parse_write_concern
+from normalize import add_search_keys
+
+
+def legacy_cycle(collection: Any, doc: Dict[str, Any], samples: List[float]) -> None:
+    started = time.perf_counter()
+    result = collection.insert_one(doc)
+    collection.find_one({"_id": result.inserted_id})
+    samples.append((time.perf_counter() - started) * 1000)
+
+    for update in ({"company": doc["company"] + " Updated"}, {"status": "In progress"}):
+        started = time.perf_counter()
+        update["updated_at"] = datetime.utcnow().isoformat()
+        collection.update_one({"_id": result.inserted_id}, {"$set": update})
+        collection.find_one({"_id": result.inserted_id})
+        samples.append((time.perf_counter() - started) * 1000)
+
+
+def local_cycle(collection: Any, doc: Dict[str, Any], samples: List[float]) -> None:
+    started = time.perf_counter()
+    collection.insert_one(doc)
+    samples.append((time.perf_counter() - started) * 1000)
+
+    for update in ({"company": doc["company"] + " Updated"}, {"status": "In progress"}):
+        started = time.perf_counter()
+        update["updated_at"] = datetime.utcnow().isoformat()
+        collection.find_one_and_update({"_id": doc["_id"]}, {"$set": update}, return_document=ReturnDocument.BEFORE)
+        samples.append((time.perf_counter() - started) * 1000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mutations", type=int, default=2000, help="Approximate mutations per run (3 per cycle)")
+    parser.add_argument("--write-concerns", nargs="+", default=["1", "majority"])
+    parser.add_argument("--db", default="tracking_bench")
+    args = parser.parse_args()
+
+    client = MongoClient(MONGO_URI)
+    cycles = max(1, args.mutations // 3)
+    for concern in args.write_concerns:
+        collection = client[args.db]["write_bench"].with_options(write_concern=parse_write_concern(concern))
+        collection.drop()
+        for name, cycle in (("read-after-write", legacy_cycle), ("local document", local_cycle)):
+            samples: List[float] = []
+            started = time.perf_counter()
+            for doc in synthetic_entries(cycles, seed=len(name)):
+                cycle(collection, add_search_keys(doc), samples)
+            elapsed = time.perf_counter() - started
+            print(summarize(f"w={concern:<9} {name:<16}", samples), f"{len(samples) / elapsed:.0f} mutations/sec")
+        collection.drop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Compiled keyword matchers for the financial blocklist.
+
+Each keyword list from ``constants.py`` is compiled once, at import, into a
+single regular expression built from a trie of its terms, so a value is
+scanned in one pass instead of once per keyword. Matching is case-insensitive
+and reports every keyword that occurs, including overlapping ones ("bank" and
+"banking"), in the order the keywords are declared.
+
+``BLOCKLIST_MATCH_MODE`` selects where a keyword may match:
+
+* ``substring`` (default) - anywhere, like a plain ``term in value`` check.
+* ``prefix`` - only at the start of a word, so "pay" matches
+  "Paytm" and "tax" matches "TaxBuddy", but "pos" no longer matches
+  "Purpose Media". A lowercase-to-uppercase transition also starts a word,
+  so "QuickLoan" still matches "loan".
+* ``word`` - only as a whole word.
+
+``prefix`` and ``word`` block fewer names than ``substring`` and are opt-in.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from constants import BLOCKED_COMPANY_KEYWORDS, BLOCKED_OPPORTUNITY_KEYWORDS
+
+MATCH_MODES = ("substring", "prefix", "word")
+BLOCKLIST_MATCH_MODE = os.getenv("BLOCKLIST_MATCH_MODE", "substring")
+
+# Word boundaries, counting camelCase humps ("QuickLoan") as boundaries too
+_CAMEL_BOUNDARY = r"(?-i:(?<=[a-z])(?=[A-Z]))"
+_WORD_START = rf"(?:(?<!\w)|{_CAMEL_BOUNDARY})"
+_WORD_END = rf"(?:(?!\w)|{_CAMEL_BOUNDARY})"
+
+# Separator used to screen many values in one scan; never part of a keyword
+_BATCH_SEPARATOR = "\n"
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Build a regex matching the longest of ``terms`` at a position."""
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        # A keyword ending here makes the rest optional; "?" is greedy, so longer keywords win
+        return "(?:" + "|".join(branches) + ")" + ("?" if "" in node else "")
+
+    return render(trie)
+
+
+def _is_word_end(text: str, index: int) -> bool:
+    if index >= len(text):
+        return True
+    char = text[index]
+    if not (char.isalnum() or char == "_"):
+        return True
+    previous = text[index - 1]
+    return previous.islower() and previous.isascii() and char.isupper() and char.isascii()
+
+
+class KeywordMatcher:
+    """Finds which of a fixed list of keywords occur in a value."""
+
+    def __init__(self, terms: Sequence[str], mode: str = BLOCKLIST_MATCH_MODE) -> None:
+        if mode not in MATCH_MODES:
+            raise ValueError(f"Match mode must be one of: {', '.join(MATCH_MODES)}")
+        self.mode = mode
+        self.terms = list(dict.fromkeys(term.lower() for term in terms))
+        self._order = {term: index for index, term in enumerate(self.terms)}
+        # Shorter keywords that are prefixes of a longer one; a match of the
+        # longer keyword at a position implies a possible match of these
+        self._prefixes = {
+            term: [other for other in self.terms if other != term and term.startswith(other)]
+            for term in self.terms
+        }
+
+        # Cheap first-character test before the boundary and trie checks
+        first_chars = re.escape("".join(sorted({term[0] for term in self.terms})))
+        start = "" if mode == "substring" else _WORD_START
+        end = _WORD_END if mode == "word" else ""
+        # Zero-width lookahead so overlapping keywords are all visited
+        self._pattern = re.compile(
+            f"(?=[{first_chars}]){start}(?=({_trie_pattern(self.terms)}){end})",
+            re.IGNORECASE,
+        )
+
+    def _matches_at(self, text: str, position: int, longest: str) -> List[str]:
+        longest = longest.lower()
+        if longest not in self._order:
+            return []
+        found = [longest]
+        for shorter in self._prefixes[longest]:
+            if self.mode != "word" or _is_word_end(text, position + len(shorter)):
+                found.append(shorter)
+        return found
+
+    def _ordered(self, found: Iterable[str]) -> List[str]:
+        return sorted(set(found), key=self._order.__getitem__)
+
+    def find(self, value: Optional[str]) -> List[str]:
+        """Return the keywords found in ``value``, in declaration order."""
+        if not value:
+            return []
+        found: List[str] = []
+        for match in self._pattern.finditer(value):
+            found.extend(self._matches_at(value, match.start(), match.group(1)))
+        return self._ordered(found)
+
+    def find_many(self, values: Sequence[Optional[str]]) -> List[List[str]]:
+        """Screen many values in a single scan; one keyword list per value."""
+        texts = [(value or "").replace(_BATCH_SEPARATOR, " ") for value in values]
+        offsets = []
+        position = 0
+        for text in texts:
+            offsets.append(position)
+            position += len(text) + len(_BATCH_SEPARATOR)
+
+        joined = _BATCH_SEPARATOR.join(texts)
+        found: List[List[str]] = [[] for _ in texts]
+        for match in self._pattern.finditer(joined):
+            index = bisect_right(offsets, match.start()) - 1
+            found[index].extend(self._matches_at(joined, match.start(), match.group(1)))
+        return [self._ordered(keywords) for keywords in found]
+
+
+COMPANY_BLOCKLIST = KeywordMatcher(BLOCKED_COMPANY_KEYWORDS)
+OPPORTUNITY_BLOCKLIST = KeywordMatcher(BLOCKED_OPPORTUNITY_KEYWORDS)
@@ -0,0 +1,151 @@
+"""Validation, screening and insertion of many new entries at once.
+
+Used by ``POST /api/entries/bulk`` and the file imports (``importer.py``). Rows are validated together with one
+``TypeAdapter`` call, screened against the blocklists in one scan per list,
+and the valid rows are written with a single unordered ``insert_many``, so a
+bad row never blocks the others. Every step reports failures by row index.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Sequence, Tuple
+
+from pydantic import ValidationError
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+
+from blocklist import COMPANY_BLOCKLIST, OPPORTUNITY_BLOCKLIST
+from dates import to_bson_date, utc_now
+from models import ENTRY_CREATE_LIST, EntryCreate
+from normalize import add_search_keys
+
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "1000"))
+
+RowError = Dict[str, Any]
+
+
+def _validation_errors(exc: ValidationError) -> Dict[int, RowError]:
+    """Group the errors of a list validation by row index."""
+    errors: Dict[int, RowError] = {}
+    for error in exc.errors(include_url=False, include_context=False, include_input=False):
+        index, *field = error["loc"]
+        row_error = errors.setdefault(int(index), {"error": "Validation error", "fields": []})
+        row_error["fields"].append({
+            "field": ".".join(str(part) for part in field) or None,
+            "message": error["msg"],
+        })
+    return errors
+
+
+def validate_rows(rows: Sequence[Any]) -> Tuple[List[Tuple[int, EntryCreate]], Dict[int, RowError]]:
+    """Validate raw rows; returns ``(index, entry)`` for valid rows and errors by index."""
+    try:
+        return list(enumerate(ENTRY_CREATE_LIST.validate_python(rows))), {}
+    except ValidationError as exc:
+        errors = _validation_errors(exc)
+    # Only the valid rows are validated again, to get their model instances
+    valid = [
+        (index, EntryCreate.model_validate(row))
+        for index, row in enumerate(rows)
+        if index not in errors
+    ]
+    return valid, errors
+
+
+def screen_rows(entries: Sequence[Tuple[int, EntryCreate]]) -> Dict[int, RowError]:
+    """Blocklist errors by row index, from one scan of all companies and one of all types."""
+    companies = COMPANY_BLOCKLIST.find_many([entry.company for _, entry in entries])
+    types = OPPORTUNITY_BLOCKLIST.find_many([entry.opportunity_type for _, entry in entries])
+    errors: Dict[int, RowError] = {}
+    for (index, _), blocked_company, blocked_type in zip(entries, companies, types):
+        if blocked_company:
+            errors[index] = {"error": "Financial company detected", "keywords": blocked_company}
+        elif blocked_type:
+            errors[index] = {"error": "Financial opportunity detected", "keywords": blocked_type}
+    return errors
+
+
+def build_documents(entries: Sequence[Tuple[int, EntryCreate]]) -> List[Tuple[int, Dict[str, Any]]]:
+    """Turn validated entries into the documents stored in MongoDB."""
+    now = utc_now()
+    documents = []
+    for index, entry in entries:
+        doc = add_search_keys(entry.model_dump())
+        doc["entry_date"] = to_bson_date(doc["entry_date"])
+        doc["created_at"] = now
+        doc["updated_at"] = now
+        documents.append((index, doc))
+    return documents
+
+
+async def insert_documents(
+    collection: AsyncCollection,
+    documents: Sequence[Tuple[int, Dict[str, Any]]],
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], Dict[int, RowError]]:
+    """Insert with one unordered ``insert_many``; returns the inserted rows and write errors."""
+    if not documents:
+        return [], {}
+    try:
+        await collection.insert_many([doc for _, doc in documents], ordered=False)
+    except BulkWriteError as exc:
+        return _split_write_errors(documents, exc)
+    return list(documents), {}
+
+
+def insert_documents_sync(
+    collection: Collection,
+    documents: Sequence[Tuple[int, Dict[str, Any]]],
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], Dict[int, RowError]]:
+    """Synchronous ``insert_documents`` for the import jobs and CLI."""
+    if not documents:
+        return [], {}
+    try:
+        collection.insert_many([doc for _, doc in documents], ordered=False)
+    except BulkWriteError as exc:
+        return _split_write_errors(documents, exc)
+    return list(documents), {}
+
+
+def _split_write_errors(
+    documents: Sequence[Tuple[int, Dict[str, Any]]],
+    exc: BulkWriteError,
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], Dict[int, RowError]]:
+    """Map the write errors of an unordered ``insert_many`` back to row indexes."""
+    failed: Dict[int, RowError] = {}
+    for write_error in exc.details.get("writeErrors", []):
+        index = documents[write_error["index"]][0]
+        failed[index] = {"error": "Write error", "message": write_error.get("errmsg")}
+    inserted = [(index, doc) for index, doc in documents if index not in failed]
+    return inserted, failed
+
+
+def describe_row_error(error: RowError) -> str:
+    """One-line text for a row error, as written to the rejected-rows file."""
+    if "fields" in error:
+        return "; ".join(
+            f"{field['field']}: {field['message']}" if field["field"] else field["message"]
+            for field in error["fields"]
+        )
+    if "keywords" in error:
+        return f"{error['error']}: {', '.join(error['keywords'])}"
+    if error.get("message"):
+        return f"{error['error']}: {error['message']}"
+    return error["error"]
+
+
+def row_results(
+    total: int,
+    inserted: Sequence[Tuple[int, Dict[str, Any]]],
+    errors: Dict[int, RowError],
+) -> List[Dict[str, Any]]:
+    """One result per input row, in input order."""
+    ids = {index: str(doc["_id"]) for index, doc in inserted}
+    results = []
+    for index in range(total):
+        if index in ids:
+            results.append({"row": index, "success": True, "id": ids[index]})
+        else:
+            results.append({"row": index, "success": False, **errors.get(index, {"error": "Not inserted"})})
+    return results
@@ -0,0 +1,290 @@
+"""Versioned in-process read cache for the query endpoints.
+
+Cached responses are stored together with the collection version they were
+computed at. Every write endpoint bumps that version, so a reader never gets
+a response older than its own last write: entries stored under an older
+version are treated as misses and recomputed.
+
+The version counter lives in a pluggable backend so several uvicorn workers
+can share invalidation:
+
+* ``local`` - an in-process counter (single worker).
+* ``mongo`` - a document in the ``cache_versions`` collection.
+* ``redis`` - a Redis-compatible server (Redis, Valkey, KeyDB...) reached
+  through ``CACHE_REDIS_URL``; needs the optional ``redis`` package.
+
+Memory is bounded by ``CACHE_MAX_ENTRIES`` (LRU eviction) and stale entries
+also expire after ``CACHE_TTL_SECONDS``.
+
+Writes also bump a version per club, so reads filtered by club are only
+invalidated by writes to that club. The same versions make the weak ETags of
+``/api/entries`` and ``/api/stats``: a conditional GET whose ``If-None-Match``
+still carries the current version is answered with a 304 before any query.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Protocol, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.asynchronous.database import AsyncDatabase
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "local")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+# Sent with ETagged responses: clients may keep them but must revalidate before reuse
+CACHE_CONTROL = os.getenv("CACHE_CONTROL", "private, no-cache")
+
+VERSIONS_COLLECTION = "cache_versions"
+
+# Version scope bumped by every write to the entries collection
+ENTRIES_SCOPE = "entries"
+
+CacheKey = Tuple[Hashable, ...]
+
+
+def club_scope(club: Optional[str]) -> str:
+    """Version scope of reads filtered to ``club``; unfiltered reads use the global scope."""
+    return f"{ENTRIES_SCOPE}:club:{club}" if club else ENTRIES_SCOPE
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+class VersionBackend(Protocol):
+    """Shared monotonically increasing version counters."""
+
+    # Distinguishes counters that restart from zero (per process) in ETags
+    epoch: str
+
+    async def get_version(self, scope: str) -> int: ...
+
+    async def bump(self, scope: str) -> int: ...
+
+    async def close(self) -> None: ...
+
+
+class LocalVersionBackend:
+    """Version counters held in this process only."""
+
+    def __init__(self) -> None:
+        self._versions: Dict[str, int] = {}
+        self.epoch = uuid.uuid4().hex[:8] + "."
+
+    async def get_version(self, scope: str) -> int:
+        return self._versions.get(scope, 0)
+
+    async def bump(self, scope: str) -> int:
+        self._versions[scope] = self._versions.get(scope, 0) + 1
+        return self._versions[scope]
+
+    async def close(self) -> None:
+        return None
+
+
+class MongoVersionBackend:
+    """Version counters stored as documents in the application database."""
+
+    epoch = ""
+
+    def __init__(self, db: AsyncDatabase) -> None:
+        self._collection = db[VERSIONS_COLLECTION]
+
+    async def get_version(self, scope: str) -> int:
+        doc = await self._collection.find_one({"_id": scope})
+        return doc["version"] if doc else 0
+
+    async def bump(self, scope: str) -> int:
+        doc = await self._collection.find_one_and_update(
+            {"_id": scope},
+            {"$inc": {"version": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return doc["version"]
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisVersionBackend:
+    """Version counters stored in a Redis-compatible server."""
+
+    KEY_PREFIX = "trafill:cache-version:"
+    epoch = ""
+
+    def __init__(self, url: str) -> None:
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as exc:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from exc
+        self._client = redis_asyncio.from_url(url)
+
+    async def get_version(self, scope: str) -> int:
+        value = await self._client.get(self.KEY_PREFIX + scope)
+        return int(value) if value is not None else 0
+
+    async def bump(self, scope: str) -> int:
+        return int(await self._client.incr(self.KEY_PREFIX + scope))
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_version_backend(kind: str, db: Optional[AsyncDatabase] = None) -> VersionBackend:
+    """Build the version backend named by ``CACHE_BACKEND``."""
+    if kind == "local":
+        return LocalVersionBackend()
+    if kind == "mongo":
+        if db is None:
+            raise ValueError("The mongo cache backend needs a database")
+        return MongoVersionBackend(db)
+    if kind == "redis":
+        return RedisVersionBackend(CACHE_REDIS_URL)
+    raise ValueError(f"Unknown CACHE_BACKEND: {kind}")
+
+
+def cache_key(**params: Any) -> CacheKey:
+    """Normalize query parameters into a hashable cache key.
+
+    Empty values are dropped, so ``?club=`` and a missing ``club`` share
+    one entry, and parameters are ordered by name.
+    """
+    normalized = []
+    for name in sorted(params):
+        value = params[name]
+        if value is None or value == "":
+            continue
+        normalized.append((name, value))
+    return tuple(normalized)
+
+
+class ReadCache:
+    """LRU + TTL cache whose entries are invalidated by version bumps."""
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+        backend: Optional[VersionBackend] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.backend: VersionBackend = backend or LocalVersionBackend()
+        self._entries: "OrderedDict[CacheKey, Tuple[int, float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.conditional_requests = 0
+        self.not_modified = 0
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        key: CacheKey,
+        loader: Callable[[], Awaitable[Any]],
+        scope: str = ENTRIES_SCOPE,
+        version: Optional[int] = None,
+    ) -> Any:
+        """Return the cached value for ``key`` or compute and store it.
+
+        ``version`` is the version of ``scope`` the caller already read for
+        the ETag; without it the backend is asked.
+        """
+        if version is None:
+            version = await self.backend.get_version(scope)
+        full_key = (namespace, scope) + key
+        now = time.monotonic()
+
+        cached = self._entries.get(full_key)
+        if cached is not None:
+            cached_version, expires_at, value = cached
+            if cached_version == version and expires_at > now:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                return value
+            if cached_version != version:
+                self.invalidations += 1
+            else:
+                self.expirations += 1
+            del self._entries[full_key]
+
+        self.misses += 1
+        value = await loader()
+        self._entries[full_key] = (version, now + self.ttl_seconds, value)
+        self._entries.move_to_end(full_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    async def version(self, scope: str = ENTRIES_SCOPE) -> int:
+        """Current version of ``scope``, one backend round-trip."""
+        return await self.backend.get_version(scope)
+
+    def entity_tag(self, namespace: str, key: CacheKey, scope: str, version: int) -> str:
+        """Weak ETag for the response cached as ``key`` at ``version`` of ``scope``.
+
+        Read the version before loading the response and pass the same one to
+        ``get_or_load``: a write in between then only makes the tag and the
+        cached value older than the data, which costs a 200 later, never a
+        wrong 304.
+        """
+        digest = hashlib.blake2b(repr((namespace, scope, key)).encode(), digest_size=8).hexdigest()
+        return f'W/"{self.backend.epoch}{version}-{digest}"'
+
+    def is_not_modified(self, if_none_match: Optional[str], etag: str) -> bool:
+        """Check a conditional request against ``etag``.
+
+        Counts conditional requests and 304s across every namespace.
+        """
+        if not if_none_match:
+            return False
+        self.conditional_requests += 1
+        if etag_matches(if_none_match, etag):
+            self.not_modified += 1
+            return True
+        return False
+
+    async def invalidate(self, scope: str = ENTRIES_SCOPE) -> int:
+        """Bump the version of ``scope`` so every cached read becomes stale."""
+        return await self.backend.bump(scope)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "conditional_requests": self.conditional_requests,
+            "not_modified": self.not_modified,
+            "not_modified_ratio": (
+                round(self.not_modified / self.conditional_requests, 4) if self.conditional_requests else 0.0
+            ),
+        }
@@ -1,45 +1,186 @@
 from __future__ import annotations
 
-from pymongo import MongoClient, ASCENDING
+from pymongo import AsyncMongoClient, MongoClient, ASCENDING, DESCENDING
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.database import Database
 from pymongo.collection import Collection
+from pymongo.write_concern import WriteConcern
+from typing import Any, Dict, List, Optional
+import asyncio
+import importlib.util
 import os
 
+from mongo_telemetry import mongo_telemetry
+from rollups import RETIRED_ROLLUP_INDEXES, ROLLUPS_COLLECTION, ROLLUP_INDEXES
+
 # MongoDB connection settings
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
 DB_NAME = os.getenv("DB_NAME", "tracking_db")
+# Connections of the asyncio client serving requests; start_backend.py sets
+# it per worker from MONGO_MAX_CONNECTIONS
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+# Connections the asyncio client keeps open, opened at startup by warm_up_async_connection
+MONGO_MIN_POOL_SIZE = min(int(os.getenv("MONGO_MIN_POOL_SIZE", "4")), MONGO_MAX_POOL_SIZE)
+# Connections of the sync client, which only runs migrations, imports and
+# startup checks; it keeps none open when idle
+MONGO_SYNC_POOL_SIZE = int(os.getenv("MONGO_SYNC_POOL_SIZE", "4"))
+# Wire compressors offered to the server in order of preference, e.g.
+# "zstd,snappy,zlib"; off by default since it only pays off over a network.
+# zstd needs the zstandard package and snappy python-snappy.
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")
+MONGO_ZLIB_LEVEL = os.getenv("MONGO_ZLIB_LEVEL")
+# Client options in milliseconds; unset keeps the driver default
+_TIMEOUT_OPTIONS = {
+    "MONGO_MAX_IDLE_TIME_MS": "maxIdleTimeMS",
+    "MONGO_WAIT_QUEUE_TIMEOUT_MS": "waitQueueTimeoutMS",
+    "MONGO_SERVER_SELECTION_TIMEOUT_MS": "serverSelectionTimeoutMS",
+    "MONGO_CONNECT_TIMEOUT_MS": "connectTimeoutMS",
+    "MONGO_SOCKET_TIMEOUT_MS": "socketTimeoutMS",
+}
+# primary, primaryPreferred, secondary, secondaryPreferred or nearest
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE")
+
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+def available_compressors(value: str) -> List[str]:
+    """Parse a comma-separated compressor list, dropping those whose module is missing."""
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in _COMPRESSOR_MODULES]
+    if unknown:
+        raise ValueError(f"Unknown MONGO_COMPRESSORS: {', '.join(unknown)}")
+    return [name for name in names if importlib.util.find_spec(_COMPRESSOR_MODULES[name]) is not None]
+
+
+def client_options(client: str) -> Dict[str, Any]:
+    """Keyword arguments of the MongoDB client labelled ``client`` ("sync" or "async").
+
+    Options given in ``MONGO_URI`` apply unless the matching variable is set.
+    """
+    options: Dict[str, Any] = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE if client == "async" else MONGO_SYNC_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE if client == "async" else 0,
+        "event_listeners": mongo_telemetry.listeners(client),
+    }
+    compressors = available_compressors(MONGO_COMPRESSORS)
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+        if MONGO_ZLIB_LEVEL is not None:
+            options["zlibCompressionLevel"] = int(MONGO_ZLIB_LEVEL)
+    for variable, option in _TIMEOUT_OPTIONS.items():
+        value = os.getenv(variable)
+        if value:
+            options[option] = int(value)
+    if MONGO_READ_PREFERENCE:
+        options["readPreference"] = MONGO_READ_PREFERENCE
+    return options
+
+# Write concern per write endpoint. WRITE_CONCERN sets the default for all of
+# them and WRITE_CONCERN_<ENDPOINT> (e.g. WRITE_CONCERN_STATUS) overrides it.
+# Values are a "w" value ("majority", "1", "0"), optionally with "+j" to also
+# wait for the journal; unset means the server default.
+WRITE_ENDPOINTS = ("create", "bulk", "update", "status", "delete", "import")
+# Endpoints that read back the document they change need acknowledged writes
+_ACKNOWLEDGED_ENDPOINTS = ("update", "status", "delete")
+WRITE_CONCERN_TIMEOUT_MS = int(os.getenv("WRITE_CONCERN_TIMEOUT_MS", "0")) or None
+
+
+def parse_write_concern(value: str) -> WriteConcern:
+    """Parse "majority", "1", "majority+j"... into a WriteConcern."""
+    w_value, _, journal = value.strip().partition("+")
+    if journal not in ("", "j"):
+        raise ValueError(f"Invalid write concern: {value!r}")
+    w: int | str = int(w_value) if w_value.isdigit() else w_value
+    return WriteConcern(w=w, j=True if journal else None, wtimeout=WRITE_CONCERN_TIMEOUT_MS)
+
+
+def _endpoint_write_concerns() -> Dict[str, Optional[WriteConcern]]:
+    default = os.getenv("WRITE_CONCERN")
+    concerns: Dict[str, Optional[WriteConcern]] = {}
+    for endpoint in WRITE_ENDPOINTS:
+        value = os.getenv(f"WRITE_CONCERN_{endpoint.upper()}", default)
+        concern = parse_write_concern(value) if value else None
+        if concern is not None and endpoint in _ACKNOWLEDGED_ENDPOINTS and not concern.acknowledged:
+            raise ValueError(f"WRITE_CONCERN_{endpoint.upper()} must be acknowledged (w >= 1)")
+        concerns[endpoint] = concern
+    return concerns
+
+
+WRITE_CONCERNS = _endpoint_write_concerns()
+
+# Indexes on the entries collection, each matched to the query shapes of the
+# endpoints; ``python indexes.py advise`` checks the shapes against them.
+# Changing this list needs a new index migration in migrations.py.
+ENTRY_INDEXES = [
+    # Prefix search on normalized keys; the display value makes the suggestion queries covered.
+    # The company key also answers the company half of the duplicate check
+    [("company_key", ASCENDING), ("company", ASCENDING)],
+    [("contact_key", ASCENDING), ("contact_person", ASCENDING)],
+    [("opportunity_type_key", ASCENDING)],
+    # Duplicate check on canonical contact keys
+    [("email_key", ASCENDING)],
+    [("phone_key", ASCENDING)],
+    [("linkedin_key", ASCENDING)],
+    # Listing and export: equality filters, then the (created_at, _id) sort, then
+    # the entry_date range, so the sort never happens in memory and date bounds
+    # are checked on index keys
+    [("created_at", DESCENDING), ("_id", DESCENDING), ("entry_date", ASCENDING)],
+    [("club", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING), ("entry_date", ASCENDING)],
+    [("member_name", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+    [("member_name", ASCENDING), ("club", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+    [("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+    [("club", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+]
+
+# Indexes managed per collection
+COLLECTION_INDEXES = {
+    "entries": ENTRY_INDEXES,
+    ROLLUPS_COLLECTION: ROLLUP_INDEXES,
+}
+
+# Indexes an earlier index set created, dropped when the managed set is applied
+RETIRED_INDEXES = {
+    "entries": [
+        # Prefixes of the listing indexes, or not matching any query
+        [("member_name", ASCENDING)],
+        [("club", ASCENDING)],
+        [("entry_date", ASCENDING)],
+        [("company", ASCENDING)],
+        [("status", ASCENDING)],
+        # Superseded by the same keys followed by entry_date
+        [("created_at", DESCENDING), ("_id", DESCENDING)],
+        [("club", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+    ],
+    ROLLUPS_COLLECTION: RETIRED_ROLLUP_INDEXES,
+}
 
 _client: MongoClient | None = None
 _db: Database | None = None
 
+_async_client: AsyncMongoClient | None = None
+_async_db: AsyncDatabase | None = None
+
 
 def get_database() -> Database:
-    """Get MongoDB database instance."""
+    """Get MongoDB database instance.
+
+    The synchronous client is kept for scripts and maintenance commands;
+    request handlers use the async client below. Indexes are created by the
+    index migrations (see ``indexes.py``), not on connection.
+    """
     global _client, _db
     if _db is None:
-        _client = MongoClient(MONGO_URI)
+        _client = MongoClient(MONGO_URI, **client_options("sync"))
         _db = _client[DB_NAME]
-        init_db()
     return _db
 
 
-def get_collection(name: str = "entries") -> Collection:
-    """Get a MongoDB collection."""
-    db = get_database()
-    return db[name]
-
-
-def init_db() -> None:
-    """Initialize database with indexes."""
-    db = get_database()
-    entries = db["entries"]
-    
-    # Create indexes for efficient querying
-    entries.create_index([("member_name", ASCENDING)])
-    entries.create_index([("club", ASCENDING)])
-    entries.create_index([("entry_date", ASCENDING)])
-    entries.create_index([("company", ASCENDING)])
-    entries.create_index([("status", ASCENDING)])
+def get_collection(name: str = "entries", endpoint: Optional[str] = None) -> Collection:
+    """Get a MongoDB collection, with the write concern configured for ``endpoint``."""
+    collection = get_database()[name]
+    concern = WRITE_CONCERNS.get(endpoint) if endpoint else None
+    return collection.with_options(write_concern=concern) if concern else collection
 
 
 def close_connection() -> None:
@@ -49,3 +190,50 @@ def close_connection() -> None:
         _client.close()
         _client = None
         _db = None
+
+
+async def open_async_connection() -> AsyncDatabase:
+    """Create the asyncio MongoDB client.
+
+    Called once from the FastAPI lifespan so the client is bound to the
+    running event loop.
+    """
+    global _async_client, _async_db
+    if _async_db is None:
+        _async_client = AsyncMongoClient(MONGO_URI, **client_options("async"))
+        _async_db = _async_client[DB_NAME]
+    return _async_db
+
+
+async def warm_up_async_connection(connections: int = MONGO_MIN_POOL_SIZE) -> None:
+    """Open ``connections`` pooled connections of the asyncio client up front.
+
+    The driver connects lazily, so without this the first requests of a
+    worker pay for the TCP/TLS handshake and authentication. Concurrent
+    pings each check out a connection of their own.
+    """
+    db = get_async_database()
+    await asyncio.gather(*(db.command("ping") for _ in range(max(1, connections))))
+
+
+def get_async_database() -> AsyncDatabase:
+    """Get the asyncio MongoDB database instance."""
+    if _async_db is None:
+        raise RuntimeError("Async MongoDB client is not open; call open_async_connection() first")
+    return _async_db
+
+
+def get_async_collection(name: str = "entries", endpoint: Optional[str] = None) -> AsyncCollection:
+    """Get an asyncio MongoDB collection, with the write concern configured for ``endpoint``."""
+    collection = get_async_database()[name]
+    concern = WRITE_CONCERNS.get(endpoint) if endpoint else None
+    return collection.with_options(write_concern=concern) if concern else collection
+
+
+async def close_async_connection() -> None:
+    """Close the asyncio MongoDB connection."""
+    global _async_client, _async_db
+    if _async_client:
+        await _async_client.close()
+        _async_client = None
+        _async_db = None
@@ -0,0 +1,77 @@
+"""Native BSON dates for the entry date fields.
+
+``entry_date``, ``created_at`` and ``updated_at`` are stored as BSON dates
+(``entry_date`` at midnight UTC) while the API keeps sending and accepting
+ISO strings: ``"2026-10-16"`` for entry dates, ``"2026-10-16T08:30:00.123000"``
+for timestamps.
+
+Entries written before the ``0004_native_dates`` migration hold ISO strings
+until it has converted them. MongoDB compares values of different types by
+type only, so the query helpers here match both representations; once the
+migration has run the string branches simply match nothing.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+# Date fields of an entry document
+DATE_FIELDS = ("entry_date", "created_at", "updated_at")
+
+
+def utc_now() -> datetime:
+    """Current UTC time at the millisecond precision BSON dates keep."""
+    now = datetime.utcnow()
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+def to_bson_date(value: Any) -> Any:
+    """Convert an ISO date/datetime string or a ``date`` to a ``datetime``; other values pass through."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.replace(microsecond=value.microsecond // 1000 * 1000)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return value
+
+
+def api_value(field: str, value: Any) -> Any:
+    """Format a stored date field the way the API returns it."""
+    if isinstance(value, datetime):
+        return value.date().isoformat() if field == "entry_date" else value.isoformat()
+    return value
+
+
+def to_api_dates(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Format the date fields of a stored document as ISO strings, in place."""
+    for field in DATE_FIELDS:
+        if field in doc:
+            doc[field] = api_value(field, doc[field])
+    return doc
+
+
+def date_condition(field: str, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
+    """Match ``field`` between the ISO dates ``start`` and ``end``, inclusive.
+
+    Returns an empty dict when neither bound is given.
+    """
+    native: Dict[str, Any] = {}
+    legacy: Dict[str, Any] = {}
+    if start:
+        native["$gte"], legacy["$gte"] = to_bson_date(start), start
+    if end:
+        native["$lte"], legacy["$lte"] = to_bson_date(end), end
+    if not native:
+        return {}
+    return {"$or": [{field: native}, {field: legacy}]}
+
+
+def day_string(expression: str) -> Dict[str, Any]:
+    """Aggregation expression formatting a date field as its ``YYYY-MM-DD`` day."""
+    return {"$cond": [
+        {"$eq": [{"$type": expression}, "date"]},
+        {"$dateToString": {"format": "%Y-%m-%d", "date": {"$dateTrunc": {"date": expression, "unit": "day"}}}},
+        expression,
+    ]}
@@ -0,0 +1,268 @@
+"""In-process Bloom filter in front of the duplicate check.
+
+Almost every ``/api/check-duplicate`` call is for a new contact. The filter
+holds the canonical contact and company keys (see ``normalize.py``) of every
+entry, so a value it has never seen is known to be absent without a query;
+only possible hits go to MongoDB.
+
+A Bloom filter never has false negatives for the values added to it, so the
+filter is only trusted while it has seen every write:
+
+* It is built at startup from a projected scan of ``entries`` and records
+  the read-cache version (bumped by every write, see ``cache.py``) it was
+  built at.
+* Writes handled by this worker add their new values and advance that
+  version. When the shared version moved without us (another worker wrote),
+  the filter is bypassed until a rebuild catches up.
+* Values of deleted or edited entries cannot be removed, only counted; once
+  they make up ``DUPLICATE_FILTER_REBUILD_RATIO`` of the filter, or it grows
+  past its capacity, it is rebuilt in the background.
+
+``DUPLICATE_FILTER_FPR`` sets the target false-positive rate; lower rates
+cost ``-ln(p) / ln(2)^2`` bits per value (9.6 bits at 1%).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo.asynchronous.database import AsyncDatabase
+
+from cache import ENTRIES_SCOPE, VersionBackend
+from normalize import CONTACT_KEY_FIELDS, search_key, search_keys
+from rollups import EntryChange
+
+DUPLICATE_FILTER_ENABLED = os.getenv("DUPLICATE_FILTER_ENABLED", "true").lower() == "true"
+DUPLICATE_FILTER_FPR = float(os.getenv("DUPLICATE_FILTER_FPR", "0.01"))
+DUPLICATE_FILTER_MIN_CAPACITY = int(os.getenv("DUPLICATE_FILTER_MIN_CAPACITY", "100000"))
+DUPLICATE_FILTER_REBUILD_RATIO = float(os.getenv("DUPLICATE_FILTER_REBUILD_RATIO", "0.1"))
+# Minimum spacing between two background rebuilds
+DUPLICATE_FILTER_REBUILD_SECONDS = float(os.getenv("DUPLICATE_FILTER_REBUILD_SECONDS", "30"))
+
+# Source fields whose keys go into the filter
+FILTER_FIELDS = [*CONTACT_KEY_FIELDS, "company"]
+
+# Capacity headroom over the values present at build time
+_GROWTH_FACTOR = 2
+
+logger = logging.getLogger(__name__)
+
+
+def filter_token(key_field: str, value: str) -> str:
+    """Filter entry for one key; the field name keeps e.g. phones and emails apart."""
+    return f"{key_field}\x00{value}"
+
+
+def entry_tokens(doc: Dict[str, Any]) -> List[str]:
+    """Filter entries for the contact and company keys of an entry."""
+    keys = search_keys({field: doc.get(field) for field in FILTER_FIELDS})
+    return [filter_token(key_field, value) for key_field, value in keys.items() if value]
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, capacity: int, fpr: float = DUPLICATE_FILTER_FPR) -> None:
+        if not 0 < fpr < 1:
+            raise ValueError("The false-positive rate must be between 0 and 1")
+        self.capacity = max(1, capacity)
+        self.fpr = fpr
+        self.num_bits = max(8, math.ceil(-self.capacity * math.log(fpr) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing (Kirsch-Mitzenmacher): k positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+    def estimated_fpr(self) -> float:
+        """False-positive rate expected at the current fill."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+
+class DuplicateFilter:
+    """Bloom filter of entry keys plus the bookkeeping that decides when to trust it."""
+
+    def __init__(self, fpr: float = DUPLICATE_FILTER_FPR, min_capacity: int = DUPLICATE_FILTER_MIN_CAPACITY) -> None:
+        self.fpr = fpr
+        self.min_capacity = min_capacity
+        self.version: Optional[int] = None
+        self.removed = 0
+        self.rebuilds = 0
+        self.negatives = 0
+        self.fallthroughs = 0
+        self.stale = False
+        self._bloom: Optional[BloomFilter] = None
+        # Writes seen while a rebuild is scanning: (tokens, cache version)
+        self._pending: Optional[List[Tuple[List[str], Optional[int]]]] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._last_rebuild = float("-inf")
+
+    @property
+    def ready(self) -> bool:
+        return self._bloom is not None
+
+    def _advance(self, version: Optional[int]) -> None:
+        if version is not None and self.version is not None and version == self.version + 1:
+            self.version = version
+
+    def record_changes(self, changes: Iterable[EntryChange], version: Optional[int]) -> None:
+        """Add the new keys of a batch of entry writes.
+
+        ``version`` is the cache version the batch bumped to, or None if the
+        bump failed.
+        """
+        tokens: List[str] = []
+        for before, after in changes:
+            after_tokens = entry_tokens(after) if after is not None else []
+            if before is not None:
+                self.removed += len(set(entry_tokens(before)) - set(after_tokens))
+            tokens.extend(after_tokens)
+        if self._bloom is not None:
+            for token in tokens:
+                self._bloom.add(token)
+        if self._pending is not None:
+            self._pending.append((tokens, version))
+        self._advance(version)
+
+    async def is_current(self, backend: VersionBackend) -> bool:
+        """Whether the filter has seen every write up to the shared cache version."""
+        if self._bloom is None:
+            return False
+        try:
+            return await backend.get_version(ENTRIES_SCOPE) == self.version
+        except Exception:
+            logger.error("Failed to read the cache version for the duplicate filter", exc_info=True)
+            return False
+
+    async def screen(
+        self,
+        backend: VersionBackend,
+        contacts: List[Dict[str, str]],
+        company: Optional[str],
+    ) -> Tuple[List[Dict[str, str]], Optional[str]]:
+        """Drop the parts of a duplicate check that are certainly negative.
+
+        Takes the contact key conditions and company name of the check and
+        returns what still has to be looked up in MongoDB. Everything is
+        returned unchanged while the filter is not current; ``stale`` then
+        asks the caller for a rebuild.
+        """
+        self.stale = not await self.is_current(backend)
+        if self.stale:
+            self.fallthroughs += 1
+            return contacts, company
+        bloom = self._bloom
+        assert bloom is not None
+
+        contact_tokens = [filter_token(key_field, value) for condition in contacts for key_field, value in condition.items()]
+        if not any(token in bloom for token in contact_tokens):
+            contacts = []
+        company_key = search_key(company)
+        if not company_key or filter_token("company_key", company_key) not in bloom:
+            company = None
+
+        if contacts or company:
+            self.fallthroughs += 1
+        else:
+            self.negatives += 1
+        return contacts, company
+
+    def needs_rebuild(self) -> bool:
+        if self._bloom is None:
+            return True
+        return (
+            self._bloom.count > self._bloom.capacity
+            or self.removed > self._bloom.count * DUPLICATE_FILTER_REBUILD_RATIO
+        )
+
+    async def rebuild(self, db: AsyncDatabase, backend: VersionBackend) -> None:
+        """Build a fresh filter from the entries collection and swap it in."""
+        self._pending = []
+        try:
+            version = await backend.get_version(ENTRIES_SCOPE)
+            estimated = await db["entries"].estimated_document_count()
+            bloom = BloomFilter(max(self.min_capacity, estimated * len(FILTER_FIELDS) * _GROWTH_FACTOR), self.fpr)
+            projection = {field: 1 for field in FILTER_FIELDS}
+            async for doc in db["entries"].find({}, projection, batch_size=10_000):
+                for token in entry_tokens(doc):
+                    bloom.add(token)
+
+            # Writes of this worker during the scan are replayed on top
+            pending = self._pending
+            for tokens, _ in pending:
+                for token in tokens:
+                    bloom.add(token)
+            self._bloom, self.version, self.removed, self.stale = bloom, version, 0, False
+            for own_version in sorted(v for _, v in pending if v is not None):
+                self._advance(own_version)
+            self.rebuilds += 1
+            logger.info(
+                "Duplicate filter built: %s keys, %s bytes, %s hashes",
+                bloom.count, bloom.memory_bytes(), bloom.num_hashes,
+            )
+        finally:
+            self._pending = None
+            self._last_rebuild = time.monotonic()
+
+    def schedule_rebuild(self, db: AsyncDatabase, backend: VersionBackend, force: bool = False) -> bool:
+        """Start a background rebuild unless one is running or the last was too recent."""
+        if self._task is not None and not self._task.done():
+            return False
+        if not force and time.monotonic() - self._last_rebuild < DUPLICATE_FILTER_REBUILD_SECONDS:
+            return False
+        self._task = asyncio.create_task(self.rebuild(db, backend))
+        self._task.add_done_callback(_log_rebuild_result)
+        return True
+
+    def cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        bloom = self._bloom
+        return {
+            "ready": bloom is not None,
+            "version": self.version,
+            "keys": bloom.count if bloom else 0,
+            "capacity": bloom.capacity if bloom else 0,
+            "hashes": bloom.num_hashes if bloom else 0,
+            "memory_bytes": bloom.memory_bytes() if bloom else 0,
+            "target_fpr": self.fpr,
+            "estimated_fpr": round(bloom.estimated_fpr(), 6) if bloom else None,
+            "stale": self.stale,
+            "removed": self.removed,
+            "rebuilds": self.rebuilds,
+            "negatives": self.negatives,
+            "fallthroughs": self.fallthroughs,
+        }
+
+
+def _log_rebuild_result(task: "asyncio.Task[None]") -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Failed to build the duplicate filter", exc_info=task.exception())
+
+
+duplicate_filter = DuplicateFilter()
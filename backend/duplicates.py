@@ -0,0 +1,92 @@
+"""Single-query duplicate check for new entries.
+
+The contact and company checks of ``/api/check-duplicate`` are answered by
+one ``$facet`` aggregation. Its leading ``$match`` is an ``$or`` over the
+indexed canonical keys (``email_key``, ``phone_key``, ``linkedin_key`` and
+``company_key``), so the server only reads the candidate entries, and both
+facets run over those few documents.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from dates import day_string
+from normalize import CONTACT_KEY_FIELDS, search_key, search_keys
+
+# Entry fields returned with a duplicate contact / an existing company
+CONTACT_DETAIL_FIELDS = ["company", "member_name", "status", "entry_date", "contact_person"]
+COMPANY_DETAIL_FIELDS = ["member_name", "status", "entry_date", "contact_person"]
+
+
+def contact_conditions(
+    email: Optional[str] = None,
+    phone: Optional[str] = None,
+    linkedin: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    """Equality conditions on the canonical key of each given contact field."""
+    keys = search_keys({"email": email, "phone": phone, "linkedin": linkedin})
+    return [{key_field: keys[key_field]} for key_field in CONTACT_KEY_FIELDS.values() if keys[key_field]]
+
+
+def build_duplicate_pipeline(
+    contacts: List[Dict[str, str]],
+    company: Optional[str] = None,
+    exclude_id: Any = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """Return the ``$facet`` pipeline for the check, or None if there is nothing to check."""
+    company_key = search_key(company)
+    candidates = list(contacts)
+    if company_key:
+        candidates.append({"company_key": company_key})
+    if not candidates:
+        return None
+
+    query: Dict[str, Any] = {"$or": candidates}
+    if exclude_id is not None:
+        query = {"$and": [query, {"_id": {"$ne": exclude_id}}]}
+
+    projection: Dict[str, Any] = {field: 1 for field in CONTACT_DETAIL_FIELDS}
+    projection["entry_date"] = day_string("$entry_date")
+    projection.update({key_field: 1 for key_field in CONTACT_KEY_FIELDS.values()})
+    projection["company_key"] = 1
+
+    facets: Dict[str, List[Dict[str, Any]]] = {}
+    if contacts:
+        facets["contact"] = [{"$match": {"$or": contacts}}, {"$limit": 1}]
+    if company_key:
+        facets["company"] = [
+            {"$match": {"company_key": company_key}},
+            {"$group": {"_id": None, "count": {"$sum": 1}, "first": {"$first": "$$ROOT"}}},
+        ]
+
+    return [
+        {"$match": query},
+        {"$project": projection},
+        {"$facet": facets},
+    ]
+
+
+def format_duplicate_result(facet_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape the ``$facet`` output into the ``duplicate_contact``/``company_exists`` payload."""
+    contact_rows = facet_result.get("contact", [])
+    company_rows = facet_result.get("company", [])
+    duplicate_contact = contact_rows[0] if contact_rows else None
+    company_group = company_rows[0] if company_rows else None
+    company_exists = company_group["first"] if company_group else None
+
+    return {
+        "duplicate_contact": {
+            "exists": duplicate_contact is not None,
+            "details": {
+                field: duplicate_contact.get(field) for field in CONTACT_DETAIL_FIELDS
+            } if duplicate_contact else None
+        },
+        "company_exists": {
+            "exists": company_exists is not None,
+            "count": company_group["count"] if company_group else 0,
+            "details": {
+                field: company_exists.get(field) for field in COMPANY_DETAIL_FIELDS
+            } if company_exists else None
+        },
+    }
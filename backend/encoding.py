@@ -0,0 +1,105 @@
+"""Fast JSON encoding of API responses.
+
+``FastJSONResponse`` encodes with ``orjson`` when it is installed and with
+the standard library otherwise. Both encode ``ObjectId``, ``datetime`` and
+``date`` values directly, so handlers can return documents as read from
+MongoDB without converting them field by field first.
+
+Entry listings read documents through ``ENTRY_PROJECTION``, which makes
+MongoDB return them in their API shape: ``_id`` as the string ``id`` and
+without the internal ``*_key`` fields. A ``fields=`` parameter narrows that
+projection to a sparse fieldset.
+
+Listings also read ``RawBSONDocument``s: the driver leaves each row as its
+undecoded BSON bytes and the encoder decodes a row only when writing it out.
+Since the projection already removed every field that is not emitted,
+nothing else is decoded, and no intermediate dict per row outlives the
+encoding.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId, decode
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from fastapi.responses import JSONResponse
+
+from dates import day_string
+from export import EXPORT_FIELDS
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Fields an entry listing can return, in their API names
+ENTRY_FIELDS = ("id",) + tuple(EXPORT_FIELDS)
+
+# Returned whatever the fieldset: they identify an entry and position the next page
+REQUIRED_FIELDS = ("id", "created_at")
+
+# Find projection returning entries as the API sends them; timestamps are
+# encoded as ISO strings by ``dumps``
+ENTRY_PROJECTION: Dict[str, Any] = {
+    "_id": 0,
+    "id": {"$toString": "$_id"},
+    **{field: 1 for field in EXPORT_FIELDS},
+    "entry_date": day_string("$entry_date"),
+}
+
+# Codec options reading documents as undecoded RawBSONDocuments
+RAW_CODEC_OPTIONS: CodecOptions = CodecOptions(document_class=RawBSONDocument)
+
+
+class InvalidFieldsError(ValueError):
+    """Raised when a ``fields`` parameter names an unknown field."""
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse a comma-separated ``fields`` parameter into a sorted fieldset.
+
+    Returns ``None``, meaning every field, when the parameter is missing or
+    empty.
+    """
+    if not fields:
+        return None
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(names.difference(ENTRY_FIELDS))
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(sorted(names.union(REQUIRED_FIELDS))) if names else None
+
+
+def entry_projection(fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+    """Find projection for a fieldset from ``parse_fields``."""
+    if fields is None:
+        return ENTRY_PROJECTION
+    return {field: ENTRY_PROJECTION[field] for field in ("_id",) + fields}
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, RawBSONDocument):
+        return decode(value.raw)
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded by ``dumps``."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,91 @@
+"""Streaming NDJSON/CSV encoders for entry exports.
+
+Rows are encoded one Mongo batch at a time and yielded as byte chunks, so the
+server holds at most one cursor batch plus one output buffer regardless of
+how many entries are exported.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+import zlib
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List
+
+from dates import api_value
+
+# Documents per cursor batch; also the number of rows encoded per chunk
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# Columns of the CSV export, in order (same as the frontend's CSV download)
+EXPORT_FIELDS = [
+    "member_name",
+    "club",
+    "company",
+    "opportunity_type",
+    "contact_person",
+    "email",
+    "linkedin",
+    "phone",
+    "status",
+    "status_notes",
+    "entry_date",
+    "created_at",
+    "updated_at",
+]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _ndjson_line(doc: Dict[str, Any]) -> str:
+    row = {"id": str(doc["_id"])}
+    row.update((field, api_value(field, doc.get(field))) for field in EXPORT_FIELDS)
+    return json.dumps(row, default=str, ensure_ascii=False) + "\n"
+
+
+def _csv_rows(writer: Any, buffer: io.StringIO, docs: List[Dict[str, Any]]) -> str:
+    for doc in docs:
+        writer.writerow(["" if doc.get(field) is None else api_value(field, doc.get(field)) for field in EXPORT_FIELDS])
+    chunk = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return chunk
+
+
+async def encode_entries(docs: AsyncIterable[Dict[str, Any]], fmt: str) -> AsyncIterator[bytes]:
+    """Encode entry documents as NDJSON or CSV, one chunk per batch."""
+    batch: List[Dict[str, Any]] = []
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    if fmt == "csv":
+        writer.writerow(EXPORT_FIELDS)
+
+    async for doc in docs:
+        batch.append(doc)
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            if fmt == "csv":
+                yield _csv_rows(writer, buffer, batch).encode()
+            else:
+                yield "".join(_ndjson_line(d) for d in batch).encode()
+            batch = []
+
+    if fmt == "csv":
+        yield _csv_rows(writer, buffer, batch).encode()
+    elif batch:
+        yield "".join(_ndjson_line(d) for d in batch).encode()
+
+
+async def gzip_chunks(chunks: AsyncIterable[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """Compress a byte stream into a gzip stream on the fly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,99 @@
+"""Import entries from a CSV or XLSX file into the tracking database.
+
+Runs the same pipeline as ``POST /api/imports`` (see ``importer.py``) without
+going through the server::
+
+    python import_entries.py leads.csv
+    python import_entries.py leads.xlsx --workers 4 --rejected leads-rejected.csv
+
+Stats rollups are updated as rows are inserted. Running servers pick the new
+entries up in their autocomplete indexes on the next refresh; with a shared
+cache backend (``CACHE_BACKEND=mongo`` or ``redis``) their cached reads and
+duplicate filters are invalidated at the end of the import, with the local
+backend restart them instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from cache import CACHE_BACKEND, ENTRIES_SCOPE, club_scope, create_version_backend
+from database import close_async_connection, close_connection, get_collection, open_async_connection
+from importer import IMPORT_CHUNK_SIZE, IMPORT_WORKERS, ImportJob, import_format, run_import
+from rollups import ROLLUPS_COLLECTION, rollup_operations
+
+logger = logging.getLogger(__name__)
+
+
+async def bump_cache_version(clubs: Set[str]) -> None:
+    """Invalidate the cached reads of running servers sharing the cache backend.
+
+    Bumps the global scope plus the scope of every club the import touched,
+    as ``record_entry_changes`` does for the API writes.
+    """
+    db = await open_async_connection()
+    backend = create_version_backend(CACHE_BACKEND, db)
+    try:
+        await backend.bump(ENTRIES_SCOPE)
+        for club in clubs:
+            await backend.bump(club_scope(club))
+    finally:
+        await backend.close()
+        await close_async_connection()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import entries from a CSV or XLSX file.")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=["csv", "xlsx"], help="Defaults to the file extension")
+    parser.add_argument("--workers", type=int, default=IMPORT_WORKERS, help="Validation processes")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    parser.add_argument("--rejected", type=Path, help="Rejected rows CSV (default: <file>-rejected.csv)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+
+    try:
+        fmt = import_format(args.path.name, args.format)
+    except ValueError as exc:
+        parser.error(str(exc))
+    rejected_path = args.rejected or args.path.with_name(f"{args.path.stem}-rejected.csv")
+    job = ImportJob(args.path.name, fmt, source_path=args.path, rejected_path=rejected_path)
+
+    rollups = get_collection(ROLLUPS_COLLECTION)
+    clubs: Set[str] = set()
+
+    def on_insert(docs: List[Dict[str, Any]]) -> None:
+        clubs.update(doc["club"] for doc in docs if doc.get("club"))
+        operations = rollup_operations((None, doc) for doc in docs)
+        if operations:
+            rollups.bulk_write(operations, ordered=False)
+
+    def on_progress(job: ImportJob) -> None:
+        logger.info(
+            "%s: %s rows read, %s inserted, %s rejected",
+            job.status, job.rows_read, job.rows_inserted, job.rows_rejected,
+        )
+
+    try:
+        run_import(job, get_collection(endpoint="import"), on_insert, on_progress, workers=args.workers, chunk_size=args.chunk_size)
+        if job.rows_inserted and CACHE_BACKEND != "local":
+            asyncio.run(bump_cache_version(clubs))
+    finally:
+        close_connection()
+
+    if job.status != "completed":
+        logger.error("Import failed: %s", job.error)
+        return 1
+    if job.rows_rejected:
+        logger.info("Rejected rows written to %s", job.rejected_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""Streaming CSV/XLSX import of entries.
+
+An import reads the file row by row and cuts it into chunks of
+``IMPORT_CHUNK_SIZE`` rows. Each chunk is validated (``EntryCreate``) and
+screened against the blocklists in a process pool of ``IMPORT_WORKERS``
+processes, so validation uses every core. Finished chunks are written in
+file order with one unordered ``insert_many`` each. At most two chunks per
+worker are in flight, so memory stays bounded however long the file is.
+
+Rows that fail validation, the blocklist or the insert are written with
+their original values and the reason to a rejected-rows CSV next to the
+upload. Progress is reported after every chunk.
+
+Column headers are matched to entry fields case-insensitively, with spaces
+read as underscores ("Member Name" -> ``member_name``). Unknown columns are
+ignored, so a CSV from ``GET /api/entries/export`` can be imported again.
+XLSX files are read with ``openpyxl``.
+
+Imports run from ``POST /api/imports`` or from the command line::
+
+    python import_entries.py leads.xlsx
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import multiprocessing
+import os
+import tempfile
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pymongo.collection import Collection
+
+from bulk import build_documents, describe_row_error, insert_documents_sync, screen_rows, validate_rows
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "0")) or os.cpu_count() or 1
+IMPORT_DIR = Path(os.getenv("IMPORT_DIR", str(Path(tempfile.gettempdir()) / "trafill-imports")))
+IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", str(200 * 1024 * 1024)))
+
+IMPORT_FORMATS = ("csv", "xlsx")
+IMPORT_JOBS_COLLECTION = "import_jobs"
+
+# Chunks queued or validating per worker before the reader waits
+_IN_FLIGHT_PER_WORKER = 2
+
+logger = logging.getLogger(__name__)
+
+# A source row: (row number in the file, raw cell values)
+SourceRow = Tuple[int, List[Any]]
+# Validated documents and rejections of one chunk, by row number
+ChunkResult = Tuple[List[Tuple[int, Dict[str, Any]]], List[Tuple[int, str]]]
+
+
+def import_format(filename: Optional[str], fmt: Optional[str] = None) -> str:
+    """Pick the file format from an explicit ``fmt`` or the file extension."""
+    if not fmt and filename:
+        fmt = Path(filename).suffix.lstrip(".")
+    fmt = (fmt or "").lower()
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Import format must be one of: {', '.join(IMPORT_FORMATS)}")
+    return fmt
+
+
+def _column_name(header: Any) -> str:
+    return "_".join(str(header or "").strip().lower().split())
+
+
+def _cell(value: Any) -> Any:
+    """Convert a CSV/XLSX cell to the value the entry model expects."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheets store phone numbers as floats
+        return str(int(value))
+    if isinstance(value, (int, float)):
+        return str(value)
+    return value
+
+
+def _numbered(rows: Iterator[Sequence[Any]]) -> Iterator[SourceRow]:
+    # Row 1 is the header, so data rows are numbered as in a spreadsheet
+    for number, values in enumerate(rows, start=2):
+        if any(value not in (None, "") for value in values):
+            yield number, list(values)
+
+
+def read_csv(path: Path) -> Tuple[List[str], Iterator[SourceRow]]:
+    """Return the header and a lazy iterator over the data rows of a CSV file."""
+    handle = open(path, newline="", encoding="utf-8-sig")
+    reader = csv.reader(handle)
+    headers = next(reader, [])
+
+    def rows() -> Iterator[SourceRow]:
+        with handle:
+            yield from _numbered(reader)
+
+    return headers, rows()
+
+
+def read_xlsx(path: Path) -> Tuple[List[str], Iterator[SourceRow]]:
+    """Return the header and a lazy iterator over the rows of the first sheet."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:
+        raise RuntimeError("XLSX imports require the 'openpyxl' package") from exc
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    sheet_rows = workbook.worksheets[0].iter_rows(values_only=True)
+    headers = ["" if cell is None else str(cell) for cell in next(sheet_rows, ())]
+
+    def rows() -> Iterator[SourceRow]:
+        try:
+            yield from _numbered(sheet_rows)
+        finally:
+            workbook.close()
+
+    return headers, rows()
+
+
+READERS = {"csv": read_csv, "xlsx": read_xlsx}
+
+
+def validate_chunk(columns: List[str], rows: List[SourceRow]) -> ChunkResult:
+    """Validate and screen one chunk; runs in the worker processes."""
+    records = [
+        {column: _cell(value) for column, value in zip(columns, values) if column}
+        for _, values in rows
+    ]
+    valid, errors = validate_rows(records)
+    errors.update(screen_rows(valid))
+    documents = build_documents([(index, entry) for index, entry in valid if index not in errors])
+    return (
+        [(rows[index][0], doc) for index, doc in documents],
+        [(rows[index][0], describe_row_error(error)) for index, error in sorted(errors.items())],
+    )
+
+
+class ImportJob:
+    """State and counters of one import, saved as a document in ``import_jobs``."""
+
+    def __init__(
+        self,
+        filename: str,
+        fmt: str,
+        source_path: Optional[Path] = None,
+        rejected_path: Optional[Path] = None,
+    ) -> None:
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.format = fmt
+        # Uploads are stored under IMPORT_DIR; the CLI reads files in place
+        self.source_path = source_path or IMPORT_DIR / f"{self.id}.{fmt}"
+        self.rejected_path = rejected_path or IMPORT_DIR / f"{self.id}.rejected.csv"
+        self.status = "queued"
+        self.rows_read = 0
+        self.rows_inserted = 0
+        self.rows_rejected = 0
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow().isoformat()
+        self.finished_at: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "format": self.format,
+            "status": self.status,
+            "rows_read": self.rows_read,
+            "rows_inserted": self.rows_inserted,
+            "rows_rejected": self.rows_rejected,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+def _run_inline(columns: List[str], rows: List[SourceRow]) -> "Future[ChunkResult]":
+    future: "Future[ChunkResult]" = Future()
+    try:
+        future.set_result(validate_chunk(columns, rows))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def run_import(
+    job: ImportJob,
+    collection: Collection,
+    on_insert: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    on_progress: Optional[Callable[[ImportJob], None]] = None,
+    workers: int = IMPORT_WORKERS,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> ImportJob:
+    """Import ``job.source_path`` into ``collection``; blocking.
+
+    ``on_insert`` receives the documents of every inserted chunk (to update
+    derived data) and ``on_progress`` the job after every chunk.
+    """
+    job.status = "running"
+    if on_progress:
+        on_progress(job)
+
+    executor = None
+    try:
+        headers, rows = READERS[job.format](job.source_path)
+        columns = [_column_name(header) for header in headers]
+        if workers > 1:
+            # spawn: forking a process that runs the server's threads is unsafe
+            executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+
+        job.rejected_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(job.rejected_path, "w", newline="", encoding="utf-8") as rejected_file:
+            rejected = csv.writer(rejected_file)
+            rejected.writerow(["row", "error", *headers])
+            in_flight: Deque[Tuple[List[SourceRow], "Future[ChunkResult]"]] = deque()
+
+            def finish_oldest() -> None:
+                chunk, future = in_flight.popleft()
+                documents, rejections = future.result()
+                inserted, write_errors = insert_documents_sync(collection, documents)
+                rejections.extend((number, describe_row_error(error)) for number, error in write_errors.items())
+
+                values = dict(chunk)
+                for number, reason in sorted(rejections):
+                    rejected.writerow([number, reason, *values[number]])
+                job.rows_inserted += len(inserted)
+                job.rows_rejected += len(rejections)
+                if inserted and on_insert:
+                    on_insert([doc for _, doc in inserted])
+                if on_progress:
+                    on_progress(job)
+
+            def submit(chunk: List[SourceRow]) -> None:
+                if executor is not None:
+                    in_flight.append((chunk, executor.submit(validate_chunk, columns, chunk)))
+                else:
+                    in_flight.append((chunk, _run_inline(columns, chunk)))
+                if len(in_flight) >= max(1, workers) * _IN_FLIGHT_PER_WORKER:
+                    finish_oldest()
+
+            chunk: List[SourceRow] = []
+            for row in rows:
+                chunk.append(row)
+                job.rows_read += 1
+                if len(chunk) >= chunk_size:
+                    submit(chunk)
+                    chunk = []
+            if chunk:
+                submit(chunk)
+            while in_flight:
+                finish_oldest()
+
+        job.status = "completed"
+    except Exception as exc:
+        logger.error("Import %s failed", job.id, exc_info=True)
+        job.status = "failed"
+        job.error = str(exc)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        job.finished_at = datetime.utcnow().isoformat()
+        if on_progress:
+            on_progress(job)
+    return job
@@ -0,0 +1,202 @@
+"""Managed index set and an ``explain()``-based index advisor.
+
+The indexes of each collection are declared in ``database.COLLECTION_INDEXES``
+and created by index migrations (see ``migrations.py``), so they are issued
+once per database instead of on every startup. Applying the set also drops
+the indexes listed in ``database.RETIRED_INDEXES``; indexes created by hand
+are left alone.
+
+The advisor explains the query shapes of every endpoint against the current
+database and flags plans with a collection scan or an in-memory sort. Run
+it from the ``backend`` directory::
+
+    python indexes.py status    # managed indexes missing, retired ones still present
+    python indexes.py advise    # exits non-zero if any query shape is flagged
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from bson import ObjectId
+from pymongo import IndexModel
+from pymongo.database import Database
+
+from database import COLLECTION_INDEXES, RETIRED_INDEXES, get_database
+from dates import date_condition, utc_now
+from duplicates import build_duplicate_pipeline, contact_conditions
+from models import ALLOWED_CLUBS, ALLOWED_STATUSES
+from normalize import prefix_range
+from pagination import DEFAULT_PAGE_SIZE, ENTRY_SORT, encode_cursor, keyset_filter
+from rollups import ROLLUPS_COLLECTION
+from stats import build_rollup_stats_pipeline
+
+logger = logging.getLogger(__name__)
+
+IndexKeys = Sequence[Tuple[str, int]]
+
+# Plan stages that make a query cost grow with the collection
+FLAGGED_STAGES = ("COLLSCAN", "SORT")
+
+
+def _key_tuple(keys: Any) -> Tuple[Tuple[str, int], ...]:
+    return tuple((field, int(direction)) for field, direction in keys)
+
+
+def index_changes(db: Database) -> Tuple[Dict[str, List[IndexKeys]], Dict[str, List[str]]]:
+    """Return the managed indexes missing per collection, and the names of retired ones present."""
+    missing: Dict[str, List[IndexKeys]] = {}
+    retired: Dict[str, List[str]] = {}
+    for name in COLLECTION_INDEXES.keys() | RETIRED_INDEXES.keys():
+        existing = {_key_tuple(info["key"]): index_name for index_name, info in db[name].index_information().items()}
+        missing[name] = [keys for keys in COLLECTION_INDEXES.get(name, []) if _key_tuple(keys) not in existing]
+        retired[name] = [
+            existing[_key_tuple(keys)] for keys in RETIRED_INDEXES.get(name, []) if _key_tuple(keys) in existing
+        ]
+    return missing, retired
+
+
+def sync_indexes(db: Database) -> Tuple[int, int]:
+    """Create the missing managed indexes, then drop the retired ones.
+
+    Returns the number of indexes created and dropped. New indexes are built
+    before the ones they replace are dropped, so queries always have one.
+    """
+    missing, retired = index_changes(db)
+    created = dropped = 0
+    for name, indexes in missing.items():
+        if indexes:
+            db[name].create_indexes([IndexModel(list(keys)) for keys in indexes])
+            created += len(indexes)
+    for name, index_names in retired.items():
+        for index_name in index_names:
+            db[name].drop_index(index_name)
+            dropped += 1
+    return created, dropped
+
+
+class QueryShape(NamedTuple):
+    endpoint: str
+    description: str
+    collection: str
+    # A find filter, or an aggregation pipeline when ``pipeline`` is set
+    filter: Dict[str, Any]
+    sort: Optional[List[Tuple[str, int]]] = None
+    pipeline: Optional[List[Dict[str, Any]]] = None
+
+
+def query_shapes() -> List[QueryShape]:
+    """Representative queries of each endpoint, with sample values."""
+    club, status = ALLOWED_CLUBS[0], ALLOWED_STATUSES[0]
+    start, end = (date.today() - timedelta(days=30)).isoformat(), date.today().isoformat()
+    cursor = encode_cursor({"_id": ObjectId(), "created_at": utc_now()})
+
+    def listing(description: str, query: Dict[str, Any]) -> QueryShape:
+        return QueryShape("GET /api/entries", description, "entries", query, ENTRY_SORT)
+
+    duplicate_pipeline = build_duplicate_pipeline(
+        contact_conditions(email="someone@example.com", phone="+91 98765 43210"), "Acme", ObjectId()
+    )
+    suggestion_pipeline = [
+        {"$match": {"company_key": prefix_range("ac")}},
+        {"$group": {"_id": "$company"}},
+        {"$sort": {"_id": 1}},
+        {"$limit": 10},
+    ]
+    return [
+        listing("newest first", {}),
+        listing("next page", keyset_filter({}, cursor)),
+        listing("club", {"club": club}),
+        listing("club, next page", keyset_filter({"club": club}, cursor)),
+        listing("club + entry_date range", {"club": club, **date_condition("entry_date", start, end)}),
+        listing("member", {"member_name": "Asha 1"}),
+        listing("member + club", {"member_name": "Asha 1", "club": club}),
+        listing("status", {"status": status}),
+        listing("club + status", {"club": club, "status": status}),
+        QueryShape("GET /api/check-duplicate", "contacts + company, excluding an id", "entries", {},
+                   pipeline=duplicate_pipeline),
+        QueryShape("GET /api/suggestions/companies", "company prefix", "entries", {}, pipeline=suggestion_pipeline),
+        QueryShape("GET /api/stats", "club", ROLLUPS_COLLECTION, {}, pipeline=build_rollup_stats_pipeline(club)),
+        QueryShape("GET /api/stats", "member + entry_date range", ROLLUPS_COLLECTION, {},
+                   pipeline=build_rollup_stats_pipeline(member_name="Asha 1", start_date=start, end_date=end)),
+    ]
+
+
+def explain(db: Database, shape: QueryShape) -> Dict[str, Any]:
+    if shape.pipeline is not None:
+        return db.command("aggregate", shape.collection, pipeline=shape.pipeline, explain=True)
+    cursor = db[shape.collection].find(shape.filter)
+    if shape.sort:
+        cursor = cursor.sort(shape.sort)
+    return cursor.limit(DEFAULT_PAGE_SIZE + 1).explain()
+
+
+def _winning_plan_nodes(node: Any) -> Iterator[Dict[str, Any]]:
+    """Yield every plan stage of an explain document, skipping rejected plans."""
+    if isinstance(node, dict):
+        if "stage" in node:
+            yield node
+        for key, value in node.items():
+            if key != "rejectedPlans":
+                yield from _winning_plan_nodes(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _winning_plan_nodes(value)
+
+
+def plan_summary(explained: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """Return the index names used and the flagged stages of an explain document."""
+    indexes: List[str] = []
+    flagged: List[str] = []
+    for node in _winning_plan_nodes(explained):
+        if node.get("indexName") and node["indexName"] not in indexes:
+            indexes.append(node["indexName"])
+        if node["stage"] in FLAGGED_STAGES and node["stage"] not in flagged:
+            flagged.append(node["stage"])
+    return indexes, flagged
+
+
+def advise(db: Database) -> int:
+    """Explain every query shape and log its plan; returns how many were flagged."""
+    flagged_shapes = 0
+    for shape in query_shapes():
+        indexes, flagged = plan_summary(explain(db, shape))
+        used = ", ".join(indexes) or "no index"
+        if flagged:
+            flagged_shapes += 1
+            logger.warning("%s (%s): %s using %s", shape.endpoint, shape.description, "+".join(flagged), used)
+        else:
+            logger.info("%s (%s): ok using %s", shape.endpoint, shape.description, used)
+    return flagged_shapes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check the managed indexes and the query plans that use them.")
+    parser.add_argument("command", choices=["status", "advise"])
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    db = get_database()
+
+    if args.command == "status":
+        missing, retired = index_changes(db)
+        for name in sorted(missing):
+            for keys in missing[name]:
+                logger.warning("%s: missing index %s", name, list(keys))
+            for index_name in retired[name]:
+                logger.warning("%s: retired index %s still present", name, index_name)
+        pending = sum(map(len, missing.values())) + sum(map(len, retired.values()))
+        logger.info("%s index change(s) pending; apply them with `python migrations.py apply`", pending)
+        return 1 if pending else 0
+
+    flagged = advise(db)
+    logger.info("%s query shape(s) flagged", flagged)
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Logging off the request path: queued, structured, sampled and rotated.
+
+``configure_logging`` puts a ``QueueHandler`` on the root logger. Request
+handlers only append the record to an in-memory queue; a ``QueueListener``
+thread formats it and writes it to ``LOG_FILE`` (rotated by size) and the
+console, so the event loop never waits on disk I/O. Rotation is per
+process, so every process needs a file of its own: ``{pid}`` in
+``LOG_FILE`` is replaced by the process id. ``start_backend.py`` running
+several workers logs to the console only unless ``LOG_FILE`` is set, and
+adds ``{pid}`` to a ``LOG_FILE`` that lacks it.
+
+Records are formatted on the listener thread, including their ``%``
+arguments, so log calls should pass arguments rather than f-strings: a
+call below ``LOG_LEVEL`` then costs a level check, and a sampled-out one
+the creation of its record, without formatting anything.
+``LOG_FORMAT=json`` (default) writes one JSON object per line with the
+fields given through ``extra=``; ``text`` keeps the classic line format.
+
+High-volume INFO logs can be sampled per route handler: with
+``LOG_SAMPLE_RATES=get_entries=0.1`` one in ten INFO records logged while
+``get_entries`` handles a request is kept, including those of the helpers
+it calls. ``RouteContextMiddleware`` records the request being handled in a
+context variable; records logged outside a request are sampled by the name
+of the function logging them. Warnings and errors are always kept.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# "{pid}" is replaced by the process id
+LOG_FILE = os.getenv("LOG_FILE", "app.log")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(50 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+# "<handler function>=<kept share>" pairs, comma-separated
+LOG_SAMPLE_RATES = os.getenv(
+    "LOG_SAMPLE_RATES",
+    "get_entries=0.1,get_entry=0.1,get_stats=0.1,get_company_suggestions=0.01,get_contact_suggestions=0.01",
+)
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else came from ``extra=``
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+# ASGI scope of the request being handled; the router stores the matched
+# endpoint in it, so the route is known by the time the handler logs
+_request_scope: ContextVar[Optional[Scope]] = ContextVar("request_scope", default=None)
+
+
+def current_route() -> Optional[str]:
+    """Name of the handler function of the request being handled, if any."""
+    scope = _request_scope.get()
+    if scope is None:
+        return None
+    return getattr(scope.get("endpoint"), "__name__", None)
+
+
+class RouteContextMiddleware:
+    """ASGI middleware making the request's route visible to ``RouteSampler``."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """Parse ``"get_entries=0.1,get_stats=0.5"`` into a rate per handler name."""
+    rates: Dict[str, float] = {}
+    for part in value.split(","):
+        name, _, rate = part.partition("=")
+        if name.strip():
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, source, extras and traceback."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "function": record.funcName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RouteSampler(logging.Filter):
+    """Keep only a share of the INFO and DEBUG records logged while a sampled route is handled.
+
+    Filters run in the thread and context of the log call, before the
+    record is queued, so ``current_route`` sees the request being handled.
+    """
+
+    def __init__(self, rates: Dict[str, float]) -> None:
+        super().__init__()
+        self.rates = rates
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(current_route() or record.funcName)
+        if rate is None or random.random() < rate:
+            return True
+        self.dropped += 1
+        return False
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queue records as they are; formatting happens on the listener thread.
+
+    The stock ``prepare`` formats the message in the calling thread, which
+    is the cost this pipeline moves off the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging() -> None:
+    """Route the root logger through the queue; idempotent."""
+    global _listener
+    if _listener is not None:
+        return
+    formatter = JSONFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    if LOG_FILE:
+        log_file = LOG_FILE.replace("{pid}", str(os.getpid()))
+        handlers.append(
+            RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+        )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(RouteSampler(parse_sample_rates(LOG_SAMPLE_RATES)))
+
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Write out the queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,157 @@
+"""Prometheus metrics in the text exposition format, without a client library.
+
+``MetricsMiddleware`` records every HTTP request into
+``http_request_duration_seconds`` (labelled by method, route template and
+status code) and keeps the ``http_requests_in_flight`` gauge.
+``mongo_telemetry`` records MongoDB command latencies into a histogram of
+the same kind. ``GET /metrics`` renders both along with the counters the
+app already keeps (read cache, compression, pools...) via ``stats_lines``.
+
+Observing costs a bisect and two increments. Histograms take no lock of
+their own: the request histogram is only touched on the event loop thread
+and the MongoDB one under ``mongo_telemetry``'s lock.
+
+Metrics are per worker process; with several workers each scrape sees the
+worker that answered it.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bounds in seconds, from 1ms to 10s
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Mapping[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+class Histogram:
+    """Latency histogram with one series per combination of label values."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str],
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, label_values: Tuple[str, ...], value: float) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def lines(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total) in sorted(self._series.items()):
+            labels = dict(zip(self.label_names, label_values))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': bound})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+def gauge_lines(name: str, help_text: str, samples: Iterable[Tuple[Mapping[str, Any], float]]) -> List[str]:
+    """Exposition lines of a gauge from ``(labels, value)`` samples."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    lines.extend(f"{name}{_format_labels(labels)} {value}" for labels, value in samples)
+    return lines
+
+
+def _flatten(prefix: str, stats: Mapping[str, Any]) -> Iterator[Tuple[str, float]]:
+    for key, value in stats.items():
+        name = f"{prefix}_{key}"
+        if isinstance(value, Mapping):
+            yield from _flatten(name, value)
+        elif isinstance(value, (int, float)):
+            yield name, float(value) if isinstance(value, bool) else value
+
+
+def stats_lines(prefix: str, samples: Iterable[Tuple[Mapping[str, Any], Mapping[str, Any]]]) -> List[str]:
+    """Expose the numeric fields of ``stats()`` dicts as untyped metrics named ``<prefix>_<field>``.
+
+    ``samples`` are ``(labels, stats)`` pairs, one per labelled instance.
+    Nested dicts extend the name; strings and ``None`` are skipped.
+    """
+    families: Dict[str, List[str]] = {}
+    for labels, stats in samples:
+        for name, value in _flatten(prefix, stats):
+            families.setdefault(name, []).append(f"{name}{_format_labels(labels)} {value}")
+    return [line for lines in families.values() for line in lines]
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response is sent, by route template and status code.",
+    ("method", "route", "status"),
+)
+
+
+class RequestMetrics:
+    """Requests currently being handled, alongside ``request_duration``."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+
+    def lines(self) -> List[str]:
+        return [
+            *request_duration.lines(),
+            *gauge_lines("http_requests_in_flight", "HTTP requests being handled.", [({}, self.in_flight)]),
+        ]
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording the latency and status of every HTTP request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        request_metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_metrics.in_flight -= 1
+            # The router stores the matched route in the scope; label by its
+            # template so ids in paths do not create a series each
+            route = scope.get("route")
+            request_duration.observe(
+                (scope["method"], getattr(route, "path", "unmatched"), status),
+                time.perf_counter() - started,
+            )
@@ -0,0 +1,248 @@
+"""Versioned data migrations for the tracking database.
+
+Each migration runs once per database; applied ids are recorded in the
+``schema_migrations`` collection. Pending migrations are applied in a
+background thread at startup, guarded by a lock document so only one worker
+runs them, and can also be run by hand::
+
+    python migrations.py status
+    python migrations.py apply
+
+Data migrations work in batches and only select documents they have not
+converted yet, so an interrupted run resumes where it stopped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import socket
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from pymongo import ASCENDING, UpdateOne
+from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError
+
+from database import get_database
+from dates import DATE_FIELDS, to_bson_date
+from indexes import sync_indexes
+from normalize import CONTACT_KEY_FIELDS, SEARCH_KEY_FIELDS, search_keys
+from rollups import ROLLUPS_COLLECTION, convert_rollup_dates, rebuild_rollups
+
+MIGRATIONS_COLLECTION = "schema_migrations"
+LOCK_ID = "__lock__"
+LOCK_TIMEOUT = timedelta(minutes=30)
+# How often a worker waiting for the lock checks it again
+LOCK_POLL_SECONDS = 1.0
+BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class Migration(NamedTuple):
+    id: str
+    description: str
+    apply: Callable[[Database], None]
+
+
+def _backfill_keys(db: Database, key_fields: Dict[str, str]) -> int:
+    """Set the ``key_fields`` (source -> key field) on entries missing any of them.
+
+    Walks the collection in ``_id`` order from the last entry of the previous
+    batch, so each batch is a range scan of the ``_id`` index rather than a
+    new search for entries still missing a key.
+    """
+    entries = db["entries"]
+    missing: Dict[str, Any] = {"$or": [{key: {"$exists": False}} for key in key_fields.values()]}
+    projection = {field: 1 for field in key_fields}
+    updated = 0
+    while True:
+        batch = list(entries.find(missing, projection).sort("_id", ASCENDING).limit(BATCH_SIZE))
+        if not batch:
+            break
+        missing["_id"] = {"$gt": batch[-1]["_id"]}
+        entries.bulk_write(
+            [UpdateOne({"_id": doc["_id"]}, {"$set": search_keys({f: doc.get(f) for f in key_fields})})
+             for doc in batch],
+            ordered=False,
+        )
+        updated += len(batch)
+        _renew_lock(db)
+    return updated
+
+
+def backfill_search_keys(db: Database) -> None:
+    """Store normalized company/contact/opportunity type keys on existing entries."""
+    logger.info("Backfilled search keys on %s entries", _backfill_keys(db, SEARCH_KEY_FIELDS))
+
+
+def backfill_contact_keys(db: Database) -> None:
+    """Store canonical email/phone/LinkedIn keys on existing entries."""
+    logger.info("Backfilled contact keys on %s entries", _backfill_keys(db, CONTACT_KEY_FIELDS))
+
+
+def apply_index_set(db: Database) -> None:
+    """Create the managed indexes of ``database.COLLECTION_INDEXES`` and drop retired ones.
+
+    Changing the managed set needs a new migration calling this again.
+    """
+    created, dropped = sync_indexes(db)
+    logger.info("Created %s and dropped %s indexes", created, dropped)
+
+
+def _convert_entry_dates(db: Database) -> int:
+    """Store the ISO string date fields of entries as BSON dates.
+
+    Every entry written before native dates has a string ``created_at``,
+    which the listing indexes cover, so each batch is found through an index.
+    A value is only replaced while it still holds the string read, so an
+    update racing with the migration is never overwritten.
+    """
+    entries = db["entries"]
+    projection = {field: 1 for field in DATE_FIELDS}
+    unparsable: List[object] = []
+    converted = 0
+    while True:
+        legacy = {"created_at": {"$type": "string"}, "_id": {"$nin": unparsable}}
+        batch = list(entries.find(legacy, projection).sort("created_at", ASCENDING).limit(BATCH_SIZE))
+        if not batch:
+            break
+        operations = []
+        for doc in batch:
+            strings = {field: doc[field] for field in DATE_FIELDS if isinstance(doc.get(field), str)}
+            try:
+                dates = {field: to_bson_date(value) for field, value in strings.items()}
+            except ValueError:
+                logger.warning("Entry %s has a date that is not ISO formatted: %s", doc["_id"], strings)
+                unparsable.append(doc["_id"])
+                continue
+            operations.append(UpdateOne({"_id": doc["_id"], **strings}, {"$set": dates}))
+        if operations:
+            entries.bulk_write(operations, ordered=False)
+            converted += len(operations)
+        _renew_lock(db)
+    return converted
+
+
+def convert_dates(db: Database) -> None:
+    """Store entry and rollup dates as BSON dates instead of ISO strings."""
+    logger.info("Converted dates of %s entries", _convert_entry_dates(db))
+    logger.info("Re-keyed %s stats rollups on dates", convert_rollup_dates(db, BATCH_SIZE))
+
+
+# Applied in order; never reorder or rename an id once released
+MIGRATIONS: List[Migration] = [
+    Migration("0001_search_keys", "Backfill normalized search keys", backfill_search_keys),
+    Migration("0002_contact_keys", "Backfill canonical contact keys", backfill_contact_keys),
+    Migration("0003_index_set", "Create the query-shape index set", apply_index_set),
+    Migration("0004_native_dates", "Store entry dates as BSON dates", convert_dates),
+]
+
+
+def applied_migration_ids(db: Database) -> List[str]:
+    return [doc["_id"] for doc in db[MIGRATIONS_COLLECTION].find({"_id": {"$ne": LOCK_ID}}, {"_id": 1})]
+
+
+def pending_migrations(db: Database) -> List[Migration]:
+    applied = set(applied_migration_ids(db))
+    return [migration for migration in MIGRATIONS if migration.id not in applied]
+
+
+def _acquire_lock(db: Database) -> bool:
+    now = datetime.utcnow()
+    collection = db[MIGRATIONS_COLLECTION]
+    collection.delete_one({"_id": LOCK_ID, "expires_at": {"$lt": now}})
+    try:
+        collection.insert_one({"_id": LOCK_ID, "owner": socket.gethostname(), "expires_at": now + LOCK_TIMEOUT})
+    except DuplicateKeyError:
+        return False
+    return True
+
+
+def _renew_lock(db: Database) -> None:
+    """Push back the expiry of the migration lock; called between batches of long migrations."""
+    db[MIGRATIONS_COLLECTION].update_one({"_id": LOCK_ID}, {"$set": {"expires_at": datetime.utcnow() + LOCK_TIMEOUT}})
+
+
+def _release_lock(db: Database) -> None:
+    db[MIGRATIONS_COLLECTION].delete_one({"_id": LOCK_ID})
+
+
+def apply_migrations(db: Database) -> List[str]:
+    """Apply every pending migration in order; returns the ids applied.
+
+    Returns immediately if another process holds the migration lock.
+    """
+    if not pending_migrations(db):
+        return []
+    if not _acquire_lock(db):
+        logger.info("Migrations are being applied by another process")
+        return []
+    applied = []
+    try:
+        for migration in pending_migrations(db):
+            logger.info("Applying migration %s: %s", migration.id, migration.description)
+            migration.apply(db)
+            db[MIGRATIONS_COLLECTION].insert_one({"_id": migration.id, "applied_at": datetime.utcnow()})
+            applied.append(migration.id)
+    finally:
+        _release_lock(db)
+    return applied
+
+
+def bootstrap_rollups(db: Database) -> bool:
+    """Build the stats rollups when entries exist but no rollups do yet.
+
+    Every worker calls this on startup. The build replaces the collection
+    with ``$out``, so it runs under the migration lock: the other workers
+    wait until the rollups exist. Returns whether this call built them.
+    """
+    while not _acquire_lock(db):
+        # Another worker builds them, or runs migrations after building them
+        if db[ROLLUPS_COLLECTION].find_one({}, {"_id": 1}) is not None:
+            return False
+        time.sleep(LOCK_POLL_SECONDS)
+    try:
+        if db[ROLLUPS_COLLECTION].find_one({}, {"_id": 1}) is not None:
+            return False
+        if db["entries"].find_one({}, {"_id": 1}) is None:
+            return False
+        rebuild_rollups(db)
+        return True
+    finally:
+        _release_lock(db)
+
+
+def run_pending_migrations() -> List[str]:
+    """Apply pending migrations through the synchronous client.
+
+    Blocking; the app runs it in a worker thread.
+    """
+    return apply_migrations(get_database())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Show or apply database migrations.")
+    parser.add_argument("command", choices=["status", "apply"])
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    db = get_database()
+
+    if args.command == "apply":
+        applied = apply_migrations(db)
+        logger.info("Applied %s migration(s)", len(applied))
+        return 0
+
+    applied = set(applied_migration_ids(db))
+    for migration in MIGRATIONS:
+        state = "applied" if migration.id in applied else "pending"
+        logger.info("%-24s %-8s %s", migration.id, state, migration.description)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import Optional, Any
+from typing import List, Optional, Any
 
-from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter, field_validator, model_validator
 
 ALLOWED_CLUBS = [
     "The Big O",
@@ -58,6 +58,14 @@ class EntryBase(BaseModel):
             raise ValueError(f"Status must be one of: {', '.join(ALLOWED_STATUSES)}")
         return normalized
 
+    @field_validator("entry_date")
+    @classmethod
+    def validate_entry_date(cls, value: str) -> str:
+        try:
+            return datetime.fromisoformat(value.strip()).date().isoformat()
+        except ValueError:
+            raise ValueError("Entry date must be an ISO date (YYYY-MM-DD)")
+
     @field_validator("phone")
     @classmethod
     def validate_phone(cls, value: Optional[str]) -> Optional[str]:
@@ -85,6 +93,10 @@ class EntryCreate(EntryBase):
     pass
 
 
+# Validates a whole list of new entries in one call (bulk create and import)
+ENTRY_CREATE_LIST = TypeAdapter(List[EntryCreate])
+
+
 class EntryRead(EntryBase):
     id: str
     created_at: str  # ISO format datetime string
@@ -0,0 +1,229 @@
+"""Connection pool and command telemetry of the MongoDB clients.
+
+``database.py`` registers the listeners of ``mongo_telemetry`` on both
+clients. They record, per client and server:
+
+* how long checking a connection out of the pool waited, and how many
+  checkouts found every connection in use (the pool is saturated and
+  requests queue for ``waitQueueTimeoutMS``),
+* the peak number of connections in use against ``maxPoolSize``,
+* per command name, the count, failures and latency, and a latency
+  histogram per command name and collection.
+
+The counters are served by ``GET /api/cache/stats`` and, with the
+histogram, by ``GET /metrics``. Listeners run on the driver's threads as
+well as the event loop, so updates take a lock.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Tuple
+
+from pymongo import monitoring
+
+from metrics import Histogram, stats_lines
+
+# pymongo's maxPoolSize when the pool options leave it at the default
+_DEFAULT_MAX_POOL_SIZE = 100
+
+
+def _address(address: Tuple[str, int]) -> str:
+    return f"{address[0]}:{address[1]}"
+
+
+class _PoolStats:
+    def __init__(self, max_pool_size: int) -> None:
+        self.max_pool_size = max_pool_size
+        self.open = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.checkouts = 0
+        self.saturated_checkouts = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.clears = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_pool_size": self.max_pool_size,
+            "open": self.open,
+            "in_use": self.in_use,
+            "max_in_use": self.max_in_use,
+            "saturation": round(self.max_in_use / self.max_pool_size, 3) if self.max_pool_size else None,
+            "checkouts": self.checkouts,
+            "saturated_checkouts": self.saturated_checkouts,
+            "checkout_failures": dict(self.checkout_failures),
+            "checkout_wait_ms_avg": round(self.wait_ms_total / self.checkouts, 3) if self.checkouts else 0.0,
+            "checkout_wait_ms_max": round(self.wait_ms_max, 3),
+            "clears": self.clears,
+        }
+
+
+class _CommandStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, duration_micros: int, failed: bool) -> None:
+        elapsed = duration_micros / 1000
+        self.count += 1
+        self.failures += failed
+        self.total_ms += elapsed
+        self.max_ms = max(self.max_ms, elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class MongoTelemetry:
+    """Pool and command counters of every client, keyed by a client label."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pools: Dict[Tuple[str, str], _PoolStats] = {}
+        self._commands: Dict[Tuple[str, str], _CommandStats] = {}
+        self.command_duration = Histogram(
+            "mongodb_command_duration_seconds",
+            "MongoDB command latency by client, command name and collection.",
+            ("client", "command", "collection"),
+        )
+
+    def listeners(self, client: str) -> List[Any]:
+        """Event listeners to pass as ``event_listeners`` to the client labelled ``client``."""
+        return [_PoolListener(self, client), _CommandListener(self, client)]
+
+    def _pool(self, client: str, address: Tuple[str, int]) -> _PoolStats:
+        key = (client, _address(address))
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _PoolStats(_DEFAULT_MAX_POOL_SIZE)
+        return pool
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pools: Dict[str, Dict[str, Any]] = {}
+            for (client, address), pool in self._pools.items():
+                pools.setdefault(client, {})[address] = pool.stats()
+            commands: Dict[str, Dict[str, Any]] = {}
+            for (client, name), command in sorted(self._commands.items()):
+                commands.setdefault(client, {})[name] = command.stats()
+        return {"pools": pools, "commands": commands}
+
+    def metrics_lines(self) -> List[str]:
+        """Exposition lines of the command histogram and the pool counters."""
+        with self._lock:
+            pools = [({"client": client, "address": address}, pool.stats()) for (client, address), pool in self._pools.items()]
+            return [*self.command_duration.lines(), *stats_lines("mongodb_pool", pools)]
+
+
+class _PoolListener(monitoring.ConnectionPoolListener):
+    def __init__(self, telemetry: MongoTelemetry, client: str) -> None:
+        self._telemetry = telemetry
+        self._client = client
+
+    def _update(self, address: Tuple[str, int]) -> _PoolStats:
+        return self._telemetry._pool(self._client, address)
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        with self._telemetry._lock:
+            pool = self._update(event.address)
+            pool.max_pool_size = event.options.get("maxPoolSize", _DEFAULT_MAX_POOL_SIZE)
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        with self._telemetry._lock:
+            self._update(event.address).clears += 1
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        with self._telemetry._lock:
+            self._update(event.address).open += 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with self._telemetry._lock:
+            pool = self._update(event.address)
+            pool.open = max(0, pool.open - 1)
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        with self._telemetry._lock:
+            pool = self._update(event.address)
+            if pool.in_use >= pool.max_pool_size:
+                pool.saturated_checkouts += 1
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        with self._telemetry._lock:
+            failures = self._update(event.address).checkout_failures
+            failures[event.reason] = failures.get(event.reason, 0) + 1
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        wait_ms = event.duration * 1000
+        with self._telemetry._lock:
+            pool = self._update(event.address)
+            pool.checkouts += 1
+            pool.in_use += 1
+            pool.max_in_use = max(pool.max_in_use, pool.in_use)
+            pool.wait_ms_total += wait_ms
+            pool.wait_ms_max = max(pool.wait_ms_max, wait_ms)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with self._telemetry._lock:
+            pool = self._update(event.address)
+            pool.in_use = max(0, pool.in_use - 1)
+
+
+def _collection(event: monitoring.CommandStartedEvent) -> str:
+    """Collection a command targets: the value of its name key, or ``collection`` for getMore."""
+    target = event.command.get(event.command_name)
+    if isinstance(target, str):
+        return target
+    return event.command.get("collection", "")
+
+
+class _CommandListener(monitoring.CommandListener):
+    def __init__(self, telemetry: MongoTelemetry, client: str) -> None:
+        self._telemetry = telemetry
+        self._client = client
+        # Collection of each running command; completion events do not carry it
+        self._running: Dict[Tuple[int, Any], str] = {}
+
+    def _record(self, event: Any, failed: bool) -> None:
+        key = (self._client, event.command_name)
+        with self._telemetry._lock:
+            collection = self._running.pop((event.request_id, event.connection_id), "")
+            command = self._telemetry._commands.get(key)
+            if command is None:
+                command = self._telemetry._commands[key] = _CommandStats()
+            command.record(event.duration_micros, failed)
+            self._telemetry.command_duration.observe(
+                (self._client, event.command_name, collection), event.duration_micros / 1_000_000
+            )
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        collection = _collection(event)
+        with self._telemetry._lock:
+            self._running[(event.request_id, event.connection_id)] = collection
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._record(event, False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._record(event, True)
+
+
+mongo_telemetry = MongoTelemetry()
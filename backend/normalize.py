@@ -0,0 +1,108 @@
+"""Normalized lookup keys stored alongside entry fields.
+
+Free-text fields used for prefix search are stored a second time in a
+``*_key`` field holding a case- and accent-folded copy. Prefix queries then
+become plain index range scans (``$gte key``, ``$lt key + "\\uffff"``)
+instead of case-insensitive regexes that cannot use an index and that would
+interpret user input as a pattern.
+
+Contact fields get canonical ``*_key`` copies for exact duplicate lookups,
+so formatting variants of the same contact compare equal: emails are
+lowercased, phones reduced to their digits and LinkedIn URLs to their path
+("https://in.linkedin.com/in/Jane-Doe/?utm=x" -> "in/jane-doe").
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import unquote, urlsplit
+
+# Source field -> normalized key field
+SEARCH_KEY_FIELDS = {
+    "company": "company_key",
+    "contact_person": "contact_key",
+    "opportunity_type": "opportunity_type_key",
+}
+
+# Contact field -> canonical key field used by the duplicate check
+CONTACT_KEY_FIELDS = {
+    "email": "email_key",
+    "phone": "phone_key",
+    "linkedin": "linkedin_key",
+}
+
+# Every derived key field, by source field
+KEY_FIELDS = {**SEARCH_KEY_FIELDS, **CONTACT_KEY_FIELDS}
+
+# Highest BMP code point; every key starting with a prefix sorts below prefix + this
+_PREFIX_UPPER_BOUND = "\uffff"
+
+
+def search_key(value: Optional[str]) -> Optional[str]:
+    """Fold case and accents and collapse whitespace: " Café  Labs" -> "cafe labs"."""
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split()) or None
+
+
+def email_key(value: Optional[str]) -> Optional[str]:
+    """Lowercase and trim an email address."""
+    if value is None:
+        return None
+    return value.strip().lower() or None
+
+
+def phone_key(value: Optional[str]) -> Optional[str]:
+    """Keep only the digits of a phone number: "+91 98765-43210" -> "919876543210"."""
+    if value is None:
+        return None
+    return "".join(char for char in value if char.isdigit()) or None
+
+
+def linkedin_key(value: Optional[str]) -> Optional[str]:
+    """Reduce a LinkedIn profile or company URL to its lowercase path.
+
+    Scheme, host (``www.``, country subdomains), query string, fragment and
+    trailing slashes are dropped; a bare handle is kept as is.
+    """
+    if value is None:
+        return None
+    text = value.strip()
+    if "linkedin.com" in text.lower():
+        if "://" not in text:
+            text = "https://" + text
+        text = urlsplit(text).path
+    path = unquote(text).strip("/").lower()
+    return "/".join(part for part in path.split("/") if part) or None
+
+
+_KEY_NORMALIZERS: Dict[str, Callable[[Optional[str]], Optional[str]]] = {
+    **{field: search_key for field in SEARCH_KEY_FIELDS},
+    "email": email_key,
+    "phone": phone_key,
+    "linkedin": linkedin_key,
+}
+
+
+def search_keys(doc: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """Return the key fields for the searchable and contact fields present in ``doc``."""
+    return {
+        key_field: _KEY_NORMALIZERS[field](doc.get(field))
+        for field, key_field in KEY_FIELDS.items()
+        if field in doc
+    }
+
+
+def add_search_keys(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Set the normalized key fields on ``doc`` in place and return it."""
+    doc.update(search_keys(doc))
+    return doc
+
+
+def prefix_range(prefix: str) -> Dict[str, str]:
+    """Range condition matching every key that starts with ``prefix``."""
+    key = search_key(prefix) or ""
+    return {"$gte": key, "$lt": key + _PREFIX_UPPER_BOUND}
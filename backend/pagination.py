@@ -0,0 +1,85 @@
+"""Keyset (cursor) pagination for entry listings.
+
+Entries are listed newest first, ordered by ``(created_at, _id)`` descending.
+A page ends with an opaque ``next_cursor`` encoding the sort key of its last
+entry; the next page starts strictly after that key, so every page is an
+index range scan no matter how deep the client pages, and inserts between
+requests never shift or duplicate rows the way offsets would.
+
+``created_at`` is a BSON date, except on entries the date migration has not
+converted yet, which hold an ISO string. Descending, every date sorts before
+every string, so a page after a date continues into the strings.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import DESCENDING
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Sort order of every entry listing; the compound indexes end with these keys
+ENTRY_SORT: List[Tuple[str, int]] = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when an ``after`` token cannot be decoded."""
+
+
+def encode_cursor(doc: Dict[str, Any]) -> str:
+    """Build the opaque token pointing just past ``doc``.
+
+    ``doc`` is either a stored document or a listed one, whose ``_id`` was
+    projected to the string ``id``; like lookups by id, a listed id that is a
+    valid ObjectId is taken to be one.
+    """
+    if "_id" in doc:
+        entry_id = doc["_id"]
+        is_object_id = isinstance(entry_id, ObjectId)
+    else:
+        entry_id = doc["id"]
+        is_object_id = ObjectId.is_valid(entry_id)
+    created_at = doc.get("created_at")
+    payload = {
+        "c": created_at.isoformat() if isinstance(created_at, datetime) else created_at,
+        "d": isinstance(created_at, datetime),
+        "i": str(entry_id),
+        "o": is_object_id,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Any, Any]:
+    """Return the ``(created_at, _id)`` sort key encoded in ``token``."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        entry_id = ObjectId(payload["i"]) if payload["o"] else payload["i"]
+        created_at = datetime.fromisoformat(payload["c"]) if payload.get("d") else payload["c"]
+        return created_at, entry_id
+    except Exception as exc:
+        raise InvalidCursorError("Invalid pagination cursor") from exc
+
+
+def keyset_filter(query: Dict[str, Any], after: Optional[str]) -> Dict[str, Any]:
+    """Restrict ``query`` to entries sorting after the ``after`` cursor."""
+    if not after:
+        return query
+    created_at, entry_id = decode_cursor(after)
+    after_key = [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": entry_id}},
+    ]
+    if isinstance(created_at, datetime):
+        after_key.append({"created_at": {"$type": "string"}})
+    position = {"$or": after_key}
+    if not query:
+        return position
+    return {"$and": [query, position]}
@@ -0,0 +1,266 @@
+"""Materialized counters backing the dashboard statistics.
+
+Every entry contributes to three kinds of rollup documents in the
+``stats_rollups`` collection:
+
+* ``status`` - keyed by (club, member_name, entry_date, status) with the
+  entry count and how many of those entries have an email, LinkedIn or phone.
+* ``company`` - keyed by (club, member_name, entry_date, company).
+* ``opportunity_type`` - keyed by (club, member_name, entry_date, type),
+  only for entries with a non-empty opportunity type.
+
+Write endpoints keep the counters current with ``$inc`` upserts; changing an
+entry decrements the keys of the old document and increments the keys of the
+new one. ``/api/stats`` then aggregates the rollups instead of the entries.
+
+Run this module to recompute the rollups from scratch or check them for drift::
+
+    python rollups.py verify
+    python rollups.py rebuild
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import ASCENDING, DeleteOne, UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.database import Database
+
+from dates import to_bson_date
+
+ROLLUPS_COLLECTION = "stats_rollups"
+
+# The stats pipeline filters on club and/or member before its $facet, never on kind
+ROLLUP_INDEXES = [
+    [("club", ASCENDING), ("member_name", ASCENDING), ("entry_date", ASCENDING)],
+    [("member_name", ASCENDING), ("entry_date", ASCENDING)],
+]
+
+RETIRED_ROLLUP_INDEXES = [
+    [("kind", ASCENDING), ("club", ASCENDING), ("member_name", ASCENDING), ("entry_date", ASCENDING)],
+    [("kind", ASCENDING), ("entry_date", ASCENDING)],
+]
+
+CONTACT_FIELDS = ("email", "linkedin", "phone")
+
+logger = logging.getLogger(__name__)
+
+RollupKey = Tuple[Tuple[str, Any], ...]
+
+# An entry write as its (before, after) documents; None on either side for inserts and deletes
+EntryChange = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+def _rollup_ids(doc: Dict[str, Any]) -> List[Tuple[Dict[str, Any], Dict[str, int]]]:
+    """Return the rollup ``_id`` documents an entry counts towards, with its counters."""
+    scope = {
+        "club": doc.get("club"),
+        "member_name": doc.get("member_name"),
+        "entry_date": doc.get("entry_date"),
+    }
+    status_counters = {"count": 1}
+    for field in CONTACT_FIELDS:
+        status_counters[field] = 1 if doc.get(field) is not None else 0
+
+    ids = [
+        ({"kind": "status", **scope, "status": doc.get("status")}, status_counters),
+        ({"kind": "company", **scope, "value": doc.get("company")}, {"count": 1}),
+    ]
+    if doc.get("opportunity_type") not in (None, ""):
+        ids.append(({"kind": "opportunity_type", **scope, "value": doc["opportunity_type"]}, {"count": 1}))
+    return ids
+
+
+def rollup_deltas(changes: Iterable[EntryChange]) -> Dict[RollupKey, Dict[str, int]]:
+    """Compute the counter changes for a batch of ``(before, after)`` entry writes.
+
+    Either side of a change may be ``None`` (insert or delete). Keys whose
+    changes cancel out, such as an update that leaves club, member, date and
+    status alone, are dropped so no write is issued for them.
+    """
+    deltas: Dict[RollupKey, Dict[str, int]] = {}
+    for before, after in changes:
+        for doc, sign in ((before, -1), (after, 1)):
+            if doc is None:
+                continue
+            for rollup_id, counters in _rollup_ids(doc):
+                key = tuple(rollup_id.items())
+                totals = deltas.setdefault(key, {})
+                for field, value in counters.items():
+                    totals[field] = totals.get(field, 0) + sign * value
+    return {
+        key: {field: value for field, value in counters.items() if value}
+        for key, counters in deltas.items()
+        if any(counters.values())
+    }
+
+
+def rollup_operations(changes: Iterable[EntryChange]) -> List[UpdateOne]:
+    """Build the ``$inc`` upserts that apply a batch of entry writes to the rollups."""
+    operations = []
+    for key, counters in rollup_deltas(changes).items():
+        rollup_id = dict(key)
+        operations.append(UpdateOne(
+            {"_id": rollup_id},
+            {"$inc": counters, "$setOnInsert": rollup_id},
+            upsert=True,
+        ))
+    return operations
+
+
+async def apply_rollup_changes(db: AsyncDatabase, changes: Iterable[EntryChange]) -> None:
+    """Apply the rollup changes for a batch of entry writes in one bulk write."""
+    operations = rollup_operations(changes)
+    if operations:
+        await db[ROLLUPS_COLLECTION].bulk_write(operations, ordered=False)
+
+
+def _group_stage(kind: str, value_field: Optional[str], counters: Dict[str, Any]) -> Dict[str, Any]:
+    rollup_id: Dict[str, Any] = {
+        "kind": kind,
+        "club": "$club",
+        "member_name": "$member_name",
+        "entry_date": "$entry_date",
+    }
+    if kind == "status":
+        rollup_id["status"] = "$status"
+    else:
+        rollup_id["value"] = f"${value_field}"
+    return {"$group": {"_id": rollup_id, **counters}}
+
+
+def _lift_id_fields(fields: Iterable[str]) -> Dict[str, Any]:
+    return {"$addFields": {field: f"$_id.{field}" for field in fields}}
+
+
+def build_rebuild_pipeline() -> List[Dict[str, Any]]:
+    """Aggregation over ``entries`` producing every rollup document from scratch."""
+    scope_fields = ["kind", "club", "member_name", "entry_date"]
+    status_counters: Dict[str, Any] = {"count": {"$sum": 1}}
+    for field in CONTACT_FIELDS:
+        status_counters[field] = {"$sum": {"$cond": [{"$ne": [f"${field}", None]}, 1, 0]}}
+
+    return [
+        _group_stage("status", None, status_counters),
+        _lift_id_fields(scope_fields + ["status"]),
+        {"$unionWith": {"coll": "entries", "pipeline": [
+            _group_stage("company", "company", {"count": {"$sum": 1}}),
+            _lift_id_fields(scope_fields + ["value"]),
+        ]}},
+        {"$unionWith": {"coll": "entries", "pipeline": [
+            {"$match": {"opportunity_type": {"$nin": [None, ""]}}},
+            _group_stage("opportunity_type", "opportunity_type", {"count": {"$sum": 1}}),
+            _lift_id_fields(scope_fields + ["value"]),
+        ]}},
+    ]
+
+
+def _counters(doc: Dict[str, Any]) -> Dict[str, int]:
+    return {
+        field: doc.get(field, 0)
+        for field in ("count",) + CONTACT_FIELDS
+        if doc.get(field, 0)
+    }
+
+
+def verify_rollups(db: Database) -> Dict[str, int]:
+    """Compare stored rollups with freshly computed ones and log any drift."""
+    expected: Dict[RollupKey, Dict[str, int]] = {}
+    for doc in db["entries"].aggregate(build_rebuild_pipeline(), allowDiskUse=True):
+        expected[tuple(doc["_id"].items())] = _counters(doc)
+
+    report = {"expected_keys": len(expected), "missing": 0, "unexpected": 0, "mismatched": 0}
+    for doc in db[ROLLUPS_COLLECTION].find({}):
+        key = tuple(doc["_id"].items())
+        stored = _counters(doc)
+        wanted = expected.pop(key, None)
+        if wanted is None:
+            if stored:
+                report["unexpected"] += 1
+                logger.warning("Unexpected rollup %s: %s", dict(key), stored)
+        elif wanted != stored:
+            report["mismatched"] += 1
+            logger.warning("Rollup drift for %s: stored %s, expected %s", dict(key), stored, wanted)
+    for key, wanted in expected.items():
+        report["missing"] += 1
+        logger.warning("Missing rollup %s: expected %s", dict(key), wanted)
+    return report
+
+
+def rebuild_rollups(db: Database) -> int:
+    """Recompute all rollups from ``entries`` and atomically replace the collection.
+
+    Writes made while the rebuild runs are not reflected; run it during a
+    quiet period or follow it with ``verify``.
+    """
+    db["entries"].aggregate(build_rebuild_pipeline() + [{"$out": ROLLUPS_COLLECTION}], allowDiskUse=True)
+    return db[ROLLUPS_COLLECTION].estimated_document_count()
+
+
+def convert_rollup_dates(db: Database, batch_size: int = 1000) -> int:
+    """Re-key rollups whose ``entry_date`` is an ISO string on the matching BSON date.
+
+    Each counter is added to the date-keyed rollup, which may already exist
+    from writes made after the entries were converted, and the string-keyed
+    one is deleted. Run after the entries themselves are converted, so no
+    new write targets a string key.
+    """
+    rollups = db[ROLLUPS_COLLECTION]
+    unparsable: List[Any] = []
+    converted = 0
+    while True:
+        legacy = {"entry_date": {"$type": "string"}, "_id": {"$nin": unparsable}}
+        batch = list(rollups.find(legacy).limit(batch_size))
+        if not batch:
+            break
+        operations: List[Any] = []
+        for doc in batch:
+            try:
+                rollup_id = {**doc["_id"], "entry_date": to_bson_date(doc["_id"]["entry_date"])}
+            except ValueError:
+                unparsable.append(doc["_id"])
+                continue
+            counters = _counters(doc)
+            if counters:
+                operations.append(UpdateOne(
+                    {"_id": rollup_id},
+                    {"$inc": counters, "$setOnInsert": rollup_id},
+                    upsert=True,
+                ))
+            operations.append(DeleteOne({"_id": doc["_id"]}))
+            converted += 1
+        if operations:
+            rollups.bulk_write(operations, ordered=False)
+    return converted
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from database import get_database
+
+    parser = argparse.ArgumentParser(description="Rebuild or verify the stats rollup collection.")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    db = get_database()
+
+    if args.command == "rebuild":
+        count = rebuild_rollups(db)
+        logger.info("Rebuilt %s rollup documents", count)
+        return 0
+
+    report = verify_rollups(db)
+    drift = report["missing"] + report["unexpected"] + report["mismatched"]
+    logger.info(
+        "Checked %s rollup keys: %s missing, %s unexpected, %s mismatched",
+        report["expected_keys"], report["missing"], report["unexpected"], report["mismatched"],
+    )
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,38 @@
-"""Entry point script to launch the FastAPI backend with basic logging."""
+"""Production launcher for the FastAPI backend.
+
+Runs the app in ``--workers`` uvicorn worker processes on the uvloop event
+loop and the httptools HTTP parser when they are installed
+(``uvicorn[standard]`` brings both). There is no file watcher unless
+``--reload`` is passed, which also forces a single worker.
+
+Several workers need a read-cache version backend they all share
+(``CACHE_BACKEND=mongo`` or ``redis``): the default then is one worker
+per CPU. With the per-process ``local`` backend the default is one worker
+and the launcher refuses to start more.
+
+Each worker rotates its own log file, so with several workers logging goes
+to the console only unless ``LOG_FILE`` is set, and a ``LOG_FILE`` without
+a ``{pid}`` placeholder gets one before its extension (``app.{pid}.log``).
+
+On SIGTERM each worker stops accepting connections and lets in-flight
+requests finish for up to ``--graceful-timeout`` seconds before exiting.
+
+Every worker opens its own MongoDB connection pools, so the total
+connection budget ``MONGO_MAX_CONNECTIONS`` is divided between the workers.
+Each share pays for the small sync client pool (``MONGO_SYNC_POOL_SIZE``)
+and the rest goes to the async client as ``MONGO_MAX_POOL_SIZE``.
+
+Usage::
+
+    python start_backend.py --port 5000 --workers 4
+"""
 
 from __future__ import annotations
 
+import argparse
+import importlib.util
 import logging
+import os
 import sys
 from pathlib import Path
 from typing import Sequence
@@ -10,8 +40,28 @@ from typing import Sequence
 import uvicorn
 
 APP_IMPORT_PATH = "backend.app:app"
-DEFAULT_HOST = "0.0.0.0"
-DEFAULT_PORT = 5002
+DEFAULT_HOST = os.getenv("BACKEND_HOST", "0.0.0.0")
+DEFAULT_PORT = int(os.getenv("BACKEND_PORT", "5002"))
+# Read-cache version backends every worker sees; with CACHE_BACKEND=local
+# each worker would keep its own versions and miss the others' writes
+SHARED_CACHE_BACKENDS = ("mongo", "redis")
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "local")
+# Worker processes; WEB_CONCURRENCY is the name most process managers set.
+# Defaults to the CPU count with a shared cache backend, one worker otherwise
+DEFAULT_WORKERS = int(os.getenv("WEB_CONCURRENCY", "0")) or (
+    (os.cpu_count() or 1) if CACHE_BACKEND in SHARED_CACHE_BACKENDS else 1
+)
+# Pending connections the listening socket queues while every worker is busy
+DEFAULT_BACKLOG = int(os.getenv("BACKEND_BACKLOG", "2048"))
+# Idle keep-alive connections are closed after this many seconds; keep it
+# above the idle timeout of the load balancer in front so it never reuses a
+# connection the worker is closing
+DEFAULT_KEEP_ALIVE = int(os.getenv("BACKEND_KEEP_ALIVE_SECONDS", "75"))
+DEFAULT_GRACEFUL_TIMEOUT = int(os.getenv("BACKEND_GRACEFUL_TIMEOUT_SECONDS", "30"))
+# MongoDB connections all workers together may open
+MONGO_MAX_CONNECTIONS = int(os.getenv("MONGO_MAX_CONNECTIONS", "0")) or None
+# Pool of each worker's sync client (see database.py), taken out of its share first
+MONGO_SYNC_POOL_SIZE = int(os.getenv("MONGO_SYNC_POOL_SIZE", "4"))
 
 
 # Ensure the project root is on sys.path so "backend" imports resolve even when
@@ -33,16 +83,84 @@ def configure_logging() -> None:
         logging.debug("Added project root to sys.path: %s", PROJECT_ROOT)
 
 
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the backend with production settings.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--backlog", type=int, default=DEFAULT_BACKLOG)
+    parser.add_argument("--keep-alive", type=int, default=DEFAULT_KEEP_ALIVE, help="Idle keep-alive timeout in seconds")
+    parser.add_argument("--graceful-timeout", type=int, default=DEFAULT_GRACEFUL_TIMEOUT,
+                        help="Seconds in-flight requests get to finish on SIGTERM")
+    parser.add_argument("--mongo-max-connections", type=int, default=MONGO_MAX_CONNECTIONS,
+                        help="MongoDB connection budget shared by all workers, both clients included")
+    parser.add_argument("--reload", action="store_true", help="Development: restart on code changes (one worker)")
+    return parser.parse_args(argv)
+
+
+def _fast_path(module: str, fallback: str) -> str:
+    """Use ``module`` when it is installed, uvicorn's pure-Python ``fallback`` otherwise."""
+    if importlib.util.find_spec(module) is not None:
+        return module
+    logging.warning("%s is not installed; falling back to %s", module, fallback)
+    return fallback
+
+
+def pool_size_per_worker(max_connections: int, workers: int) -> int:
+    """Split a MongoDB connection budget evenly between worker processes.
+
+    Returns the async pool size of each worker: its share minus the pool of
+    its sync client.
+    """
+    return max(1, max_connections // workers - MONGO_SYNC_POOL_SIZE)
+
+
+def worker_log_file(log_file: str) -> str:
+    """Give ``log_file`` a ``{pid}`` placeholder so each worker rotates a file of its own."""
+    if not log_file or "{pid}" in log_file:
+        return log_file
+    root, ext = os.path.splitext(log_file)
+    return f"{root}.{{pid}}{ext}"
+
+
 def launch_backend(argv: Sequence[str]) -> None:
-    """Start the FastAPI backend and log the provided CLI arguments."""
-    logging.info("Starting backend server")
-    if argv:
-        logging.info("Received CLI arguments: %s", " ".join(argv))
-    else:
-        logging.info("No CLI arguments provided")
-
-    # Delegates to uvicorn to run the FastAPI application.
-    uvicorn.run(APP_IMPORT_PATH, host=DEFAULT_HOST, port=DEFAULT_PORT, log_level="info")
+    """Start the FastAPI backend with the settings from the CLI arguments."""
+    args = parse_args(argv)
+    workers = 1 if args.reload else max(1, args.workers)
+    if workers > 1 and CACHE_BACKEND not in SHARED_CACHE_BACKENDS:
+        # Per-worker versions break read-your-writes, keep stale ETags valid
+        # and let the duplicate filter miss other workers' inserts
+        sys.exit(
+            f"CACHE_BACKEND={CACHE_BACKEND} keeps read-cache versions per worker; "
+            "set CACHE_BACKEND=mongo or redis to run more than one worker"
+        )
+
+    if workers > 1:
+        # Read by logging_config.py in every worker; an unset LOG_FILE would
+        # have all of them rotate the same app.log
+        os.environ["LOG_FILE"] = worker_log_file(os.getenv("LOG_FILE", ""))
+
+    if args.mongo_max_connections:
+        # Read by database.py in every worker; the workers inherit the environment
+        os.environ["MONGO_MAX_POOL_SIZE"] = str(pool_size_per_worker(args.mongo_max_connections, workers))
+
+    logging.info(
+        "Starting backend server on %s:%s with %s worker(s), MongoDB pool size %s per worker",
+        args.host, args.port, workers, os.getenv("MONGO_MAX_POOL_SIZE", "default"),
+    )
+    uvicorn.run(
+        APP_IMPORT_PATH,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        reload=args.reload,
+        loop=_fast_path("uvloop", "asyncio"),
+        http=_fast_path("httptools", "h11"),
+        backlog=args.backlog,
+        timeout_keep_alive=args.keep_alive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        log_level="info",
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,315 @@
+"""Aggregation pipelines for the dashboard statistics endpoint.
+
+All dashboard figures are computed by a single ``$facet`` aggregation so one
+``/api/stats`` call costs one server round-trip. ``/api/stats`` runs it over
+the materialized ``stats_rollups`` counters; the equivalent pipeline over the
+raw ``entries`` collection is kept as the reference implementation.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from dates import date_condition, day_string
+
+# Statuses counted as "active" outreach in the club performance metrics
+ACTIVE_STATUSES = ["In progress", "Requested on LinkedIn", "Requested on mail"]
+
+# Output field name for each per-member status counter
+MEMBER_STATUS_FIELDS = {
+    "yet_to_contact": "Yet to contact",
+    "in_progress": "In progress",
+    "rejected": "Rejected",
+    "requested_linkedin": "Requested on LinkedIn",
+    "requested_mail": "Requested on mail",
+}
+
+
+def build_date_range(start_date: Optional[str], end_date: Optional[str]) -> Dict[str, Any]:
+    """Return the ``entry_date`` range filter for the given bounds, empty without bounds."""
+    return date_condition("entry_date", start_date, end_date)
+
+
+def since(cutoff: str) -> Dict[str, Any]:
+    """Filter on entries dated ``cutoff`` or later."""
+    return date_condition("entry_date", cutoff)
+
+
+def recent_cutoffs(now: Optional[datetime] = None) -> Dict[str, str]:
+    """Return the ISO dates marking the start of the 7 and 30 day windows."""
+    now = now or datetime.now()
+    return {
+        "week": (now - timedelta(days=7)).date().isoformat(),
+        "month": (now - timedelta(days=30)).date().isoformat(),
+    }
+
+
+def _count_if(condition: Dict[str, Any]) -> Dict[str, Any]:
+    """Accumulator counting documents for which ``condition`` is true."""
+    return {"$sum": {"$cond": [condition, 1, 0]}}
+
+
+def build_stats_pipeline(
+    club: Optional[str] = None,
+    member_name: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Build the single ``$facet`` aggregation behind ``GET /api/stats``.
+
+    The recent-activity counts and the daily timeline ignore the requested
+    date range (they always cover the last 7/30 days), so when a range is
+    given the leading ``$match`` admits both the range and the last 30 days
+    and each facet narrows it down again.
+    """
+    cutoffs = recent_cutoffs(now)
+    date_range = build_date_range(start_date, end_date)
+
+    match: Dict[str, Any] = {}
+    if club:
+        match["club"] = club
+    if member_name:
+        match["member_name"] = member_name
+
+    in_range: List[Dict[str, Any]] = []
+    if date_range:
+        match["$or"] = [date_range, since(cutoffs["month"])]
+        in_range = [{"$match": date_range}]
+
+    member_counters = {
+        field: _count_if({"$eq": ["$status", status]})
+        for field, status in MEMBER_STATUS_FIELDS.items()
+    }
+    is_active = {"$in": ["$status", ACTIVE_STATUSES]}
+
+    facets: Dict[str, List[Dict[str, Any]]] = {
+        "total": in_range + [{"$count": "count"}],
+        "recent_7days": [
+            {"$match": since(cutoffs["week"])},
+            {"$count": "count"},
+        ],
+        "recent_30days": [
+            {"$match": since(cutoffs["month"])},
+            {"$count": "count"},
+        ],
+        "status_distribution": in_range + [
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}},
+        ],
+        "club_distribution": in_range + [
+            {"$group": {"_id": "$club", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}},
+        ],
+        "member_contributions": in_range + [
+            {"$group": {
+                "_id": {"member_name": "$member_name", "club": "$club"},
+                "count": {"$sum": 1},
+                **member_counters,
+            }},
+            {"$project": {
+                "member_name": "$_id.member_name",
+                "club": "$_id.club",
+                "count": 1,
+                **{field: 1 for field in MEMBER_STATUS_FIELDS},
+            }},
+            {"$sort": {"count": -1}},
+            {"$limit": 20},
+        ],
+        "top_companies": in_range + [
+            {"$group": {"_id": "$company", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}},
+            {"$limit": 15},
+        ],
+        "daily_timeline": [
+            {"$match": since(cutoffs["month"])},
+            {"$group": {"_id": day_string("$entry_date"), "count": {"$sum": 1}}},
+            {"$sort": {"_id": 1}},
+        ],
+        "contact_methods": in_range + [
+            {"$group": {
+                "_id": None,
+                "email_count": _count_if({"$ne": ["$email", None]}),
+                "linkedin_count": _count_if({"$ne": ["$linkedin", None]}),
+                "phone_count": _count_if({"$ne": ["$phone", None]}),
+            }},
+        ],
+        "opportunity_types": in_range + [
+            {"$match": {"opportunity_type": {"$nin": [None, ""]}}},
+            {"$group": {"_id": "$opportunity_type", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}},
+            {"$limit": 10},
+        ],
+        "club_performance": in_range + [
+            {"$group": {
+                "_id": "$club",
+                "total_entries": {"$sum": 1},
+                "unique_members": {"$addToSet": "$member_name"},
+                "unique_companies": {"$addToSet": "$company"},
+                "active_count": _count_if(is_active),
+            }},
+            {"$project": {
+                "club": "$_id",
+                "total_entries": 1,
+                "unique_members_count": {"$size": "$unique_members"},
+                "unique_companies_count": {"$size": "$unique_companies"},
+                "active_count": 1,
+                "success_rate": {
+                    "$multiply": [{"$divide": ["$active_count", "$total_entries"]}, 100]
+                },
+            }},
+            {"$sort": {"total_entries": -1}},
+        ],
+    }
+
+    return [{"$match": match}, {"$facet": facets}]
+
+
+def _sum_counts(field: str = "count") -> List[Dict[str, Any]]:
+    return [{"$group": {"_id": None, "count": {"$sum": f"${field}"}}}]
+
+
+def build_rollup_stats_pipeline(
+    club: Optional[str] = None,
+    member_name: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Build the ``/api/stats`` aggregation over the ``stats_rollups`` collection.
+
+    Produces the same facets as :func:`build_stats_pipeline`, but every input
+    row is a pre-aggregated counter (see ``rollups.py``), so the cost grows
+    with the number of distinct (club, member, date, status/company/type)
+    keys rather than with the number of entries.
+    """
+    cutoffs = recent_cutoffs(now)
+    date_range = build_date_range(start_date, end_date)
+
+    match: Dict[str, Any] = {"count": {"$gt": 0}}
+    if club:
+        match["club"] = club
+    if member_name:
+        match["member_name"] = member_name
+
+    in_range: List[Dict[str, Any]] = []
+    if date_range:
+        match["$or"] = [date_range, since(cutoffs["month"])]
+        in_range = [{"$match": date_range}]
+
+    statuses = in_range + [{"$match": {"kind": "status"}}]
+    recent_statuses = [{"$match": {"kind": "status", **since(cutoffs["month"])}}]
+
+    def grouped(kind: str, field: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        stages = in_range + [
+            {"$match": {"kind": kind}},
+            {"$group": {"_id": f"${field}", "count": {"$sum": "$count"}}},
+            {"$sort": {"count": -1}},
+        ]
+        return stages + ([{"$limit": limit}] if limit else [])
+
+    member_counters = {
+        field: {"$sum": {"$cond": [{"$eq": ["$status", status]}, "$count", 0]}}
+        for field, status in MEMBER_STATUS_FIELDS.items()
+    }
+    is_status = {"$eq": ["$kind", "status"]}
+    is_active = {"$and": [is_status, {"$in": ["$status", ACTIVE_STATUSES]}]}
+
+    facets: Dict[str, List[Dict[str, Any]]] = {
+        "total": statuses + _sum_counts(),
+        "recent_7days": [
+            {"$match": {"kind": "status", **since(cutoffs["week"])}},
+        ] + _sum_counts(),
+        "recent_30days": recent_statuses + _sum_counts(),
+        "status_distribution": grouped("status", "status"),
+        "club_distribution": grouped("status", "club"),
+        "member_contributions": statuses + [
+            {"$group": {
+                "_id": {"member_name": "$member_name", "club": "$club"},
+                "count": {"$sum": "$count"},
+                **member_counters,
+            }},
+            {"$project": {
+                "member_name": "$_id.member_name",
+                "club": "$_id.club",
+                "count": 1,
+                **{field: 1 for field in MEMBER_STATUS_FIELDS},
+            }},
+            {"$sort": {"count": -1}},
+            {"$limit": 20},
+        ],
+        "top_companies": grouped("company", "value", 15),
+        "daily_timeline": recent_statuses + [
+            {"$group": {"_id": day_string("$entry_date"), "count": {"$sum": "$count"}}},
+            {"$sort": {"_id": 1}},
+        ],
+        "contact_methods": statuses + [
+            {"$group": {
+                "_id": None,
+                "email_count": {"$sum": "$email"},
+                "linkedin_count": {"$sum": "$linkedin"},
+                "phone_count": {"$sum": "$phone"},
+            }},
+        ],
+        "opportunity_types": grouped("opportunity_type", "value", 10),
+        "club_performance": in_range + [
+            {"$match": {"kind": {"$in": ["status", "company"]}}},
+            {"$group": {
+                "_id": "$club",
+                "total_entries": {"$sum": {"$cond": [is_status, "$count", 0]}},
+                "unique_members": {"$addToSet": "$member_name"},
+                "unique_companies": {"$addToSet": {"$cond": [is_status, None, "$value"]}},
+                "active_count": {"$sum": {"$cond": [is_active, "$count", 0]}},
+            }},
+            {"$project": {
+                "club": "$_id",
+                "total_entries": 1,
+                "unique_members_count": {"$size": "$unique_members"},
+                "unique_companies_count": {"$size": {"$setDifference": ["$unique_companies", [None]]}},
+                "active_count": 1,
+                "success_rate": {
+                    "$multiply": [{"$divide": ["$active_count", "$total_entries"]}, 100]
+                },
+            }},
+            {"$sort": {"total_entries": -1}},
+        ],
+    }
+
+    return [{"$match": match}, {"$facet": facets}]
+
+
+def _first_count(rows: List[Dict[str, Any]]) -> int:
+    return rows[0]["count"] if rows else 0
+
+
+def format_stats(facet_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape the ``$facet`` output into the ``/api/stats`` response payload."""
+    member_stats = facet_result.get("member_contributions", [])
+    contact_rows = facet_result.get("contact_methods", [])
+    contact_stats = contact_rows[0] if contact_rows else {}
+
+    avg_per_member = 0
+    if member_stats:
+        avg_per_member = round(sum(m["count"] for m in member_stats) / len(member_stats), 2)
+
+    return {
+        "summary": {
+            "total_entries": _first_count(facet_result.get("total", [])),
+            "recent_entries_7days": _first_count(facet_result.get("recent_7days", [])),
+            "recent_entries_30days": _first_count(facet_result.get("recent_30days", [])),
+            "average_per_member": avg_per_member
+        },
+        "status_distribution": facet_result.get("status_distribution", []),
+        "club_distribution": facet_result.get("club_distribution", []),
+        "member_contributions": member_stats,
+        "top_companies": facet_result.get("top_companies", []),
+        "daily_timeline": facet_result.get("daily_timeline", []),
+        "contact_methods": {
+            "email": contact_stats.get("email_count", 0),
+            "linkedin": contact_stats.get("linkedin_count", 0),
+            "phone": contact_stats.get("phone_count", 0)
+        },
+        "opportunity_types": facet_result.get("opportunity_types", []),
+        "club_performance": facet_result.get("club_performance", []),
+    }
@@ -0,0 +1,61 @@
+"""Startup warmup and readiness of a worker.
+
+Everything a request would otherwise initialize lazily is done in the
+FastAPI lifespan before the worker accepts connections: opening the MongoDB
+pools, verifying the managed indexes, and loading the in-memory
+autocomplete indexes and duplicate filter. ``Readiness`` times each of
+those steps and backs ``GET /api/ready``, which a load balancer should use
+to route traffic, while ``GET /api/health`` only reports that the process
+is alive.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """Warmup steps of this worker, their timings, and whether all of them ran."""
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.step_ms: Dict[str, float] = {}
+        self.failed: List[str] = []
+        self._started = time.perf_counter()
+
+    @asynccontextmanager
+    async def step(self, name: str, required: bool = True) -> AsyncIterator[None]:
+        """Time one warmup step.
+
+        A failing required step fails the startup; any other failure is
+        logged and leaves the worker to initialize that part lazily.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            if required:
+                raise
+            self.failed.append(name)
+            logger.error("Warmup step %s failed", name, exc_info=True)
+        finally:
+            self.step_ms[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        logger.info(
+            "Worker ready after %.0fms: %s",
+            (time.perf_counter() - self._started) * 1000,
+            ", ".join(f"{name} {ms:.0f}ms" for name, ms in self.step_ms.items()),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "steps_ms": dict(self.step_ms), "failed": list(self.failed)}
+
+
+readiness = Readiness()
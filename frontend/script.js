@@ -11,6 +11,11 @@ let formDraft = null;
 let statsCache = null;
 let statsCacheTime = null;
 const CACHE_DURATION = 60000; // 1 minute cache
+const ENTRIES_PAGE_SIZE = 100;
+// Columns rendered by displayEntries; the API adds id and created_at
+const ENTRY_LIST_FIELDS = 'entry_date,member_name,club,company,opportunity_type,contact_person,email,linkedin,phone,status,status_notes';
+let entriesNextCursor = null;
+let loadedEntries = [];
 
 // Initialize
 document.addEventListener('DOMContentLoaded', () => {
@@ -68,6 +73,7 @@ function setupEventListeners() {
     // Entry Filters
     document.getElementById('apply-filters').addEventListener('click', loadEntries);
     document.getElementById('clear-filters').addEventListener('click', clearFilters);
+    document.getElementById('load-more-entries').addEventListener('click', loadMoreEntries);
     // Status modal controls
     const statusModal = document.getElementById('status-modal');
     if (statusModal) {
@@ -161,19 +167,12 @@ async function loadMiniStats() {
         const params = new URLSearchParams();
         params.append('member_name', currentUser.name);
         
-        const response = await fetch(`${API_BASE_URL}/entries?${params}`);
+        const response = await fetch(`${API_BASE_URL}/stats?${params}`);
         const result = await response.json();
         
         if (result.success) {
-            const userEntries = result.data;
-            const totalEntries = userEntries.length;
-            
-            // Calculate this week's entries
-            const oneWeekAgo = new Date();
-            oneWeekAgo.setDate(oneWeekAgo.getDate() - 7);
-            const thisWeek = userEntries.filter(entry => 
-                new Date(entry.entry_date) >= oneWeekAgo
-            ).length;
+            const totalEntries = result.data.summary.total_entries;
+            const thisWeek = result.data.summary.recent_entries_7days;
             
             // Get ranking (need all members stats)
             const statsResponse = await fetch(`${API_BASE_URL}/stats?club=${encodeURIComponent(currentUser.club)}`);
@@ -408,7 +407,7 @@ async function handleEntrySubmit(e) {
 }
 
 // Load Entries
-async function loadEntries() {
+function getEntryFilterParams() {
     const params = new URLSearchParams();
     
     const filterName = document.getElementById('filter-name').value.trim();
@@ -427,12 +426,27 @@ async function loadEntries() {
     if (startDate) params.append('start_date', startDate);
     if (endDate) params.append('end_date', endDate);
     
+    return params;
+}
+
+async function fetchEntriesPage(after) {
+    const params = getEntryFilterParams();
+    params.append('limit', ENTRIES_PAGE_SIZE);
+    params.append('fields', ENTRY_LIST_FIELDS);
+    if (after) params.append('after', after);
+    
+    const response = await fetch(`${API_BASE_URL}/entries?${params}`);
+    return response.json();
+}
+
+async function loadEntries() {
     try {
-        const response = await fetch(`${API_BASE_URL}/entries?${params}`);
-        const result = await response.json();
+        const result = await fetchEntriesPage(null);
         
         if (result.success) {
-            displayEntries(result.data);
+            loadedEntries = result.data;
+            entriesNextCursor = result.next_cursor;
+            displayEntries(loadedEntries);
         } else {
             showToast('Failed to load entries', 'error');
         }
@@ -442,8 +456,28 @@ async function loadEntries() {
     }
 }
 
+async function loadMoreEntries() {
+    if (!entriesNextCursor) return;
+    
+    try {
+        const result = await fetchEntriesPage(entriesNextCursor);
+        
+        if (result.success) {
+            loadedEntries = loadedEntries.concat(result.data);
+            entriesNextCursor = result.next_cursor;
+            displayEntries(loadedEntries);
+        } else {
+            showToast('Failed to load entries', 'error');
+        }
+    } catch (error) {
+        console.error('Error loading more entries:', error);
+        showToast('Failed to connect to server', 'error');
+    }
+}
+
 function displayEntries(entries) {
     const tbody = document.getElementById('entries-tbody');
+    document.getElementById('load-more-entries').style.display = entriesNextCursor ? 'inline-block' : 'none';
     
     if (entries.length === 0) {
         tbody.innerHTML = '<tr><td colspan="8" class="no-data">No entries found</td></tr>';
@@ -1028,37 +1062,18 @@ function hideAutocomplete(fieldId) {
 }
 
 // 4. Export functionality
-async function exportEntries() {
-    const params = new URLSearchParams();
-    const filterName = document.getElementById('filter-name').value.trim();
-    const filterCompany = document.getElementById('filter-company').value.trim();
-    const filterClub = document.getElementById('filter-club').value;
-    const filterType = document.getElementById('filter-type').value.trim();
-    const filterStatus = document.getElementById('filter-status').value;
-    const startDate = document.getElementById('filter-start-date').value;
-    const endDate = document.getElementById('filter-end-date').value;
-    
-    if (filterName) params.append('member_name', filterName);
-    if (filterCompany) params.append('company', filterCompany);
-    if (filterClub) params.append('club', filterClub);
-    if (filterType) params.append('opportunity_type', filterType);
-    if (filterStatus) params.append('status', filterStatus);
-    if (startDate) params.append('start_date', startDate);
-    if (endDate) params.append('end_date', endDate);
+function exportEntries() {
+    // The server streams the CSV straight into the download
+    const params = getEntryFilterParams();
+    params.append('format', 'csv');
     
-    try {
-        const response = await fetch(`${API_BASE_URL}/entries?${params}`);
-        const result = await response.json();
-        
-        if (result.success && result.data.length > 0) {
-            downloadCSV(result.data, 'entries');
-            showToast('✓ Entries exported successfully!', 'success');
-        } else {
-            showToast('No entries to export', 'warning');
-        }
-    } catch (error) {
-        showToast('Failed to export entries', 'error');
-    }
+    const link = document.createElement('a');
+    link.href = `${API_BASE_URL}/entries/export?${params}`;
+    link.download = `entries_${new Date().toISOString().split('T')[0]}.csv`;
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+    showToast('✓ Export started', 'success');
 }
 
 async function exportStats() {
@@ -1086,24 +1101,6 @@ async function exportStats() {
     }
 }
 
-function downloadCSV(data, filename) {
-    if (data.length === 0) {
-        showToast('No data to export', 'warning');
-        return;
-    }
-    
-    const headers = Object.keys(data[0]).filter(key => key !== '_id' && key !== 'id');
-    const csvContent = [
-        headers.join(','),
-        ...data.map(row => headers.map(header => {
-            const value = row[header] || '';
-            return `"${String(value).replace(/"/g, '""')}"`;
-        }).join(','))
-    ].join('\n');
-    
-    downloadFile(csvContent, `${filename}_${new Date().toISOString().split('T')[0]}.csv`, 'text/csv');
-}
-
 function downloadJSON(data, filename) {
     const jsonContent = JSON.stringify(data, null, 2);
     downloadFile(jsonContent, `${filename}_${new Date().toISOString().split('T')[0]}.json`, 'application/json');
@@ -197,13 +197,17 @@ start_backend() {
         kill_port $BACKEND_PORT
     fi
     
-    # Start backend with uvicorn
+    # Start backend with the production launcher; BACKEND_RELOAD=true runs
+    # one worker that restarts on code changes instead
+    local reload_flag=""
+    if [ "${BACKEND_RELOAD:-false}" = "true" ]; then
+        reload_flag="--reload"
+    fi
     print_info "Starting FastAPI with Uvicorn on port $BACKEND_PORT..."
-    nohup uvicorn app:app \
+    nohup python start_backend.py \
         --host 0.0.0.0 \
         --port $BACKEND_PORT \
-        --reload \
-        --log-level info \
+        $reload_flag \
         > "$BACKEND_LOG" 2>&1 &
     
     BACKEND_PID_NUM=$!